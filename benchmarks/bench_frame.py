@@ -0,0 +1,114 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Compare analysing facts held by a ``FactFrame`` with analysing ``Fact`` instances.
+
+``--facts`` result rows, shaped like those of a ``'core'`` query, are turned into
+``Fact`` instances and into a ``FactFrame``. Both are then used to sum up durations
+per category and per day. Reports seconds taken to build and to analyse as well as
+the memory retained per fact. The frame uses NumPy if it is installed.
+
+Usage::
+
+    python benchmarks/bench_frame.py --facts 5000000
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import gc
+import time
+
+from hamster_lib import Activity, Category, Fact, Tag, frame
+from hamster_lib.frame import FactFrame
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2
+    tracemalloc = None
+
+EPOCH = datetime.datetime(2000, 1, 1)
+DAY_START = datetime.time(5, 30)
+
+
+def build_facts(rows, tag_rows):
+    """Build ``Fact`` instances the way the sqlalchemy backend does for 'core' queries."""
+    tags = {}
+    for fact_pk, tag_pk, tag_name in tag_rows:
+        tags.setdefault(fact_pk, set()).add(Tag._from_trusted(tag_name, pk=tag_pk))
+    facts = []
+    for (pk, start, end, description, activity_pk, activity_name, deleted,
+            category_pk, category_name) in rows:
+        activity = Activity._from_trusted(activity_name, pk=activity_pk,
+            category=Category._from_trusted(category_name, pk=category_pk), deleted=deleted)
+        facts.append(Fact._from_trusted(activity, start, end=end, pk=pk,
+            description=description, tags=tags.get(pk)))
+    return facts
+
+
+def analyse_facts(facts):
+    offset = datetime.timedelta(hours=DAY_START.hour, minutes=DAY_START.minute)
+    categories, days = {}, {}
+    for fact in facts:
+        seconds = (fact.end - fact.start).total_seconds()
+        categories[fact.category] = categories.get(fact.category, 0) + seconds
+        day = (fact.start - offset).date()
+        days[day] = days.get(day, 0) + seconds
+    return categories, days
+
+
+def analyse_frame(fact_frame):
+    return fact_frame.group_sum('category'), fact_frame.group_sum('day')
+
+
+def measure(build, analyse):
+    """Return seconds to build and analyse as well as bytes retained by the result."""
+    gc.collect()
+    started = time.time()
+    result = build()
+    built = time.time()
+    analyse(result)
+    analysed = time.time()
+    del result
+
+    if tracemalloc is None:
+        return built - started, analysed - built, None
+    # A separate run, as tracing slows down allocations considerably.
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return built - started, analysed - built, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--facts', type=int, default=1000000)
+    args = parser.parse_args()
+
+    rows, tag_rows = [], []
+    for index in range(args.facts):
+        start = EPOCH + datetime.timedelta(minutes=50 * index)
+        rows.append((index + 1, start, start + datetime.timedelta(minutes=index % 50 + 1),
+            'fact {}'.format(index), index % 50 + 1, 'activity {}'.format(index % 50),
+            False, index % 10 + 1, 'category {}'.format(index % 10)))
+        tag_rows.append((index + 1, index % 20 + 1, 'tag {}'.format(index % 20)))
+
+    print('Frame columns: {}'.format('NumPy' if frame.numpy is not None else 'array'))  # NOQA
+    print('{:>8} {:>10} {:>10} {:>12}'.format('', 'build s', 'analyse s', 'bytes/fact'))  # NOQA
+    for name, build, analyse in (
+        ('facts', lambda: build_facts(rows, tag_rows), analyse_facts),
+        ('frame', lambda: FactFrame.from_rows(rows, tag_rows, day_start=DAY_START),
+            analyse_frame),
+    ):
+        built, analysed, size = measure(build, analyse)
+        print('{:>8} {:>10.2f} {:>10.2f} {:>12}'.format(name, built, analysed,  # NOQA
+            'n/a' if size is None else '{:,.0f}'.format(size / float(args.facts))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Measure saving facts of the same activity and tags with and without the lookup cache.
+
+Every fact is added via ``FactManager.save``. With ``lookup_cache_size=0``
+activity, category and tags are queried for each fact, otherwise only the
+first fact needs to look them up.
+
+Usage::
+
+    python benchmarks/bench_lookups.py --facts 2000
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import os
+import shutil
+import tempfile
+import timeit
+
+from hamster_lib import Activity, Category, Fact, Tag
+from hamster_lib.backends.sqlalchemy.storage import SQLAlchemyStore
+from sqlalchemy import event
+
+EPOCH = datetime.datetime(2015, 1, 1, 8)
+
+
+def run(tmpdir, cache_size, count):
+    """Save ``count`` facts and return seconds and statements issued per fact."""
+    config = {
+        'store': 'sqlalchemy',
+        'day_start': datetime.time(5, 30),
+        'db_engine': 'sqlite',
+        'db_path': os.path.join(tmpdir, 'bench-{}.sqlite'.format(cache_size)),
+        'tmpfile_path': os.path.join(tmpdir, 'tmp.fact'),
+        'fact_min_delta': 60,
+        'lookup_cache_size': cache_size,
+    }
+    store = SQLAlchemyStore(config)
+    statements = []
+    event.listen(store.session.get_bind(), 'before_cursor_execute',
+        lambda *args: statements.append(args[2]))
+    activity = Activity('benchmark', category=Category('benchmarks'))
+    tags = set([Tag('foo'), Tag('bar')])
+    starts = iter([EPOCH + datetime.timedelta(hours=i) for i in range(count)])
+
+    def save():
+        start = next(starts)
+        store.facts.save(Fact(activity, start, start + datetime.timedelta(minutes=30),
+            tags=tags))
+
+    seconds = timeit.timeit(save, number=count)
+    return seconds / count, len(statements) / float(count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--facts', type=int, default=2000)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        print('{:>12} {:>16} {:>16}'.format('cache size', 'ms per save', 'statements'))  # NOQA
+        for cache_size in (0, 1024):
+            seconds, statements = run(tmpdir, cache_size, args.facts)
+            print('{:>12} {:>16.3f} {:>16.1f}'.format(  # NOQA
+                cache_size, seconds * 1000, statements))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
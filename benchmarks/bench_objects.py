@@ -0,0 +1,89 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Compare building facts through their validating and their trusted constructors.
+
+``--facts`` result rows, shaped like those of a ``'core'`` query, are turned into
+``Fact`` instances including activity, category and tag, once by the regular
+constructors and once by ``_from_trusted``. Reports facts built per second and the
+memory retained per fact.
+
+Usage::
+
+    python benchmarks/bench_objects.py --facts 1000000
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import gc
+import timeit
+
+from hamster_lib import Activity, Category, Fact, Tag
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2
+    tracemalloc = None
+
+EPOCH = datetime.datetime(2000, 1, 1)
+
+
+def build_validated(rows):
+    return [Fact(Activity(activity_name, pk=activity_pk,
+                          category=Category(category_name, pk=category_pk)),
+                 start, end=end, pk=pk, description=description,
+                 tags=[Tag(tag_name, pk=tag_pk)])
+            for (pk, start, end, description, activity_pk, activity_name, category_pk,
+                 category_name, tag_pk, tag_name) in rows]
+
+
+def build_trusted(rows):
+    return [Fact._from_trusted(Activity._from_trusted(activity_name, pk=activity_pk,
+                                                      category=Category._from_trusted(
+                                                          category_name, pk=category_pk)),
+                               start, end=end, pk=pk, description=description,
+                               tags=set([Tag._from_trusted(tag_name, pk=tag_pk)]))
+            for (pk, start, end, description, activity_pk, activity_name, category_pk,
+                 category_name, tag_pk, tag_name) in rows]
+
+
+def measure(build, rows):
+    """Return bytes retained per fact by the result of ``build``, ``None`` if unknown."""
+    if tracemalloc is None:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    facts = build(rows)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del facts
+    return size / float(len(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--facts', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows = []
+    for index in range(args.facts):
+        start = EPOCH + datetime.timedelta(hours=index)
+        rows.append((index + 1, start, start + datetime.timedelta(minutes=50),
+            'fact {}'.format(index), index % 50 + 1, 'activity {}'.format(index % 50),
+            index % 10 + 1, 'category {}'.format(index % 10), index % 20 + 1,
+            'tag {}'.format(index % 20)))
+
+    print('{:>12} {:>14} {:>14}'.format('constructor', 'facts/s', 'bytes/fact'))  # NOQA
+    for name, build in (('validated', build_validated), ('trusted', build_trusted)):
+        seconds = min(timeit.repeat(lambda: build(rows), number=1, repeat=args.repeat))
+        size = measure(build, rows)
+        print('{:>12} {:>14,.0f} {:>14}'.format(name, args.facts / seconds,  # NOQA
+            'n/a' if size is None else '{:,.0f}'.format(size)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Measure fact write latency depending on the size of the ``facts`` table.
+
+Each round grows a sqlite database to the given number of facts and then times
+``FactManager._add`` for a couple of new facts placed at random points in time.
+As the overlap check is index driven, latency is expected to stay flat.
+
+Usage::
+
+    python benchmarks/bench_overlap.py 10000 100000 1000000 10000000
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import os
+import random
+import shutil
+import tempfile
+import timeit
+
+from hamster_lib import Activity, Fact
+from hamster_lib.backends.sqlalchemy import objects
+from hamster_lib.backends.sqlalchemy.storage import SQLAlchemyStore
+
+EPOCH = datetime.datetime(2000, 1, 1)
+FACT_LENGTH = datetime.timedelta(minutes=50)
+FACT_SPACING = datetime.timedelta(hours=1)
+
+
+def grow(store, activity_pk, current, size, chunk_size=50000):
+    """Bulk insert facts into ``store`` until it holds ``size`` facts."""
+    connection = store.session.connection()
+    while current < size:
+        rows = []
+        for index in range(current, min(current + chunk_size, size)):
+            start = EPOCH + index * FACT_SPACING
+            rows.append({'start': start, 'end': start + FACT_LENGTH,
+                         'activity_id': activity_pk, 'description': None})
+        connection.execute(objects.facts.insert(), rows)
+        current += len(rows)
+    store.session.commit()
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('sizes', nargs='*', type=int, default=[10000, 100000, 1000000])
+    parser.add_argument('--writes', type=int, default=200,
+                        help="Number of timed writes per table size.")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        config = {
+            'store': 'sqlalchemy',
+            'day_start': datetime.time(5, 30),
+            'db_engine': 'sqlite',
+            'db_path': os.path.join(tmpdir, 'bench.sqlite'),
+            'tmpfile_path': os.path.join(tmpdir, 'tmp.fact'),
+            'fact_min_delta': 60,
+        }
+        store = SQLAlchemyStore(config)
+        activity = store.activities.get_or_create(Activity('benchmark'))
+        count = 0
+        print('{:>12} {:>16}'.format('facts', 'ms per write'))  # NOQA
+        for size in sorted(args.sizes):
+            count = grow(store, activity.pk, count, size)
+            # Each benchmark fact fits into the gap after a random existing fact.
+            slots = random.sample(range(count), args.writes)
+
+            def write():
+                start = EPOCH + slots.pop() * FACT_SPACING + FACT_LENGTH
+                store.facts._add(Fact(activity, start, start + datetime.timedelta(minutes=5)))
+
+            seconds = timeit.timeit(write, number=args.writes)
+            count += args.writes
+            print('{:>12} {:>16.3f}'.format(size, seconds * 1000 / args.writes))  # NOQA
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Compare parsing raw facts one by one with parsing them as a batch.
+
+``--lines`` raw facts, as typed by users or logged by chat bots, are written to a
+temporary file. They are then parsed once by calling ``Fact.create_from_raw_fact`` per
+line and once by streaming the file through ``Fact.parse_many``. Reports lines parsed
+per second.
+
+Usage::
+
+    python benchmarks/bench_parse.py --lines 500000
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import io
+import os
+import tempfile
+import timeit
+
+from hamster_lib import Fact
+
+CONFIG = {'day_start': datetime.time(5, 30)}
+EPOCH = datetime.datetime(2016, 1, 1, 8)
+FORMATS = (
+    '{start:%Y-%m-%d %H:%M} - {end:%Y-%m-%d %H:%M} {activity}@{category}, {description}',
+    '{start:%H:%M} - {end:%H:%M} {activity}@{category}',
+    '{start:%Y-%m-%d} {activity}@{category}, {description}',
+    '{start:%H:%M} {activity}',
+)
+
+
+def parse_single(path):
+    with io.open(path, encoding='utf-8') as lines:
+        return [Fact.create_from_raw_fact(line, CONFIG) for line in lines]
+
+
+def parse_many(path):
+    with io.open(path, encoding='utf-8') as lines:
+        return list(Fact.parse_many(lines, CONFIG))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lines', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    handle, path = tempfile.mkstemp(suffix='.txt')
+    os.close(handle)
+    try:
+        with io.open(path, 'w', encoding='utf-8') as raw_facts:
+            for index in range(args.lines):
+                start = EPOCH + datetime.timedelta(days=index // 20, minutes=index % 20 * 30)
+                raw_facts.write(FORMATS[index % len(FORMATS)].format(start=start,
+                    end=start + datetime.timedelta(minutes=25),
+                    activity='activity {}'.format(index % 50),
+                    category='category {}'.format(index % 10),
+                    description='fact {}'.format(index)) + '\n')
+
+        print('{:>8} {:>14}'.format('parser', 'lines/s'))  # NOQA
+        for name, parse in (('single', parse_single), ('many', parse_many)):
+            seconds = min(timeit.repeat(lambda: parse(path), number=1, repeat=args.repeat))
+            print('{:>8} {:>14,.0f}'.format(name, args.lines / seconds))  # NOQA
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Compare the rows per second each fact loading strategy reads.
+
+A sqlite database is filled with ``--facts`` facts, each carrying a couple of tags.
+Then all facts are read by ``FactManager._get_all`` and ``FactManager._iter_all``
+using each loading strategy.
+
+Usage::
+
+    python benchmarks/bench_read_paths.py --facts 100000
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import os
+import random
+import shutil
+import tempfile
+import timeit
+
+from hamster_lib import Activity, Category, Tag
+from hamster_lib.backends.sqlalchemy import objects
+from hamster_lib.backends.sqlalchemy.storage import (FACT_LOADING_STRATEGIES, SQLAlchemyStore,
+                                                     dispose_engines)
+
+EPOCH = datetime.datetime(2000, 1, 1)
+
+
+def grow(store, count, tags_per_fact, chunk_size=50000):
+    """Bulk insert ``count`` facts with ``tags_per_fact`` random tags each."""
+    activities = [store.activities.get_or_create(Activity('activity {}'.format(i),
+        category=Category('category {}'.format(i % 10)))) for i in range(50)]
+    tags = [store.tags.get_or_create(Tag('tag {}'.format(i))) for i in range(20)]
+    connection = store.session.connection()
+    for offset in range(0, count, chunk_size):
+        rows, tag_rows = [], []
+        for index in range(offset, min(offset + chunk_size, count)):
+            start = EPOCH + datetime.timedelta(hours=index)
+            rows.append({'id': index + 1, 'start': start,
+                         'end': start + datetime.timedelta(minutes=50),
+                         'activity_id': random.choice(activities).pk,
+                         'description': 'fact {}'.format(index)})
+            tag_rows.extend({'fact_id': index + 1, 'tag_id': tag.pk}
+                for tag in random.sample(tags, tags_per_fact))
+        connection.execute(objects.facts.insert(), rows)
+        if tag_rows:
+            connection.execute(objects.facttags.insert(), tag_rows)
+    store.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--facts', type=int, default=100000)
+    parser.add_argument('--tags', type=int, default=2, help="Number of tags per fact.")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        config = {
+            'store': 'sqlalchemy',
+            'day_start': datetime.time(5, 30),
+            'db_engine': 'sqlite',
+            'db_path': os.path.join(tmpdir, 'bench.sqlite'),
+            'tmpfile_path': os.path.join(tmpdir, 'tmp.fact'),
+            'fact_min_delta': 60,
+        }
+        grow(SQLAlchemyStore(config), args.facts, args.tags)
+
+        print('{:>8} {:>18} {:>18}'.format(  # NOQA
+            'loading', '_get_all rows/s', '_iter_all rows/s'))
+        for loading in FACT_LOADING_STRATEGIES:
+            timings = []
+            for method in ('_get_all', '_iter_all'):
+                def read():
+                    # A fresh session per run, so no strategy profits from the identity map.
+                    store = SQLAlchemyStore(config)
+                    for fact in getattr(store.facts, method)(loading=loading):
+                        pass
+                    store.session.close()
+                timings.append(min(timeit.repeat(read, number=1, repeat=args.repeat)))
+            print('{:>8} {:>18,.0f} {:>18,.0f}'.format(  # NOQA
+                loading, *[args.facts / seconds for seconds in timings]))
+    finally:
+        dispose_engines()
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Compare fact search using ``ilike`` with the optional full text index.
+
+A sqlite database is filled with ``--facts`` facts with random descriptions. Then
+the first page of matches for a couple of search terms is retrieved with and
+without ``fulltext_search`` enabled.
+
+Usage::
+
+    python benchmarks/bench_search.py --facts 1000000
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import os
+import random
+import shutil
+import tempfile
+import timeit
+
+from hamster_lib import Activity, Category
+from hamster_lib.backends.sqlalchemy import objects
+from hamster_lib.backends.sqlalchemy.storage import SQLAlchemyStore, dispose_engines
+
+EPOCH = datetime.datetime(2000, 1, 1)
+WORDS = ['word{}'.format(i) for i in range(5000)]
+TERMS = ('word42', 'word423*', '"word1 word2"')
+
+
+def grow(store, count, chunk_size=50000):
+    """Bulk insert ``count`` facts with random descriptions."""
+    activities = [store.activities.get_or_create(Activity('activity {}'.format(i),
+        category=Category('category {}'.format(i % 10)))) for i in range(50)]
+    connection = store.session.connection()
+    for offset in range(0, count, chunk_size):
+        rows = []
+        for index in range(offset, min(offset + chunk_size, count)):
+            start = EPOCH + datetime.timedelta(hours=index)
+            rows.append({'start': start, 'end': start + datetime.timedelta(minutes=50),
+                         'activity_id': random.choice(activities).pk,
+                         'description': ' '.join(random.sample(WORDS, 8))})
+        connection.execute(objects.facts.insert(), rows)
+    store.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--facts', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        config = {
+            'store': 'sqlalchemy',
+            'day_start': datetime.time(5, 30),
+            'db_engine': 'sqlite',
+            'db_path': os.path.join(tmpdir, 'bench.sqlite'),
+            'tmpfile_path': os.path.join(tmpdir, 'tmp.fact'),
+            'fact_min_delta': 60,
+        }
+        grow(SQLAlchemyStore(config), args.facts)
+
+        fulltext_config = dict(config, fulltext_search=True)
+        seconds = timeit.timeit(lambda: SQLAlchemyStore(fulltext_config), number=1)
+        print('Creating the full text index took {:.1f} s.\n'.format(seconds))  # NOQA
+
+        print('{:>16} {:>14} {:>14}'.format('term', 'ilike ms', 'fulltext ms'))  # NOQA
+        for term in TERMS:
+            timings = []
+            for store_config in (config, fulltext_config):
+                store = SQLAlchemyStore(store_config)
+                timings.append(min(timeit.repeat(
+                    lambda: store.facts.get_page(filter_term=term, limit=50),
+                    number=1, repeat=args.repeat)))
+            print('{:>16} {:>14.1f} {:>14.1f}'.format(term, *[t * 1000 for t in timings]))  # NOQA
+    finally:
+        dispose_engines()
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Compare the SQLite profiles of ``SQLAlchemyStore`` on write- and read-heavy workloads.
+
+* ``writes``: Facts saved one by one via ``FactManager.save``, each committed on its own.
+* ``reads``: ``FactManager.get_page`` calls for random timeframes on the populated database.
+
+As the cost of syncing depends on the storage, pass ``--dir`` to place the
+databases on the disk of interest. Storage with cheap syncs (tmpfs, many
+virtual disks) hides most of the difference between profiles.
+
+Usage::
+
+    python benchmarks/bench_sqlite_profiles.py --writes 500 --reads 500 --dir ~/tmp
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import os
+import random
+import shutil
+import tempfile
+import timeit
+
+from hamster_lib import Activity, Category, Fact
+from hamster_lib.backends.sqlalchemy.storage import (SQLITE_PROFILES, SQLAlchemyStore,
+                                                     dispose_engines)
+
+EPOCH = datetime.datetime(2015, 1, 1, 8)
+
+
+def run(tmpdir, profile, writes, reads):
+    """Return milliseconds per write and per read for the given profile."""
+    config = {
+        'store': 'sqlalchemy',
+        'day_start': datetime.time(5, 30),
+        'db_engine': 'sqlite',
+        'db_path': os.path.join(tmpdir, '{}.sqlite'.format(profile)),
+        'tmpfile_path': os.path.join(tmpdir, 'tmp.fact'),
+        'fact_min_delta': 60,
+        'db_sqlite_profile': profile,
+    }
+    store = SQLAlchemyStore(config)
+    activity = Activity('benchmark', category=Category('benchmarks'))
+    starts = iter([EPOCH + datetime.timedelta(hours=i) for i in range(writes)])
+
+    def write():
+        start = next(starts)
+        store.facts.save(Fact(activity, start, start + datetime.timedelta(minutes=30)))
+
+    def read():
+        start = EPOCH + datetime.timedelta(hours=random.randrange(writes))
+        store.facts.get_page(start, start + datetime.timedelta(days=7), limit=50)
+
+    write_seconds = timeit.timeit(write, number=writes)
+    read_seconds = timeit.timeit(read, number=reads)
+    store.session.close()
+    return write_seconds * 1000 / writes, read_seconds * 1000 / reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--writes', type=int, default=500)
+    parser.add_argument('--reads', type=int, default=500)
+    parser.add_argument('--dir', default=None,
+                        help="Directory to create the databases in.")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(dir=args.dir)
+    try:
+        print('{:>10} {:>14} {:>14}'.format('profile', 'ms per write', 'ms per read'))  # NOQA
+        for profile in sorted(SQLITE_PROFILES):
+            write, read = run(tmpdir, profile, args.writes, args.reads)
+            print('{:>10} {:>14.3f} {:>14.3f}'.format(profile, write, read))  # NOQA
+    finally:
+        dispose_engines()
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Measure ``HamsterControl(config)`` startup latency on an existing database.
+
+Three scenarios are timed:
+
+* ``create_all``: What every startup used to cost, a new engine plus
+  ``metadata.create_all``.
+* ``new process``: The first controller of a process, a new engine plus the
+  schema version check.
+* ``shared engine``: Any further controller (e.g. after ``update_config``) reusing
+  the engine of this process.
+
+Usage::
+
+    python benchmarks/bench_startup.py --repeat 50
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import os
+import shutil
+import tempfile
+import timeit
+
+from hamster_lib import HamsterControl
+from hamster_lib.backends.sqlalchemy import objects
+from hamster_lib.backends.sqlalchemy.storage import dispose_engines
+from sqlalchemy import create_engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        config = {
+            'store': 'sqlalchemy',
+            'day_start': datetime.time(5, 30),
+            'db_engine': 'sqlite',
+            'db_path': os.path.join(tmpdir, 'bench.sqlite'),
+            'tmpfile_path': os.path.join(tmpdir, 'tmp.fact'),
+            'fact_min_delta': 60,
+        }
+        # Create the database once, so all rounds start from an existing one.
+        HamsterControl(config)
+
+        def create_all():
+            engine = create_engine('sqlite:///{}'.format(config['db_path']))
+            objects.metadata.create_all(engine)
+            engine.dispose()
+
+        def new_process():
+            dispose_engines()
+            HamsterControl(config)
+
+        print('{:>16} {:>12}'.format('scenario', 'ms'))  # NOQA
+        for name, function in (
+            ('create_all', create_all),
+            ('new process', new_process),
+            ('shared engine', lambda: HamsterControl(config)),
+        ):
+            seconds = min(timeit.repeat(function, number=1, repeat=args.repeat))
+            print('{:>16} {:>12.3f}'.format(name, seconds * 1000))  # NOQA
+    finally:
+        dispose_engines()
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Compare the per call overhead of hot lookups built by ``Query`` and baked statements.
+
+The ``Query`` column runs the queries the managers used to build on every call,
+the baked column the managers methods themselves. Lookup caches are disabled, so
+each call actually hits the database. The database is tiny, so the numbers are
+dominated by statement construction and compilation.
+
+Usage::
+
+    python benchmarks/bench_statements.py --calls 5000
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import os
+import shutil
+import tempfile
+import timeit
+
+from hamster_lib import Activity, Category, Fact
+from hamster_lib.backends.sqlalchemy import AlchemyActivity, AlchemyCategory, AlchemyFact
+from hamster_lib.backends.sqlalchemy.storage import SQLAlchemyStore, dispose_engines
+
+EPOCH = datetime.datetime(2015, 1, 1, 8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=5000)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    config = {
+        'store': 'sqlalchemy',
+        'day_start': datetime.time(5, 30),
+        'db_engine': 'sqlite',
+        'db_path': os.path.join(tmpdir, 'hamster.sqlite'),
+        'tmpfile_path': os.path.join(tmpdir, 'tmp.fact'),
+        'fact_min_delta': 60,
+        'lookup_cache_size': 0,
+    }
+    try:
+        store = SQLAlchemyStore(config)
+        category = store.categories.save(Category('benchmarks'))
+        activity = store.activities.save(Activity('benchmark', category=category))
+        store.facts.save(Fact(activity, EPOCH, EPOCH + datetime.timedelta(minutes=30)))
+        start, end = EPOCH - datetime.timedelta(hours=2), EPOCH - datetime.timedelta(hours=1)
+        session = store.session
+
+        def activity_query():
+            # ``get_by_composite`` looks up the category first.
+            alchemy_category = session.query(AlchemyCategory).filter_by(
+                name=category.name).one()
+            session.query(AlchemyActivity).filter_by(name=activity.name).filter_by(
+                category=alchemy_category).one()
+
+        def overlaps_query():
+            query = store.facts._filter_overlaps(session.query(AlchemyFact.pk), start, end)
+            query.first()
+
+        lookups = (
+            ('category by name',
+                lambda: session.query(AlchemyCategory).filter_by(name=category.name).one(),
+                lambda: store.categories.get_by_name(category.name)),
+            ('activity by composite', activity_query,
+                lambda: store.activities.get_by_composite(activity.name, category)),
+            ('overlaps', overlaps_query, lambda: store.facts.overlaps(start, end)),
+        )
+
+        print('{:>22} {:>12} {:>12}'.format('lookup', 'us Query', 'us baked'))  # NOQA
+        for name, query, baked in lookups:
+            query_seconds = timeit.timeit(query, number=args.calls)
+            baked_seconds = timeit.timeit(baked, number=args.calls)
+            print('{:>22} {:>12.1f} {:>12.1f}'.format(name,  # NOQA
+                query_seconds * 1e6 / args.calls, baked_seconds * 1e6 / args.calls))
+        store.cleanup()
+    finally:
+        dispose_engines()
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
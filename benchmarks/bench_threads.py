@@ -0,0 +1,94 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Measure fact read throughput of a single store shared by a growing number of threads.
+
+A WAL-mode SQLite file is filled with ``--facts`` hourly facts spread over 50
+activities. Then each thread count runs ``--reads`` reports, spread over a thread
+pool sharing one ``SQLAlchemyStore``: ``FactManager.get_all`` for the facts of one
+activity within a random month, followed by ``FactManager.get_totals`` for that
+month. A good part of each report is spent by SQLite scanning the month, with
+only few objects built from its results. Every thread releases its session via
+``cleanup`` after each report.
+
+SQLite releases the GIL while executing queries, so only that part runs in
+parallel: throughput scales with the number of threads up to the number of CPU
+cores, and by less than that. On a single core, or for reads dominated by Python
+such as large pages of facts, no gain is to be expected at all.
+
+Usage::
+
+    python benchmarks/bench_threads.py --facts 20000 --reads 500 --threads 1 2 4 8
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import os
+import random
+import shutil
+import tempfile
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+from hamster_lib import Activity, Category, Fact
+from hamster_lib.backends.sqlalchemy.storage import SQLAlchemyStore, dispose_engines
+
+EPOCH = datetime.datetime(2015, 1, 1, 8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--facts', type=int, default=20000)
+    parser.add_argument('--reads', type=int, default=500)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    config = {
+        'store': 'sqlalchemy',
+        'day_start': datetime.time(5, 30),
+        'db_engine': 'sqlite',
+        'db_path': os.path.join(tmpdir, 'hamster.sqlite'),
+        'tmpfile_path': os.path.join(tmpdir, 'tmp.fact'),
+        'fact_min_delta': 60,
+        'db_sqlite_profile': 'fast',
+        'db_pool_size': max(args.threads),
+    }
+    try:
+        store = SQLAlchemyStore(config)
+        activities = [Activity('activity {}'.format(i), category=Category(
+            'category {}'.format(i % 5))) for i in range(50)]
+        store.facts.save_many([Fact(activities[i % 50], EPOCH + datetime.timedelta(hours=i),
+                                    EPOCH + datetime.timedelta(hours=i, minutes=30))
+                               for i in range(args.facts)])
+        store.cleanup()
+
+        def read(index):
+            start = EPOCH + datetime.timedelta(hours=random.randrange(args.facts))
+            end = start + datetime.timedelta(days=30)
+            try:
+                store.facts.get_all(start, end, random.choice(activities).name)
+                store.facts.get_totals(start, end)
+            finally:
+                store.cleanup()
+
+        print('{:>8} {:>14} {:>10}'.format('threads', 'reads per sec', 'speedup'))  # NOQA
+        baseline = None
+        for threads in args.threads:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                # Warm up the pool, so connections are opened outside of the timing.
+                list(pool.map(read, range(threads)))
+                seconds = timeit.timeit(lambda: list(pool.map(read, range(args.reads))),
+                                        number=1)
+            rate = args.reads / seconds
+            baseline = baseline or rate
+            print('{:>8} {:>14.0f} {:>9.2f}x'.format(threads, rate, rate / baseline))  # NOQA
+    finally:
+        dispose_engines()
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Compare summing up fact durations in Python with ``FactManager.get_totals``.
+
+A sqlite database is filled with ``--days`` worth of facts (eight per day, spread
+over a couple of activities and tags). Then the daily totals per category are
+computed once from ``FactManager.get_all`` and once via ``get_totals``.
+
+Usage::
+
+    python benchmarks/bench_totals.py --days 365
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import os
+import shutil
+import tempfile
+import timeit
+from collections import defaultdict
+
+from hamster_lib import Activity, Category, Fact, Tag
+from hamster_lib.backends.sqlalchemy.storage import SQLAlchemyStore
+
+EPOCH = datetime.datetime(2015, 1, 1, 8)
+
+
+def python_totals(store):
+    """Sum up durations per category and day the way consumers used to do."""
+    totals = defaultdict(datetime.timedelta)
+    for fact in store.facts.get_all():
+        totals[(fact.category.name, fact.start.date())] += fact.delta
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        config = {
+            'store': 'sqlalchemy',
+            'day_start': datetime.time(5, 30),
+            'db_engine': 'sqlite',
+            'db_path': os.path.join(tmpdir, 'bench.sqlite'),
+            'tmpfile_path': os.path.join(tmpdir, 'tmp.fact'),
+            'fact_min_delta': 60,
+        }
+        store = SQLAlchemyStore(config)
+        activities = [Activity('activity {}'.format(i), category=Category('category {}'.format(
+            i % 3))) for i in range(6)]
+        tags = [Tag('tag {}'.format(i)) for i in range(4)]
+
+        def generate():
+            for day in range(args.days):
+                for slot in range(8):
+                    start = EPOCH + datetime.timedelta(days=day, hours=slot)
+                    yield Fact(activities[(day + slot) % len(activities)], start,
+                        start + datetime.timedelta(minutes=45),
+                        tags=[tags[slot % len(tags)]])
+
+        store.facts.save_many(generate())
+
+        print('{:>12} {:>12}'.format('method', 'ms'))  # NOQA
+        for name, function in (
+            ('get_all', lambda: python_totals(store)),
+            ('get_totals', lambda: store.facts.get_totals(group_by=('category', 'day'))),
+        ):
+            seconds = min(timeit.repeat(function, number=1, repeat=args.repeat))
+            print('{:>12} {:>12.1f}'.format(name, seconds * 1000))  # NOQA
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+# -*- encoding: utf-8 -*-
+
+# This file is part of 'hamster-lib'.
+#
+# 'hamster-lib' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-lib' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-lib'.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module provides an asyncio friendly counterpart to ``HamsterControl``.
+
+Store access is blocking. ``AsyncHamsterControl`` therefore runs all manager calls
+on threads of its own and returns awaitables instead of results, so an event loop
+stays responsive while the database is busy.
+
+Note:
+    This module requires Python 3.4 or later.
+"""
+
+from __future__ import unicode_literals
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .lib import HamsterControl
+
+# Manager methods available on ``AsyncHamsterControl`` as ``(writes, reads)``.
+ASYNC_MANAGER_METHODS = {
+    'categories': (
+        ('save', 'get_or_create', 'remove'),
+        ('get', 'get_by_name', 'get_all'),
+    ),
+    'activities': (
+        ('save', 'get_or_create', 'remove'),
+        ('get', 'get_by_composite', 'get_all'),
+    ),
+    'tags': (
+        ('save', 'get_or_create', 'remove'),
+        ('get', 'get_by_name', 'get_all'),
+    ),
+    'facts': (
+        ('save', 'save_many', 'remove', 'update_tmp_fact', 'stop_tmp_fact',
+         'cancel_tmp_fact'),
+        ('get', 'get_all', 'get_page', 'get_totals', 'get_frame', 'get_today',
+         'get_tmp_fact', 'overlaps'),
+    ),
+}
+
+
+class AsyncManager(object):
+    """
+    Expose the methods of one of the stores managers as coroutine counterparts.
+
+    Calling any of the methods listed in ``ASYNC_MANAGER_METHODS`` returns an
+    awaitable for its result. Arguments are the same as for the blocking method.
+    """
+
+    def __init__(self, control, name):
+        self._control = control
+        self._name = name
+        self._writes, self._reads = ASYNC_MANAGER_METHODS[name]
+
+    def __getattr__(self, method):
+        if method in self._writes:
+            write = True
+        elif method in self._reads:
+            write = False
+        else:
+            raise AttributeError(_(
+                "'{name}' provides no coroutine counterpart of '{method}'.".format(
+                    name=self._name, method=method)
+            ))
+
+        def call(*args, **kwargs):
+            return self._control._run(write, self._name, method, args, kwargs)
+        call.__name__ = str(method)
+        return call
+
+
+class AsyncHamsterControl(object):
+    """
+    Provide the managers of ``HamsterControl`` with awaitable results.
+
+    All writes are passed to one dedicated thread, one after another. So checks
+    like the one for overlapping facts are never raced by a concurrent write.
+    Reads are run on a pool of up to ``max_readers`` threads, in parallel to each
+    other as well as to the writer.
+
+    All threads share one ``HamsterControl``. Each call uses a session of its own,
+    which is closed once the call is done (see ``BaseStore.cleanup``), so it always
+    sees the latest committed state.
+
+    Example:
+        control = AsyncHamsterControl(config)
+        fact = await control.facts.save(fact)
+        facts = await control.facts.get_today()
+        control.close()
+
+    Args:
+        config (dict): Config as expected by ``HamsterControl``.
+        max_readers (int): Maximum number of concurrent reads. ``0`` runs reads on
+            the writer thread as well. As transactions on in memory SQLite databases
+            are not isolated from each other, reads are always passed to the writer
+            for those.
+        loop (asyncio.AbstractEventLoop, optional): Event loop the awaitables belong
+            to. Defaults to the current event loop at the time of each call.
+    """
+
+    def __init__(self, config, max_readers=4, loop=None):
+        if max_readers < 0:
+            raise ValueError(_("The number of readers needs to be zero or positive."))
+        if config.get('db_engine') == 'sqlite' and config.get('db_path') == ':memory:':
+            max_readers = 0
+
+        self.config = config
+        self.controller = HamsterControl(config)
+        self._loop = loop
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        if max_readers:
+            self._readers = ThreadPoolExecutor(max_workers=max_readers)
+        else:
+            self._readers = None
+
+        self.categories = AsyncManager(self, 'categories')
+        self.activities = AsyncManager(self, 'activities')
+        self.tags = AsyncManager(self, 'tags')
+        self.facts = AsyncManager(self, 'facts')
+
+    def close(self):
+        """
+        Wait for all pending calls and release all threads.
+
+        Returns:
+            None
+        """
+        self._writer.shutdown(wait=True)
+        if self._readers:
+            self._readers.shutdown(wait=True)
+        self.controller.store.cleanup()
+
+    def _run(self, write, manager, method, args, kwargs):
+        """
+        Schedule a manager call on the writer or a reader thread.
+
+        Args:
+            write (bool): Whether the call may change any data.
+            manager (text_type): Name of the manager, e.g. ``'facts'``.
+            method (text_type): Name of the managers method.
+            args (tuple): Positional arguments for the method.
+            kwargs (dict): Keyword arguments for the method.
+
+        Returns:
+            asyncio.Future: Future for the result of the call.
+        """
+        executor = self._writer
+        if not write and self._readers is not None:
+            executor = self._readers
+        call = functools.partial(self._call, manager, method, args, kwargs)
+        loop = self._loop or asyncio.get_event_loop()
+        return loop.run_in_executor(executor, call)
+
+    def _call(self, manager, method, args, kwargs):
+        """Run a manager call, releasing the session of the current thread afterwards."""
+        store = self.controller.store
+        try:
+            return getattr(getattr(store, manager), method)(*args, **kwargs)
+        finally:
+            store.cleanup()
@@ -44,15 +44,19 @@ from __future__ import unicode_literals
 
 from future.utils import python_2_unicode_compatible
 from hamster_lib import Activity, Category, Fact, Tag
-from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Integer,
+from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Index, Integer,
                         MetaData, Table, Unicode, UniqueConstraint)
 from sqlalchemy.orm import mapper, relationship
+from sqlalchemy.sql import column, table
 
 DEFAULT_STRING_LENGTH = 254
 
 
 @python_2_unicode_compatible
 class AlchemyCategory(Category):
+    # Mapped attributes bypass the property setters that invalidate cached tuples.
+    _cache_tuples = False
+
     def __init__(self, pk, name):
         """
         Initiate a new SQLAlchemy category instance.
@@ -64,16 +68,24 @@ class AlchemyCategory(Category):
         self.pk = pk
         self.name = name
 
-    def as_hamster(self):
-        """Provide an convenient way to return it as a ``hamster_lib.Category`` instance."""
-        return Category(
-            pk=self.pk,
-            name=self.name
-        )
+    def as_hamster(self, pool=None):
+        """
+        Provide an convenient way to return it as a ``hamster_lib.Category`` instance.
+
+        Args:
+            pool (hamster_lib.helpers.cache.InternPool, optional): Pool to take a shared
+                instance from instead of creating a new one.
+        """
+        if pool is not None:
+            return pool.category(self.pk, self.name)
+        return Category._from_trusted(self.name, pk=self.pk)
 
 
 @python_2_unicode_compatible
 class AlchemyActivity(Activity):
+    # Mapped attributes bypass the property setters that invalidate cached tuples.
+    _cache_tuples = False
+
     def __init__(self, pk, name, category, deleted):
         """
         Initiate a new instance.
@@ -91,22 +103,32 @@ class AlchemyActivity(Activity):
         self.category = category
         self.deleted = deleted
 
-    def as_hamster(self):
-        """Provide an convenient way to return it as a ``hamster_lib.Activity`` instance."""
+    def as_hamster(self, pool=None):
+        """
+        Provide an convenient way to return it as a ``hamster_lib.Activity`` instance.
+
+        Args:
+            pool (hamster_lib.helpers.cache.InternPool, optional): Pool to take a shared
+                instance from instead of creating a new one.
+        """
+        if pool is not None:
+            category = self.category
+            return pool.activity(self.pk, self.name,
+                category_pk=category.pk if category else None,
+                category_name=category.name if category else None, deleted=self.deleted)
         if self.category:
             category = self.category.as_hamster()
         else:
             category = None
-        return Activity(
-            pk=self.pk,
-            name=self.name,
-            category=category,
-            deleted=self.deleted
-        )
+        return Activity._from_trusted(self.name, pk=self.pk, category=category,
+            deleted=bool(self.deleted))
 
 
 @python_2_unicode_compatible
 class AlchemyTag(Tag):
+    # Mapped attributes bypass the property setters that invalidate cached tuples.
+    _cache_tuples = False
+
     def __init__(self, pk, name):
         """
         Initiate a new SQLAlchemy tag instance.
@@ -118,16 +140,24 @@ class AlchemyTag(Tag):
         self.pk = pk
         self.name = name
 
-    def as_hamster(self):
-        """Provide an convenient way to return it as a ``hamster_lib.Tag`` instance."""
-        return Tag(
-            pk=self.pk,
-            name=self.name
-        )
+    def as_hamster(self, pool=None):
+        """
+        Provide an convenient way to return it as a ``hamster_lib.Tag`` instance.
+
+        Args:
+            pool (hamster_lib.helpers.cache.InternPool, optional): Pool to take a shared
+                instance from instead of creating a new one.
+        """
+        if pool is not None:
+            return pool.tag(self.pk, self.name)
+        return Tag._from_trusted(self.name, pk=self.pk)
 
 
 @python_2_unicode_compatible
 class AlchemyFact(Fact):
+    # Mapped attributes bypass the property setters that invalidate cached tuples.
+    _cache_tuples = False
+
     def __init__(self, pk, activity, start, end, description):
         """
         Initiate a new instance.
@@ -148,16 +178,17 @@ class AlchemyFact(Fact):
         # Tags can only be assigned after the fact has been created.
         self.tags = list()
 
-    def as_hamster(self):
-        """Provide an convenient way to return it as a ``hamster_lib.Fact`` instance."""
-        return Fact(
-            pk=self.pk,
-            activity=self.activity.as_hamster(),
-            start=self.start,
-            end=self.end,
-            description=self.description,
-            tags=set([tag.as_hamster() for tag in self.tags]),
-        )
+    def as_hamster(self, pool=None):
+        """
+        Provide an convenient way to return it as a ``hamster_lib.Fact`` instance.
+
+        Args:
+            pool (hamster_lib.helpers.cache.InternPool, optional): Pool to take shared
+                activity, category and tag instances from.
+        """
+        return Fact._from_trusted(self.activity.as_hamster(pool), self.start, end=self.end,
+            pk=self.pk, description=self.description,
+            tags=set([tag.as_hamster(pool) for tag in self.tags]))
 
 
 metadata = MetaData()
@@ -200,9 +231,11 @@ facts = Table(
     'facts', metadata,
     Column('id', Integer, primary_key=True),
     Column('start', DateTime),
-    Column('end', DateTime),
+    Column('end', DateTime, index=True),
     Column('activity_id', Integer, ForeignKey(activities.c.id)),
     Column('description', Unicode(500)),
+    # Covers range scans on ``start`` as well as keyset pagination ordered by (start, id).
+    Index('ix_facts_start_id', 'start', 'id'),
 )
 
 mapper(AlchemyFact, facts, properties={
@@ -213,6 +246,76 @@ mapper(AlchemyFact, facts, properties={
 
 facttags = Table(
     'facttags', metadata,
-    Column('fact_id', Integer, ForeignKey(facts.c.id)),
-    Column('tag_id', Integer, ForeignKey(tags.c.id)),
+    # The primary key covers lookups by fact, the index lookups of facts by tag.
+    Column('fact_id', Integer, ForeignKey(facts.c.id), primary_key=True),
+    Column('tag_id', Integer, ForeignKey(tags.c.id), primary_key=True),
+    Index('ix_facttags_tag_id', 'tag_id'),
+)
+
+# Version of the layout above. Bump it whenever tables or indexes change, so databases
+# created by previous versions get upgraded by ``SQLAlchemyStore`` on startup.
+SCHEMA_VERSION = 2
+
+schema_version = Table(
+    'schema_version', metadata,
+    Column('version', Integer, primary_key=True),
+)
+
+# Optional SQLite FTS5 index over the searchable text of each fact. Its ``rowid`` is the
+# facts PK. The table is kept in sync by triggers, see ``SQLAlchemyStore._create_fulltext_index``.
+# Not part of ``metadata`` as it is only created on demand by ``FULLTEXT_DDL``.
+facts_fts = table('facts_fts', column('rowid'), column('rank'))
+
+_FULLTEXT_SELECT = """
+    SELECT facts.id, activities.name, categories.name, facts.description,
+        (SELECT group_concat(tags.name, ' ') FROM facttags
+            JOIN tags ON tags.id = facttags.tag_id WHERE facttags.fact_id = facts.id)
+    FROM facts
+    LEFT JOIN activities ON activities.id = facts.activity_id
+    LEFT JOIN categories ON categories.id = activities.category_id"""
+
+_FULLTEXT_REFRESH = """
+    DELETE FROM facts_fts WHERE rowid IN ({ids});
+    INSERT INTO facts_fts (rowid, activity, category, description, tags)""" + (
+    _FULLTEXT_SELECT) + """
+    WHERE facts.id IN ({ids});"""
+
+_FULLTEXT_TRIGGERS = (
+    ('facts_fts_insert', 'AFTER INSERT ON facts', 'NEW.id'),
+    ('facts_fts_update', 'AFTER UPDATE ON facts', 'NEW.id'),
+    ('facttags_fts_insert', 'AFTER INSERT ON facttags', 'NEW.fact_id'),
+    ('facttags_fts_delete', 'AFTER DELETE ON facttags', 'OLD.fact_id'),
+    ('activities_fts_update', 'AFTER UPDATE OF name, category_id ON activities',
+        'SELECT id FROM facts WHERE activity_id = NEW.id'),
+    ('categories_fts_update', 'AFTER UPDATE OF name ON categories',
+        'SELECT facts.id FROM facts JOIN activities ON activities.id = facts.activity_id'
+        ' WHERE activities.category_id = NEW.id'),
+    ('categories_fts_delete', 'AFTER DELETE ON categories',
+        'SELECT facts.id FROM facts JOIN activities ON activities.id = facts.activity_id'
+        ' WHERE activities.category_id = OLD.id'),
+    ('tags_fts_update', 'AFTER UPDATE OF name ON tags',
+        'SELECT fact_id FROM facttags WHERE tag_id = NEW.id'),
+    ('tags_fts_delete', 'AFTER DELETE ON tags',
+        'SELECT fact_id FROM facttags WHERE tag_id = OLD.id'),
+)
+
+FULLTEXT_DDL = (
+    'CREATE VIRTUAL TABLE facts_fts USING fts5(activity, category, description, tags)',
+    'CREATE TRIGGER facts_fts_delete AFTER DELETE ON facts BEGIN'
+    ' DELETE FROM facts_fts WHERE rowid = OLD.id; END',
+) + tuple(
+    'CREATE TRIGGER {name} {event} BEGIN {refresh} END'.format(
+        name=name, event=event, refresh=_FULLTEXT_REFRESH.format(ids=ids))
+    for name, event, ids in _FULLTEXT_TRIGGERS
+) + (
+    'INSERT INTO facts_fts (rowid, activity, category, description, tags)' + _FULLTEXT_SELECT,
+)
+
+# Removes the full text index along with its triggers, e.g. before tables they refer to
+# get rebuilt.
+FULLTEXT_DROP_DDL = tuple(
+    'DROP TRIGGER IF EXISTS {}'.format(name)
+    for name in ('facts_fts_delete',) + tuple(name for name, event, ids in _FULLTEXT_TRIGGERS)
+) + (
+    'DROP TABLE IF EXISTS facts_fts',
 )
@@ -20,21 +20,226 @@
 
 from __future__ import unicode_literals
 
+import bisect
+import datetime
 import os.path
+import re
+import sys
+import threading
 from builtins import str
+from contextlib import contextmanager
 
 from future.utils import python_2_unicode_compatible
-from hamster_lib import storage
+from hamster_lib import Activity, Category, Fact, Tag, storage
+from hamster_lib.helpers.cache import InternPool, LRUCache
 from six import text_type
-from sqlalchemy import create_engine
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import sessionmaker
+from six.moves.urllib.request import pathname2url
+from sqlalchemy import (Date, bindparam, cast, create_engine, event, extract,
+                        func, inspect, literal, literal_column, null, select,
+                        text)
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext import baked
+from sqlalchemy.orm import (joinedload, make_transient_to_detached,
+                            scoped_session, selectinload, sessionmaker)
 from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy.pool import QueuePool, StaticPool
 from sqlalchemy.sql.expression import and_, or_
 
 from . import objects
 from .objects import AlchemyActivity, AlchemyCategory, AlchemyFact, AlchemyTag
 
+# Strategies available to load facts related instances. See ``FactManager._query_facts``.
+FACT_LOADING_STRATEGIES = ('eager', 'lazy', 'core')
+
+# Default number of natural keys each manager remembers. See ``SQLAlchemyStore.__init__``.
+LOOKUP_CACHE_SIZE = 1024
+
+# SQLite pragmas that may be set by ``config['db_<pragma>']`` and the values they accept.
+# ``None`` stands for any integer.
+SQLITE_PRAGMAS = (
+    ('journal_mode', ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')),
+    ('synchronous', ('OFF', 'NORMAL', 'FULL', 'EXTRA')),
+    ('mmap_size', None),
+    ('cache_size', None),
+    ('temp_store', ('DEFAULT', 'FILE', 'MEMORY')),
+    ('busy_timeout', None),
+)
+
+# Named pragma presets selectable by ``config['db_sqlite_profile']``.
+SQLITE_PROFILES = {
+    # SQLites own defaults.
+    'default': {},
+    # Readers do not block writers, every commit is still synced to disk.
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000,
+    },
+    # Commits are only synced on checkpoints. A power loss may cost the latest
+    # transactions but never corrupts the database.
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+}
+
+# Engines shared by all stores of this process, keyed by database URL and engine options.
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _fulltext_query(term):
+    """
+    Translate a search term into an FTS5 query.
+
+    Words are matched as a whole, unless they end in ``*`` which makes them match
+    any word starting with them. Double quoted parts are matched as a phrase. All
+    parts need to match. Any other FTS5 syntax is escaped.
+
+    Args:
+        term (text_type): Search term as entered by the user.
+
+    Returns:
+        text_type: FTS5 query. Empty if ``term`` does not contain any words.
+    """
+    parts = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', term):
+        if phrase.strip():
+            parts.append('"{}"'.format(phrase))
+        elif word:
+            prefix = '*' if word.endswith('*') else ''
+            word = word.rstrip('*').replace('"', '""')
+            if word:
+                parts.append('"{}"{}'.format(word, prefix))
+    return ' '.join(parts)
+
+
+def dispose_engines():
+    """
+    Dispose all engines shared by the stores of this process.
+
+    Stores created afterwards will set up new engines. This is useful after forking
+    a process or to release all database connections on shutdown.
+
+    Returns:
+        None
+    """
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+def _reset_sqlite_transactions(dbapi_connection, connection_record):
+    """
+    Hand transaction handling back to ``sqlite3`` once a connection is returned.
+
+    ``SQLAlchemyStore._begin`` takes it over for the duration of a transaction.
+    """
+    if 'isolation_level' in connection_record.info:
+        dbapi_connection.isolation_level = connection_record.info.pop('isolation_level')
+
+
+# Hot lookup queries, built and compiled once per process instead of once per call.
+# Each is called with a session and given its values by ``.params()``.
+_bakery = baked.bakery()
+
+_category_by_pk = _bakery(lambda session: session.query(AlchemyCategory))
+
+_category_by_name = _bakery(lambda session: session.query(AlchemyCategory).filter(
+    AlchemyCategory.name == bindparam('name')))
+
+_activity_by_pk = _bakery(lambda session: session.query(AlchemyActivity))
+
+_activity_by_composite = _bakery(lambda session: session.query(AlchemyActivity).filter(
+    AlchemyActivity.name == bindparam('name'),
+    AlchemyActivity.category_id == bindparam('category_pk')))
+
+_activity_by_name_without_category = _bakery(lambda session: session.query(
+    AlchemyActivity).filter(AlchemyActivity.name == bindparam('name'),
+    AlchemyActivity.category_id.is_(None)))
+
+_tag_by_pk = _bakery(lambda session: session.query(AlchemyTag))
+
+_tag_by_name = _bakery(lambda session: session.query(AlchemyTag).filter(
+    AlchemyTag.name == bindparam('name')))
+
+# See ``FactManager._filter_overlaps`` for the reasoning behind this query.
+_fact_overlap = _bakery(lambda session: session.query(AlchemyFact.pk).filter(
+    AlchemyFact.start >= func.coalesce(
+        select([func.max(objects.facts.c.start)]).where(
+            objects.facts.c.start <= bindparam('start')).as_scalar(),
+        bindparam('start')),
+    AlchemyFact.end > bindparam('start'),
+    AlchemyFact.start < bindparam('end'),
+))
+
+_fact_overlap_excluding = _fact_overlap.with_criteria(lambda query: query.filter(
+    AlchemyFact.pk != bindparam('exclude_pk')))
+
+
+def _insert_ignore(store, table, rows, conflict_columns):
+    """
+    Insert rows skipping those that would violate a unique constraint, in one statement.
+
+    This uses ``INSERT ... ON CONFLICT DO NOTHING RETURNING``, see
+    ``SQLAlchemyStore._supports_upsert``. Pending changes of the session are flushed
+    beforehand.
+
+    Args:
+        store (SQLAlchemyStore): Store whose session is to be used.
+        table (sqlalchemy.Table): Table to insert into.
+        rows (list): Dictionaries of column values, all using the same columns.
+        conflict_columns (tuple): Columns of the unique constraint that may be violated.
+
+    Returns:
+        list: ``(id,) + conflict_columns`` rows of the rows actually inserted. ``None`` if
+            the database does not support upserts.
+    """
+    if not store._supports_upsert():
+        return None
+    columns = sorted(rows[0])
+    params = {}
+    values = []
+    for index, row in enumerate(rows):
+        for column in columns:
+            params['{}_{}'.format(column, index)] = row[column]
+        values.append('({})'.format(', '.join(
+            ':{}_{}'.format(column, index) for column in columns)))
+    statement = text(
+        'INSERT INTO {table} ({columns}) VALUES {values} ON CONFLICT ({conflict})'
+        ' DO NOTHING RETURNING id, {conflict}'.format(table=table.name,
+            columns=', '.join(columns), values=', '.join(values),
+            conflict=', '.join(conflict_columns)))
+    session = store.session
+    session.flush()
+    result = session.execute(statement, params)
+    # Python 2's ``sqlite3`` provides no result at all if every row conflicted.
+    if not result.returns_rows:
+        return []
+    return result.fetchall()
+
+
+def _merge_cached(session, instance, related=()):
+    """
+    Attach an instance rebuilt from cached values to ``session`` without emitting SQL.
+
+    Args:
+        session (sqlalchemy.orm.session.Session): Session to attach the instance to.
+        instance: Transient mapped instance with its PK set.
+        related (tuple, optional): Transient related instances ``instance`` refers to.
+
+    Returns:
+        The persistent instance as present in ``session``.
+    """
+    for each in tuple(related) + (instance,):
+        make_transient_to_detached(each)
+    return session.merge(instance, load=False)
+
 
 @python_2_unicode_compatible
 class SQLAlchemyStore(storage.BaseStore):
@@ -74,33 +279,545 @@ class SQLAlchemyStore(storage.BaseStore):
 
         Note:
             The ``session`` argument is mainly useful for tests.
+
+            Engines are shared by all stores of a process using the same database URL
+            and engine options. See ``_get_engine``.
+
+            If ``config['fulltext_search']`` is set, fact search terms are matched against
+            a full text index. This is only supported for SQLite. See
+            ``_create_fulltext_index``.
+
+            Category, activity and tag managers keep a process-local cache of
+            natural key lookups. Its size per manager may be set by
+            ``config['lookup_cache_size']`` (``0`` disables it). The cache is
+            invalidated by any ``_update`` or ``remove`` of this store, but not
+            by changes made to the database by anyone else.
+
+            A store may be used by multiple threads at once. Unless a session is
+            passed, ``self.session`` is a ``scoped_session`` which provides every
+            thread with a session (and so a database transaction) of its own.
+            Transactions (see ``transaction``) are tracked per thread as well.
+            Lookup caches are shared by all threads. Lookups made within a transaction
+            are only cached once it is committed, so other threads never see PKs
+            of rows they can not see themselves (see ``_cache_lookup``). Threads should call
+            ``cleanup`` once they are done to hand their connection back to the
+            pool. As all connections to an in memory SQLite database would be
+            databases of their own, those share a single connection instead. Their
+            transactions are not isolated from each other.
+
+            If any ``read_db_*`` config key is set (see ``_get_db_url``), queries that
+            only read facts (``get_all``, ``iter_all``, ``get_page`` and ``get_totals``)
+            are run by ``self.read_session`` using an engine of their own. Its session
+            is closed after each call, so long running reads do not hold on to
+            connections or locks the writer might be waiting for. A replica may lag
+            behind, so facts just written may not be returned right away. Within
+            ``transaction`` all queries are run by ``self.session``.
         """
         super(SQLAlchemyStore, self).__init__(config)
         # [TODO]
         # It takes more deliberation to decide how to handle engine creation if
         # we receive a session. Should be require the session to bring its own
         # engine?
-        engine = create_engine(self._get_db_url())
-        self.logger.debug(_('Engine created.'))
+        engine = self._get_engine()
+        self.engine = engine
+        self._local = threading.local()
         objects.metadata.bind = engine
-        objects.metadata.create_all(engine)
-        self.logger.debug(_("Database tables created."))
         if not session:
             Session = sessionmaker(bind=engine)  # NOQA
             self.logger.debug(_("Bound engine to session-object."))
-            self.session = Session()
-            self.logger.debug(_("Instantiated session."))
+            self.session = scoped_session(Session)
+            self.logger.debug(_("Instantiated session registry."))
         else:
             self.session = session
+        self.read_engine = None
+        self.read_session = self.session
+        if self._read_engine_configured():
+            self.read_engine = self._get_engine(read=True)
+            self.read_session = scoped_session(sessionmaker(bind=self.read_engine))
+            self.logger.debug(_("Instantiated read session registry."))
         self.categories = CategoryManager(self)
         self.activities = ActivityManager(self)
         self.tags = TagManager(self)
         self.facts = FactManager(self)
+        if self.config.get('fulltext_search'):
+            self._create_fulltext_index()
 
     def cleanup(self):
-        pass
+        """
+        Close the session of the calling thread and return its connection to the pool.
+
+        The store stays usable, the thread will get a new session on its next access.
+        """
+        for session in set([self.session, self.read_session]):
+            remove = getattr(session, 'remove', None)
+            if remove:
+                remove()
+            else:
+                session.close()
+
+    def _supports_upsert(self):
+        """
+        Return ``True`` if our database understands ``ON CONFLICT DO NOTHING RETURNING``.
+
+        This is the case for PostgreSQL and SQLite 3.35 or later.
+        """
+        dialect = self.session.get_bind().dialect
+        if dialect.name == 'postgresql':
+            return True
+        if dialect.name == 'sqlite':
+            return dialect.dbapi.sqlite_version_info >= (3, 35)
+        return False
+
+    def _get_session(self):
+        """
+        Return the session of the calling thread.
+
+        Unlike the ``scoped_session`` proxy this is a plain ``Session``, as expected by
+        baked queries.
+        """
+        if isinstance(self.session, scoped_session):
+            return self.session()
+        return self.session
+
+    @property
+    def _transaction_depth(self):
+        """Number of ``transaction`` blocks the calling thread is currently within."""
+        return getattr(self._local, 'transaction_depth', 0)
+
+    @_transaction_depth.setter
+    def _transaction_depth(self, depth):
+        self._local.transaction_depth = depth
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group all changes made within into a single transaction.
 
-    def _get_db_url(self):
+        While a transaction is active, manager methods only flush their changes instead
+        of committing them. The outermost transaction commits once the block is left,
+        nested ones are backed by savepoints. If a block is left by an exception, its
+        changes are rolled back and the exception is passed on.
+        """
+        if self._transaction_depth:
+            savepoint = self.session.begin_nested()
+            pending = len(self._pending_lookups)
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                savepoint.rollback()
+                # Lookups may have been answered by rows created within the savepoint.
+                del self._pending_lookups[pending:]
+                self._clear_lookup_caches()
+                raise
+            else:
+                savepoint.commit()
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        self._begin()
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            self.session.rollback()
+            del self._pending_lookups[:]
+            self._clear_lookup_caches()
+            raise
+        self._transaction_depth -= 1
+        try:
+            self.session.commit()
+        except BaseException:
+            self.session.rollback()
+            del self._pending_lookups[:]
+            self._clear_lookup_caches()
+            raise
+        self._apply_pending_lookups()
+
+    def _begin(self):
+        """
+        Make sure the database transaction of our session has actually begun.
+
+        The SQLite driver only begins transactions right before data is changed, and
+        with Python 2 commits them before a ``SAVEPOINT``. Savepoints would therefore
+        begin, and once released commit, a transaction of their own. For the rest of
+        our transaction the driver is told to leave that to us, until its connection
+        is returned to the pool (see ``_reset_sqlite_transactions``).
+        """
+        connection = self.session.connection()
+        if connection.dialect.name == 'sqlite':
+            pool = connection.engine.pool
+            if not event.contains(pool, 'checkin', _reset_sqlite_transactions):
+                event.listen(pool, 'checkin', _reset_sqlite_transactions)
+            # Attributes set on the pool's proxy would not reach the driver's connection.
+            dbapi_connection = connection.connection.connection
+            # Python 2's driver does not tell, but does not need to either.
+            if not getattr(dbapi_connection, 'in_transaction', False):
+                connection.connection.info.setdefault('isolation_level',
+                    dbapi_connection.isolation_level)
+                dbapi_connection.isolation_level = None
+                connection.execute('BEGIN')
+
+    @contextmanager
+    def _reading(self):
+        """
+        Provide the session read-only queries are to be run by.
+
+        This is ``self.read_session`` unless no separate read engine is configured or a
+        transaction is active, whose changes should be visible to its own reads. The
+        read session is closed once the block is left, returning its connection.
+
+        Yields:
+            sqlalchemy.orm.session.Session: Session to run queries by.
+        """
+        if self.read_session is self.session or self._transaction_depth:
+            yield self.session
+            return
+        try:
+            yield self.read_session
+        finally:
+            self.read_session.close()
+
+    def _commit(self):
+        """
+        Commit the session unless a transaction is active, in which case we just flush.
+
+        Manager methods are supposed to call this instead of committing the session
+        themselves.
+        """
+        if self._transaction_depth:
+            self.session.flush()
+        else:
+            self.session.commit()
+            self._apply_pending_lookups()
+
+    def _clear_lookup_caches(self):
+        """Discard all cached natural key lookups, e.g. after a rollback."""
+        for manager in (self.categories, self.activities, self.tags):
+            manager.lookup_cache.clear()
+
+    @property
+    def _pending_lookups(self):
+        """Cache changes of the calling thread waiting for its changes to be committed."""
+        try:
+            return self._local.pending_lookups
+        except AttributeError:
+            self._local.pending_lookups = []
+            return self._local.pending_lookups
+
+    def _cache_lookup(self, cache, key, value):
+        """
+        Remember a natural key lookup, once other threads are able to see its row.
+
+        Lookup caches are shared by all threads, while rows created within a
+        transaction are only visible to other threads once it is committed, and
+        gone if it is rolled back. Within a transaction, lookups are therefore only
+        cached when it is committed. Managers are supposed to call this instead of
+        setting values themselves.
+
+        Args:
+            cache (hamster_lib.helpers.cache.LRUCache): Lookup cache of a manager.
+            key: Natural key looked up.
+            value: Value to be cached.
+        """
+        if self._transaction_depth:
+            self._pending_lookups.append((cache, key, value))
+        else:
+            cache.set(key, value)
+
+    def _invalidate_lookups(self, *caches):
+        """
+        Discard all entries of the lookup caches given.
+
+        As other threads may cache rows as they were before our changes until those
+        are committed, caches are cleared once more after the next commit.
+
+        Args:
+            *caches (hamster_lib.helpers.cache.LRUCache): Lookup caches of managers.
+        """
+        for cache in caches:
+            cache.clear()
+            self._pending_lookups.append((cache, None, None))
+
+    def _apply_pending_lookups(self):
+        """Apply cache changes of the calling thread, now that its changes are committed."""
+        pending = self._pending_lookups
+        for cache, key, value in pending:
+            # Cached values are never ``None``, these mark caches to be cleared.
+            if value is None:
+                cache.clear()
+            else:
+                cache.set(key, value)
+        del pending[:]
+
+    def _read_engine_configured(self):
+        """
+        Return ``True`` if any ``read_db_*`` config key is set and can be honoured.
+
+        Read-only SQLite databases are opened by URI, which ``sqlite3`` only supports
+        as of Python 3.4. Before, reads are run by the primary engine.
+        """
+        if not any(key.startswith('read_db_') and value not in (None, '')
+                for key, value in self.config.items()):
+            return False
+        engine = self.config.get('read_db_engine') or self.config.get('db_engine')
+        if engine == 'sqlite' and sys.version_info < (3, 4):
+            self.logger.warning(_(
+                "Python's sqlite3 can not open read-only databases, ignoring 'read_db_*'."))
+            return False
+        return True
+
+    def _get_engine(self, read=False):
+        """
+        Return an engine for our database, sharing it with other stores of this process.
+
+        The database schema is checked once per engine only. See ``_create_schema``.
+        As every engine of an in memory SQLite database is a database of its own,
+        those are never shared.
+
+        Args:
+            read (bool): Return an engine for read-only queries. Its database schema is
+                not checked and the SQLite ``journal_mode``, which can not be changed by
+                read-only connections, is left to the writer. Defaults to ``False``.
+
+        Returns:
+            sqlalchemy.engine.Engine: Engine connected to the configured database.
+        """
+        url = self._get_db_url(read=read)
+        options = self._get_engine_options()
+        pragmas = self._get_sqlite_pragmas()
+        if read:
+            pragmas = tuple((name, value) for name, value in pragmas if name != 'journal_mode')
+        if url.endswith(':memory:'):
+            return self._create_engine(url, options, pragmas)
+
+        key = (url, tuple(sorted(options.items())), pragmas)
+        with _engines_lock:
+            engine = _engines.get(key)
+            if engine is None:
+                engine = self._create_engine(url, options, pragmas, create_schema=not read)
+                _engines[key] = engine
+            else:
+                self.logger.debug(_('Reusing existing engine.'))
+        return engine
+
+    def _create_engine(self, url, options, pragmas, create_schema=True):
+        """
+        Create a new engine and make sure the database schema is current.
+
+        Args:
+            url (text_type): Database URL.
+            options (dict): Keyword arguments for ``create_engine``.
+            pragmas (tuple): ``(name, value)`` tuples of SQLite pragmas to be set for
+                each new connection.
+            create_schema (bool): Check the database schema. Defaults to ``True``.
+
+        Returns:
+            sqlalchemy.engine.Engine: New engine.
+        """
+        if url.startswith('sqlite'):
+            # Connections are handed between threads by the pool, but only ever
+            # used by one thread at a time.
+            options = dict(options, connect_args={'check_same_thread': False})
+            if url.endswith(':memory:'):
+                options['poolclass'] = StaticPool
+            else:
+                options['poolclass'] = QueuePool
+        engine = create_engine(url, **options)
+        if pragmas:
+            def set_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                for name, value in pragmas:
+                    cursor.execute('PRAGMA {} = {}'.format(name, value))
+                cursor.close()
+            event.listen(engine, 'connect', set_pragmas)
+        self.logger.debug(_('Engine created.'))
+        if create_schema:
+            self._create_schema(engine)
+        return engine
+
+    def _get_engine_options(self):
+        """
+        Return keyword arguments for ``create_engine`` as given by our config.
+
+        Our config may include:
+            * ``db_pool_size``; Number of connections kept open by the pool.
+            * ``db_pool_recycle``; Seconds after which connections are recycled.
+
+        Pool settings are ignored for in memory SQLite databases, which use a single
+        connection.
+
+        Returns:
+            dict: Keyword arguments to be passed to ``create_engine``.
+        """
+        options = {}
+        config = self.config
+        if not (config.get('db_engine') == 'sqlite' and config.get('db_path') == ':memory:'):
+            for key in ('pool_size', 'pool_recycle'):
+                value = self.config.get('db_{}'.format(key))
+                if value:
+                    options[key] = int(value)
+        return options
+
+    def _get_sqlite_pragmas(self):
+        """
+        Return the SQLite pragmas to be set for each connection as given by our config.
+
+        Our config may include:
+            * ``db_sqlite_profile``; Name of a preset from ``SQLITE_PROFILES``.
+            * ``db_journal_mode``, ``db_synchronous``, ``db_mmap_size``, ``db_cache_size``,
+              ``db_temp_store`` and ``db_busy_timeout``; Values of the pragmas of the same
+              name. Those take precedence over the profiles values.
+
+        Returns:
+            tuple: ``(name, value)`` tuples in the order of ``SQLITE_PRAGMAS``. Empty for
+                engines other than SQLite.
+
+        Raises:
+            ValueError: If the profile is unknown or a pragma value is not valid.
+        """
+        if self.config.get('db_engine') != 'sqlite':
+            return ()
+
+        profile = self.config.get('db_sqlite_profile') or 'default'
+        try:
+            values = dict(SQLITE_PROFILES[profile])
+        except KeyError:
+            message = _("Unknown SQLite profile: '{}'.".format(profile))
+            self.logger.error(message)
+            raise ValueError(message)
+
+        pragmas = []
+        for name, choices in SQLITE_PRAGMAS:
+            value = self.config.get('db_{}'.format(name))
+            if value in (None, ''):
+                value = values.get(name)
+                if value is None:
+                    continue
+            try:
+                if choices is None:
+                    value = int(value)
+                else:
+                    value = text_type(value).upper()
+                    if value not in choices:
+                        raise ValueError
+            except ValueError:
+                message = _("Invalid value for 'db_{}': '{}'.".format(name, value))
+                self.logger.error(message)
+                raise ValueError(message)
+            pragmas.append((name, value))
+        return tuple(pragmas)
+
+    def _create_schema(self, engine):
+        """
+        Make sure the database matches our current layout.
+
+        If the ``schema_version`` table already holds ``objects.SCHEMA_VERSION`` nothing
+        is done at all. Otherwise missing tables and indexes are created and the version
+        is recorded. A ``facttags`` table without primary key is rebuilt, see
+        ``_upgrade_facttags``.
+
+        Args:
+            engine (sqlalchemy.engine.Engine): Engine of the database to be checked.
+
+        Returns:
+            None
+        """
+        with engine.begin() as connection:
+            if engine.dialect.has_table(connection, objects.schema_version.name):
+                version = connection.execute(
+                    select([func.max(objects.schema_version.c.version)])).scalar()
+                if version == objects.SCHEMA_VERSION:
+                    self.logger.debug(_("Database schema is up to date."))
+                    return
+
+            self._upgrade_facttags(connection)
+            objects.metadata.create_all(connection)
+            # ``create_all`` only adds indexes along with new tables.
+            inspector = inspect(connection)
+            for table in objects.metadata.sorted_tables:
+                existing = set(index['name'] for index in inspector.get_indexes(table.name))
+                for index in table.indexes:
+                    if index.name not in existing:
+                        index.create(connection)
+            connection.execute(objects.schema_version.delete())
+            connection.execute(objects.schema_version.insert(),
+                {'version': objects.SCHEMA_VERSION})
+        self.logger.debug(_("Database tables created."))
+
+    def _upgrade_facttags(self, connection):
+        """
+        Rebuild a ``facttags`` table created before it had a primary key.
+
+        Duplicate rows are dropped along the way. As the full text index triggers refer
+        to ``facttags``, an existing full text index is dropped as well. It will be
+        recreated by ``_create_fulltext_index`` if enabled.
+
+        Args:
+            connection (sqlalchemy.engine.Connection): Connection within the transaction
+                of ``_create_schema``.
+
+        Returns:
+            None
+        """
+        table = objects.facttags.name
+        if not connection.dialect.has_table(connection, table):
+            return
+        if inspect(connection).get_pk_constraint(table)['constrained_columns']:
+            return
+
+        if connection.dialect.name == 'sqlite':
+            for statement in objects.FULLTEXT_DROP_DDL:
+                connection.execute(statement)
+        connection.execute('ALTER TABLE {0} RENAME TO {0}_old'.format(table))
+        objects.facttags.create(connection)
+        connection.execute(
+            'INSERT INTO {0} (fact_id, tag_id) SELECT DISTINCT fact_id, tag_id FROM {0}_old'
+            ' WHERE fact_id IS NOT NULL AND tag_id IS NOT NULL'.format(table))
+        connection.execute('DROP TABLE {}_old'.format(table))
+        self.logger.debug(_("Rebuilt 'facttags' with a primary key."))
+
+    def _fulltext_search_enabled(self):
+        """Return ``True`` if search terms are to be matched using the full text index."""
+        return bool(self.config.get('fulltext_search')) and (
+            self.session.get_bind().dialect.name == 'sqlite')
+
+    def _create_fulltext_index(self):
+        """
+        Create and populate the full text index unless it exists already.
+
+        The FTS5 table ``objects.facts_fts`` holds activity name, category name,
+        description and tag names of every fact. Triggers keep it in sync with any
+        change to facts, their tags, activities, categories and tags.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the SQLite library in use does not support FTS5.
+        """
+        if not self._fulltext_search_enabled():
+            self.logger.debug(_("Full text search is only supported for SQLite."))
+            return
+
+        connection = self.session.connection()
+        if connection.dialect.has_table(connection, objects.facts_fts.name):
+            return
+        try:
+            for statement in objects.FULLTEXT_DDL:
+                connection.execute(statement)
+        except OperationalError as e:
+            self.session.rollback()
+            message = _("Unable to create the full text index. Does your SQLite support"
+                " FTS5? Here is the full original exception: '{}'.".format(e))
+            self.logger.error(message)
+            raise ValueError(message)
+        self.session.commit()
+        self.logger.debug(_("Full text index created."))
+
+    def _get_db_url(self, read=False):
         """
         Create a ``database_url`` from ``config`` suitable to be consumed by ``create_engine``
 
@@ -115,6 +832,15 @@ class SQLAlchemyStore(storage.BaseStore):
         If ``db_engine='sqlite'`` you need to provide ``db_path`` as well. For any other engine
         ``db_host`` and ``db_name`` are mandatory.
 
+        For ``read=True`` each of those may be overridden by a ``read_db_*`` key of the
+        same name, e.g. ``read_db_host`` to read from a replica. SQLite databases are
+        opened read-only then. If ``read_db_immutable`` is set, SQLite is told the file
+        does not change at all, so it does not need to lock it either.
+
+        Args:
+            read (bool): Return the URL of the database read-only queries are to be
+                run against. Defaults to ``False``.
+
         Note:
             * `SQLAlchemy docs <http://docs.sqlalchemy.org/en/latest/core/engines.html>`_
 
@@ -123,19 +849,24 @@ class SQLAlchemyStore(storage.BaseStore):
 
         Raises:
             ValueError: If a required config key/value pair is not present for the choosen
-                ``db_engine``.
+                ``db_engine`` or an in memory database is to be read from.
         """
         # [FIXME]
         # Contemplate if there are security implications that warrant sanitizing
         # config values.
 
-        engine = self.config.get('db_engine', '')
-        host = self.config.get('db_host', '')
-        name = self.config.get('db_name', '')
-        path = self.config.get('db_path', '')
-        port = self.config.get('db_port', '')
-        user = self.config.get('db_user', '')
-        password = self.config.get('db_password', '')
+        def get(key):
+            if read and self.config.get('read_{}'.format(key)):
+                return self.config['read_{}'.format(key)]
+            return self.config.get(key, '')
+
+        engine = get('db_engine')
+        host = get('db_host')
+        name = get('db_name')
+        path = get('db_path')
+        port = get('db_port')
+        user = get('db_user')
+        password = get('db_password')
 
         if not engine:
             message = _("No engine found in config!")
@@ -155,6 +886,16 @@ class SQLAlchemyStore(storage.BaseStore):
             if path != ':memory:':
                 # Make sure we always use an absolute path.
                 path = os.path.abspath(path)
+            elif read:
+                message = _("In memory databases can not be read by a separate engine.")
+                self.logger.error(message)
+                raise ValueError(message)
+            if read:
+                mode = 'mode=ro'
+                if self.config.get('read_db_immutable'):
+                    mode += '&immutable=1'
+                path = 'file:{path}?{mode}&uri=true'.format(path=pathname2url(path),
+                    mode=mode)
             database_url = '{engine}:///{path}'.format(engine=engine, path=path)
         else:
             if not host:
@@ -183,6 +924,10 @@ class SQLAlchemyStore(storage.BaseStore):
 
 @python_2_unicode_compatible
 class CategoryManager(storage.BaseCategoryManager):
+    def __init__(self, store):
+        super(CategoryManager, self).__init__(store)
+        self.lookup_cache = LRUCache(store.config.get('lookup_cache_size', LOOKUP_CACHE_SIZE))
+
     def get_or_create(self, category, raw=False):
         """
         Custom version of the default method in order to provide access to alchemy instances.
@@ -198,11 +943,23 @@ class CategoryManager(storage.BaseCategoryManager):
         message = _("Recieved {!r} and raw={}.".format(category, raw))
         self.store.logger.debug(message)
 
+        name = text_type(category.name)
+        result = self._get_cached(name, raw)
+        if result is not None:
+            return result
+
+        # A single statement, unless the category exists already.
+        rows = _insert_ignore(self.store, objects.categories, [{'name': name}], ('name',))
+        if rows:
+            self.store._commit()
+            self.store._cache_lookup(self.lookup_cache, name, rows[0][0])
+            return self._build(rows[0][0], name, raw)
+
         try:
-            category = self.get_by_name(category.name, raw=raw)
+            result = self._get_by_name(name, raw=raw)
         except KeyError:
-            category = self._add(category, raw=raw)
-        return category
+            result = self._add(category, raw=raw)
+        return result
 
     def _add(self, category, raw=False):
         """
@@ -238,7 +995,10 @@ class CategoryManager(storage.BaseCategoryManager):
         alchemy_category = AlchemyCategory(pk=None, name=category.name)
         self.store.session.add(alchemy_category)
         try:
-            self.store.session.commit()
+            # Flush first, so we can learn the new PK without reloading after commit.
+            self.store.session.flush()
+            pk = alchemy_category.pk
+            self.store._commit()
         except IntegrityError as e:
             message = _(
                 "An error occured! Are you sure the category.name is not already present in our"
@@ -246,6 +1006,7 @@ class CategoryManager(storage.BaseCategoryManager):
             )
             self.store.logger.error(message)
             raise ValueError(message)
+        self.store._cache_lookup(self.lookup_cache, category.name, pk)
         self.store.logger.debug(_("'{!r}' added.".format(alchemy_category)))
 
         if not raw:
@@ -284,9 +1045,11 @@ class CategoryManager(storage.BaseCategoryManager):
             self.store.logger.error(message)
             raise KeyError(message)
         alchemy_category.name = category.name
+        # Activities are looked up by their categories name as well.
+        self.store._invalidate_lookups(self.lookup_cache, self.store.activities.lookup_cache)
 
         try:
-            self.store.session.commit()
+            self.store._commit()
         except IntegrityError as e:
             message = _(
                 "An error occured! Are you sure the category.name is not already present in our"
@@ -325,9 +1088,10 @@ class CategoryManager(storage.BaseCategoryManager):
             self.store.logger.error(message)
             raise KeyError(message)
         self.store.session.delete(alchemy_category)
+        self.store._invalidate_lookups(self.lookup_cache, self.store.activities.lookup_cache)
         message = _("{!r} successfully deleted.".format(category))
         self.store.logger.debug(message)
-        self.store.session.commit()
+        self.store._commit()
 
     def get(self, pk):
         """
@@ -349,7 +1113,7 @@ class CategoryManager(storage.BaseCategoryManager):
         message = _("Recieved PK: '{}'.".format(pk))
         self.store.logger.debug(message)
 
-        result = self.store.session.query(AlchemyCategory).get(pk)
+        result = _category_by_pk(self.store._get_session()).get(pk)
         if not result:
             message = _("No category with 'pk: {}' was found!".format(pk))
             self.store.logger.error(message)
@@ -379,12 +1143,33 @@ class CategoryManager(storage.BaseCategoryManager):
         self.store.logger.debug(message)
 
         name = text_type(name)
+        result = self._get_cached(name, raw)
+        if result is not None:
+            return result
+        return self._get_by_name(name, raw)
+
+    def _get_cached(self, name, raw=False):
+        """Return the category of given name if its PK is cached, ``None`` otherwise."""
+        pk = self.lookup_cache.get(name)
+        if pk is None:
+            return None
+        return self._build(pk, name, raw)
+
+    def _build(self, pk, name, raw=False):
+        """Return a category of known PK and name without querying the database."""
+        if raw:
+            return _merge_cached(self.store.session, AlchemyCategory(pk, name))
+        return Category._from_trusted(name, pk=pk)
+
+    def _get_by_name(self, name, raw=False):
+        """Query the database for the category of given name. See ``get_by_name``."""
         try:
-            result = self.store.session.query(AlchemyCategory).filter_by(name=name).one()
+            result = _category_by_name(self.store._get_session()).params(name=name).one()
         except NoResultFound:
             message = _("No category with 'name: {}' was found!".format(name))
             self.store.logger.error(message)
             raise KeyError(message)
+        self.store._cache_lookup(self.lookup_cache, name, result.pk)
 
         if not raw:
             result = result.as_hamster()
@@ -409,6 +1194,9 @@ class CategoryManager(storage.BaseCategoryManager):
 
 @python_2_unicode_compatible
 class ActivityManager(storage.BaseActivityManager):
+    def __init__(self, store):
+        super(ActivityManager, self).__init__(store)
+        self.lookup_cache = LRUCache(store.config.get('lookup_cache_size', LOOKUP_CACHE_SIZE))
 
     def get_or_create(self, activity, raw=False):
         """
@@ -425,8 +1213,29 @@ class ActivityManager(storage.BaseActivityManager):
         message = _("Recieved {!r}, raw={}.".format(activity, raw))
         self.store.logger.debug(message)
 
+        name = text_type(activity.name)
+        key = (name, text_type(activity.category.name) if activity.category else None)
+        result = self._get_cached(key, raw)
+        if result is not None:
+            return result
+
+        # As ``NULL`` never conflicts, activities without category can not be upserted.
+        if activity.category and self.store._supports_upsert():
+            # Read before committing, which would expire the instance and reload it.
+            category_pk = self.store.categories.get_or_create(activity.category, raw=True).pk
+            rows = _insert_ignore(self.store, objects.activities, [{'name': name,
+                'deleted': activity.deleted, 'category_id': category_pk}],
+                ('name', 'category_id'))
+            if rows:
+                self.store._commit()
+                value = (rows[0][0], activity.deleted, category_pk)
+                self.store._cache_lookup(self.lookup_cache, key, value)
+                result = self._build(key, value, raw)
+                self.store.logger.debug(_("Returning {!r}.").format(result))
+                return result
+
         try:
-            result = self.get_by_composite(activity.name, activity.category, raw=raw)
+            result = self._get_by_composite(name, activity.category, raw=raw)
         except KeyError:
             result = self._add(activity, raw=raw)
         self.store.logger.debug(_("Returning {!r}.").format(result))
@@ -480,7 +1289,14 @@ class ActivityManager(storage.BaseActivityManager):
             category = None
         alchemy_activity.category = category
         self.store.session.add(alchemy_activity)
-        self.store.session.commit()
+        # Flush first, so we can learn the new PKs without reloading after commit.
+        self.store.session.flush()
+        key = (alchemy_activity.name, category.name if category else None)
+        value = (alchemy_activity.pk, alchemy_activity.deleted, category.pk if category else None)
+        self.store._commit()
+        if category:
+            self.store._cache_lookup(self.store.categories.lookup_cache, key[1], value[2])
+        self.store._cache_lookup(self.lookup_cache, key, value)
         result = alchemy_activity
         if not raw:
             result = alchemy_activity.as_hamster()
@@ -531,8 +1347,9 @@ class ActivityManager(storage.BaseActivityManager):
         alchemy_activity.category = self.store.categories.get_or_create(activity.category,
             raw=True)
         alchemy_activity.deleted = activity.deleted
+        self.store._invalidate_lookups(self.lookup_cache)
         try:
-            self.store.session.commit()
+            self.store._commit()
         except IntegrityError as e:
             message = _("There seems to already be an activity like this for the given category."
                 "Can not change this activities values. Original exception: {}".format(e))
@@ -569,12 +1386,13 @@ class ActivityManager(storage.BaseActivityManager):
             message = _("The activity you try to remove does not seem to exist.")
             self.store.logger.error(message)
             raise KeyError(message)
+        self.store._invalidate_lookups(self.lookup_cache)
         if alchemy_activity.facts:
             alchemy_activity.deleted = True
             self.store.activities._update(alchemy_activity)
         else:
             self.store.session.delete(alchemy_activity)
-        self.store.session.commit()
+        self.store._commit()
         self.store.logger.debug(_("Deleted {!r}.".format(activity)))
         return True
 
@@ -596,7 +1414,7 @@ class ActivityManager(storage.BaseActivityManager):
         message = _("Recieved PK: '{}', raw={}.".format(pk, raw))
         self.store.logger.debug(message)
 
-        result = self.store.session.query(AlchemyActivity).get(pk)
+        result = _activity_by_pk(self.store._get_session()).get(pk)
         if not result:
             message = _("No Activity with 'pk: {}' was found!".format(pk))
             self.store.logger.error(message)
@@ -632,6 +1450,47 @@ class ActivityManager(storage.BaseActivityManager):
         self.store.logger.debug(message)
 
         name = str(name)
+        key = (name, text_type(category.name) if category else None)
+        result = self._get_cached(key, raw)
+        if result is not None:
+            return result
+        return self._get_by_composite(name, category, raw)
+
+    def _get_cached(self, key, raw=False):
+        """
+        Return the activity of given ``(name, category name)`` if cached, ``None`` otherwise.
+        """
+        value = self.lookup_cache.get(key)
+        if value is None:
+            return None
+        return self._build(key, value, raw)
+
+    def _build(self, key, value, raw=False):
+        """
+        Return an activity without querying the database.
+
+        Args:
+            key (tuple): ``(name, category name)`` of the activity.
+            value (tuple): ``(pk, deleted, category pk)`` of the activity.
+            raw (bool): Return an ``AlchemyActivity`` instead.
+        """
+        name, category_name = key
+        pk, deleted, category_pk = value
+        if category_pk is None:
+            if raw:
+                return _merge_cached(self.store.session,
+                    AlchemyActivity(pk, name, None, deleted))
+            return Activity._from_trusted(name, pk=pk, deleted=deleted)
+        if raw:
+            alchemy_category = AlchemyCategory(category_pk, category_name)
+            return _merge_cached(self.store.session,
+                AlchemyActivity(pk, name, alchemy_category, deleted), (alchemy_category,))
+        return Activity._from_trusted(name, pk=pk,
+            category=Category._from_trusted(category_name, pk=category_pk), deleted=deleted)
+
+    def _get_by_composite(self, name, category, raw=False):
+        """Query the database for an activity. See ``get_by_composite``."""
+        key = (name, text_type(category.name) if category else None)
         if category:
             category = text_type(category.name)
             try:
@@ -646,9 +1505,13 @@ class ActivityManager(storage.BaseActivityManager):
         else:
             alchemy_category = None
 
+        session = self.store._get_session()
         try:
-            result = self.store.session.query(AlchemyActivity).filter_by(name=name).filter_by(
-                category=alchemy_category).one()
+            if alchemy_category:
+                result = _activity_by_composite(session).params(name=name,
+                    category_pk=alchemy_category.pk).one()
+            else:
+                result = _activity_by_name_without_category(session).params(name=name).one()
         except NoResultFound:
             message = _(
                 "No activity of given combination (name: {name}, category: {category})"
@@ -656,6 +1519,8 @@ class ActivityManager(storage.BaseActivityManager):
             )
             self.store.logger.error(message)
             raise KeyError(message)
+        self.store._cache_lookup(self.lookup_cache, key, (result.pk, result.deleted,
+            alchemy_category.pk if alchemy_category else None))
         if not raw:
             result = result.as_hamster()
         self.store.logger.debug(_("Returning: {!r}.".format(result)))
@@ -700,6 +1565,10 @@ class ActivityManager(storage.BaseActivityManager):
 
 @python_2_unicode_compatible
 class TagManager(storage.BaseTagManager):
+    def __init__(self, store):
+        super(TagManager, self).__init__(store)
+        self.lookup_cache = LRUCache(store.config.get('lookup_cache_size', LOOKUP_CACHE_SIZE))
+
     def get_or_create(self, tag, raw=False):
         """
         Custom version of the default method in order to provide access to alchemy instances.
@@ -715,11 +1584,61 @@ class TagManager(storage.BaseTagManager):
         message = _("Recieved {!r} and raw={}.".format(tag, raw))
         self.store.logger.debug(message)
 
-        try:
-            tag = self.get_by_name(tag.name, raw=raw)
-        except KeyError:
-            tag = self._add(tag, raw=raw)
-        return tag
+        return self.get_or_create_many([tag], raw=raw)[0]
+
+    def get_or_create_many(self, tags, raw=False):
+        """
+        Return all given tags, creating those that do not exist yet.
+
+        Tags whose PK is cached are returned right away. All others are inserted by a
+        single statement (see ``_insert_ignore``) while those already present are
+        fetched by another one. Databases not supporting upserts fall back to adding
+        missing tags one by one.
+
+        Args:
+            tags (iterable): ``hamster_lib.Tag`` instances or tag names.
+            raw (bool): Wether to return AlchemyTags instead.
+
+        Returns:
+            list: Tags in the order given, without duplicates.
+        """
+
+        message = _("Recieved {!r} and raw={}.".format(tags, raw))
+        self.store.logger.debug(message)
+
+        names = []
+        for tag in tags:
+            name = text_type(tag.name if isinstance(tag, Tag) else tag)
+            if name not in names:
+                names.append(name)
+
+        results = {}
+        for name in names:
+            result = self._get_cached(name, raw)
+            if result is not None:
+                results[name] = result
+        missing = [name for name in names if name not in results]
+
+        if missing:
+            rows = _insert_ignore(self.store, objects.tags,
+                [{'name': name} for name in missing], ('name',))
+            if rows:
+                self.store._commit()
+                for pk, name in rows:
+                    self.store._cache_lookup(self.lookup_cache, name, pk)
+                    results[name] = self._build(pk, name, raw)
+            missing = [name for name in missing if name not in results]
+
+        if missing:
+            for alchemy_tag in self.store.session.query(AlchemyTag).filter(
+                    AlchemyTag.name.in_(missing)):
+                self.store._cache_lookup(self.lookup_cache, alchemy_tag.name, alchemy_tag.pk)
+                results[alchemy_tag.name] = alchemy_tag if raw else alchemy_tag.as_hamster()
+            for name in missing:
+                if name not in results:
+                    results[name] = self._add(Tag(name), raw=raw)
+
+        return [results[name] for name in names]
 
     def _add(self, tag, raw=False):
         """
@@ -755,7 +1674,10 @@ class TagManager(storage.BaseTagManager):
         alchemy_tag = AlchemyTag(pk=None, name=tag.name)
         self.store.session.add(alchemy_tag)
         try:
-            self.store.session.commit()
+            # Flush first, so we can learn the new PK without reloading after commit.
+            self.store.session.flush()
+            pk = alchemy_tag.pk
+            self.store._commit()
         except IntegrityError as e:
             message = _(
                 "An error occured! Are you sure the tag.name is not already present in our"
@@ -763,6 +1685,7 @@ class TagManager(storage.BaseTagManager):
             )
             self.store.logger.error(message)
             raise ValueError(message)
+        self.store._cache_lookup(self.lookup_cache, tag.name, pk)
         self.store.logger.debug(_("'{!r}' added.".format(alchemy_tag)))
 
         if not raw:
@@ -801,9 +1724,10 @@ class TagManager(storage.BaseTagManager):
             self.store.logger.error(message)
             raise KeyError(message)
         alchemy_tag.name = tag.name
+        self.store._invalidate_lookups(self.lookup_cache)
 
         try:
-            self.store.session.commit()
+            self.store._commit()
         except IntegrityError as e:
             message = _(
                 "An error occured! Are you sure the tag.name is not already present in our"
@@ -842,9 +1766,10 @@ class TagManager(storage.BaseTagManager):
             self.store.logger.error(message)
             raise KeyError(message)
         self.store.session.delete(alchemy_tag)
+        self.store._invalidate_lookups(self.lookup_cache)
         message = _("{!r} successfully deleted.".format(tag))
         self.store.logger.debug(message)
-        self.store.session.commit()
+        self.store._commit()
 
     def get(self, pk):
         """
@@ -866,7 +1791,7 @@ class TagManager(storage.BaseTagManager):
         message = _("Recieved PK: '{}'.".format(pk))
         self.store.logger.debug(message)
 
-        result = self.store.session.query(AlchemyTag).get(pk)
+        result = _tag_by_pk(self.store._get_session()).get(pk)
         if not result:
             message = _("No tag with 'pk: {}' was found!".format(pk))
             self.store.logger.error(message)
@@ -896,18 +1821,36 @@ class TagManager(storage.BaseTagManager):
         self.store.logger.debug(message)
 
         name = text_type(name)
+        result = self._get_cached(name, raw)
+        if result is not None:
+            return result
+
         try:
-            result = self.store.session.query(AlchemyTag).filter_by(name=name).one()
+            result = _tag_by_name(self.store._get_session()).params(name=name).one()
         except NoResultFound:
             message = _("No tag with 'name: {}' was found!".format(name))
             self.store.logger.error(message)
             raise KeyError(message)
+        self.store._cache_lookup(self.lookup_cache, name, result.pk)
 
         if not raw:
             result = result.as_hamster()
             self.store.logger.debug(_("Returning: {!r}.").format(result))
         return result
 
+    def _get_cached(self, name, raw=False):
+        """Return the tag of given name if its PK is cached, ``None`` otherwise."""
+        pk = self.lookup_cache.get(name)
+        if pk is None:
+            return None
+        return self._build(pk, name, raw)
+
+    def _build(self, pk, name, raw=False):
+        """Return a tag of known PK and name without querying the database."""
+        if raw:
+            return _merge_cached(self.store.session, AlchemyTag(pk, name))
+        return Tag._from_trusted(name, pk=pk)
+
     def get_all(self):
         """
         Get all tags.
@@ -952,7 +1895,7 @@ class FactManager(storage.BaseFactManager):
             self.store.logger.error(message)
             raise ValueError(message)
 
-        if self._get_all(fact.start, fact.end, partial=True):
+        if self.overlaps(fact.start, fact.end) is not None:
             message = _("Our database already contains facts for this facts timewindow."
                         "There can ever only be one fact at any given point in time")
             self.store.logger.error(message)
@@ -960,11 +1903,155 @@ class FactManager(storage.BaseFactManager):
 
         alchemy_fact = AlchemyFact(None, None, fact.start, fact.end, fact.description)
         alchemy_fact.activity = self.store.activities.get_or_create(fact.activity, raw=True)
-        alchemy_fact.tags = [self.store.tags.get_or_create(tag, raw=True) for tag in fact.tags]
+        alchemy_fact.tags = self.store.tags.get_or_create_many(fact.tags, raw=True)
         self.store.session.add(alchemy_fact)
-        self.store.session.commit()
-        self.store.logger.debug(_("Added {!r}.".format(alchemy_fact)))
-        return alchemy_fact
+        # Flush first, so we can build the result without reloading after commit.
+        self.store.session.flush()
+        result = alchemy_fact
+        if not raw:
+            result = alchemy_fact.as_hamster()
+        self.store._commit()
+        # Log the passed fact, as the committed instance would need to be reloaded for this.
+        self.store.logger.debug(_("Added {!r}.".format(fact)))
+        return result
+
+    def _add_many(self, facts, batch_size=500):
+        """
+        Add multiple new facts to the database within a single transaction.
+
+        Activities, categories and tags are resolved once per call and reused for
+        all facts referencing them. New facts are flushed in batches of
+        ``batch_size`` and committed once all facts have been processed.
+
+        Args:
+            facts (Iterable): New ``hamster_lib.Fact`` instances.
+            batch_size (int): Number of facts to be flushed at once.
+
+        Returns:
+            tuple: ``(saved, rejected)`` tuple. ``saved`` is a list of PKs of all
+                stored facts, ``rejected`` a list of ``(fact, message)`` tuples.
+
+        Note:
+            All facts are added within a single ``store.transaction``. If the database
+            itself raises an error, it is rolled back and the exception is passed on.
+        """
+
+        self.store.logger.debug(_("Received facts, 'batch_size'={}.".format(batch_size)))
+
+        categories, activities, tags = {}, {}, {}
+        # Timewindows of facts accepted during this call, ordered by start.
+        starts, ends = [], []
+        saved, rejected, pending = [], [], []
+
+        def flush():
+            self.store.session.flush()
+            saved.extend([alchemy_fact.pk for alchemy_fact in pending])
+            del pending[:]
+
+        with self.store.transaction():
+            for fact in facts:
+                index = bisect.bisect_left(starts, fact.start)
+                overlaps_previous = index and ends[index - 1] > fact.start
+                overlaps_next = index < len(starts) and starts[index] < fact.end
+                if overlaps_previous or overlaps_next:
+                    rejected.append((fact, _("Timewindow is occupied by another new fact.")))
+                    continue
+
+                # Pending facts are checked above, no need to flush them for this query.
+                with self.store.session.no_autoflush:
+                    if self.overlaps(fact.start, fact.end) is not None:
+                        rejected.append((fact, _(
+                            "Our database already contains facts for this facts timewindow."
+                        )))
+                        continue
+
+                    alchemy_fact = AlchemyFact(None, None, fact.start, fact.end,
+                        fact.description)
+                    alchemy_fact.activity = self._get_or_create_activity_batched(
+                        fact.activity, activities, categories)
+                    alchemy_tags = []
+                    for tag in fact.tags:
+                        # Tags are resolved by name, so several may refer to the same one.
+                        alchemy_tag = self._get_or_create_tag_batched(tag, tags)
+                        if alchemy_tag not in alchemy_tags:
+                            alchemy_tags.append(alchemy_tag)
+                    alchemy_fact.tags = alchemy_tags
+                self.store.session.add(alchemy_fact)
+                pending.append(alchemy_fact)
+                starts.insert(index, fact.start)
+                ends.insert(index, fact.end)
+
+                if len(pending) >= batch_size:
+                    flush()
+            flush()
+
+        self.store.logger.debug(_("Added {} facts.".format(len(saved))))
+        return (saved, rejected)
+
+    def _get_or_create_activity_batched(self, activity, activities, categories):
+        """
+        Return an ``AlchemyActivity`` for ``activity`` without committing.
+
+        Args:
+            activity (hamster_lib.Activity): Activity we want.
+            activities (dict): Already resolved activities by composite key.
+            categories (dict): Already resolved categories by name.
+
+        Returns:
+            AlchemyActivity: Either a persistent or a new, pending instance.
+        """
+        category = activity.category
+        key = (activity.name, category.name if category else None)
+        try:
+            return activities[key]
+        except KeyError:
+            pass
+
+        try:
+            alchemy_activity = self.store.activities.get_by_composite(activity.name, category,
+                raw=True)
+        except KeyError:
+            if category:
+                try:
+                    alchemy_category = categories[category.name]
+                except KeyError:
+                    try:
+                        alchemy_category = self.store.categories.get_by_name(category.name,
+                            raw=True)
+                    except KeyError:
+                        alchemy_category = AlchemyCategory(None, category.name)
+                    categories[category.name] = alchemy_category
+            else:
+                alchemy_category = None
+            alchemy_activity = AlchemyActivity(None, activity.name, alchemy_category,
+                activity.deleted)
+            self.store.session.add(alchemy_activity)
+        activities[key] = alchemy_activity
+        return alchemy_activity
+
+    def _get_or_create_tag_batched(self, tag, tags):
+        """
+        Return an ``AlchemyTag`` for ``tag`` without committing.
+
+        Args:
+            tag (hamster_lib.Tag): Tag we want.
+            tags (dict): Already resolved tags by name.
+
+        Returns:
+            AlchemyTag: Either a persistent or a new, pending instance.
+        """
+        try:
+            return tags[tag.name]
+        except KeyError:
+            pass
+
+        try:
+            alchemy_tag = self.store.tags.get_by_name(tag.name, raw=True)
+        except KeyError:
+            alchemy_tag = AlchemyTag(None, tag.name)
+            self.store.session.add(alchemy_tag)
+        tags[tag.name] = alchemy_tag
+        return alchemy_tag
 
     def _update(self, fact, raw=False):
         """
@@ -993,12 +2080,7 @@ class FactManager(storage.BaseFactManager):
             self.store.logger.error(message)
             raise ValueError(message)
 
-        facts_in_timeframe = self._get_all(fact.start, fact.end, partial=True)
-        # This works because the conditional gets evaluated from left to right.
-        # If ``facts_in_timeframe`` would be empty and hence would throw an
-        # index error, we wouldn't reach the offending part ...
-        if facts_in_timeframe and not (len(facts_in_timeframe) == 1 and
-                                       facts_in_timeframe[0].pk == fact.pk):
+        if self.overlaps(fact.start, fact.end, exclude_pk=fact.pk) is not None:
             message = _("Our database already contains facts for this facts timewindow."
                         " There can ever only be one fact at any given point in time")
             self.store.logger.error(message)
@@ -1014,9 +2096,8 @@ class FactManager(storage.BaseFactManager):
         alchemy_fact.end = fact.end
         alchemy_fact.description = fact.description
         alchemy_fact.activity = self.store.activities.get_or_create(fact.activity, raw=True)
-        tags = [self.store.tags.get_or_create(tag, raw=True) for tag in fact.tags]
-        alchemy_fact.tags = tags
-        self.store.session.commit()
+        alchemy_fact.tags = self.store.tags.get_or_create_many(fact.tags, raw=True)
+        self.store._commit()
         self.store.logger.debug(_("{!r} has been updated.".format(fact)))
         return fact
 
@@ -1051,7 +2132,7 @@ class FactManager(storage.BaseFactManager):
             self.store.logger.error(message)
             raise KeyError(message)
         self.store.session.delete(alchemy_fact)
-        self.store.session.commit()
+        self.store._commit()
         self.store.logger.debug(_("{!r} has been removed.".format(fact)))
         return True
 
@@ -1071,17 +2152,244 @@ class FactManager(storage.BaseFactManager):
 
         self.store.logger.debug(_("Recieved PK: {}', 'raw'={}.".format(pk, raw)))
 
-        result = self.store.session.query(AlchemyFact).get(pk)
+        loading = self._get_loading_strategy()
+        if loading == 'core' and not raw:
+            result = self._load_facts(self._query_facts(loading).filter(AlchemyFact.pk == pk),
+                loading)
+            result = result[0] if result else None
+        else:
+            # Mapped instances are only available with one of the ORM strategies.
+            result = self._query_facts('lazy' if loading == 'core' else loading).get(pk)
         if not result:
             message = _("No fact with given PK found.")
             self.store.logger.error(message)
             raise KeyError(message)
-        if not raw:
+        if not (raw or loading == 'core'):
             result = result.as_hamster()
         self.store.logger.debug(_("Returning {!r}.".format(result)))
         return result
 
-    def _get_all(self, start=None, end=None, search_term='', partial=False):
+    def _query_facts(self, loading=None, session=None):
+        """
+        Return a query for ``AlchemyFact`` instances using the given loading strategy.
+
+        Available strategies are:
+            * ``'eager'``: Activities and categories are joined right into the fact
+              query, all tags are fetched by one additional query. As a consequence the
+              number of statements issued does not depend on the number of facts.
+            * ``'lazy'``: Related instances are only fetched once they are accessed.
+              This will cost up to three additional queries per fact.
+            * ``'core'``: Like ``'eager'`` but no mapped instances are constructed at all.
+              The query selects plain columns instead which ``_facts_from_rows`` turns
+              into ``hamster_lib.Fact`` instances right away.
+
+        Args:
+            loading (text_type, optional): Strategy to be used. Defaults to
+                ``config['fact_loading']`` or ``'eager'`` if not configured.
+            session (sqlalchemy.orm.session.Session, optional): Session the query is to
+                be run by. Defaults to ``store.session``.
+
+        Returns:
+            sqlalchemy.orm.query.Query: Query for facts.
+
+        Raises:
+            ValueError: If the loading strategy is unknown.
+        """
+        loading = self._get_loading_strategy(loading)
+        if session is None:
+            session = self.store.session
+        if loading == 'core':
+            # Aliased, so filters joining the plain tables still work as usual.
+            activities = objects.activities.alias('fact_activity')
+            categories = objects.categories.alias('fact_category')
+            query = session.query(
+                objects.facts.c.id, objects.facts.c.start, objects.facts.c.end,
+                objects.facts.c.description, activities.c.id, activities.c.name,
+                activities.c.deleted, categories.c.id, categories.c.name,
+            ).select_from(AlchemyFact).outerjoin(
+                activities, activities.c.id == objects.facts.c.activity_id
+            ).outerjoin(categories, categories.c.id == activities.c.category_id)
+        else:
+            query = session.query(AlchemyFact)
+            if loading == 'eager':
+                query = query.options(
+                    joinedload(AlchemyFact.activity).joinedload(AlchemyActivity.category),
+                    selectinload(AlchemyFact.tags),
+                )
+        return query
+
+    def _get_loading_strategy(self, loading=None):
+        """
+        Return the loading strategy to be used, falling back to the configured one.
+
+        Args:
+            loading (text_type, optional): Requested strategy.
+
+        Returns:
+            text_type: One of ``FACT_LOADING_STRATEGIES``.
+
+        Raises:
+            ValueError: If the loading strategy is unknown.
+        """
+        if loading is None:
+            loading = self.store.config.get('fact_loading', 'eager')
+        if loading not in FACT_LOADING_STRATEGIES:
+            message = _(
+                "Unknown loading strategy '{strategy}'. Valid choices are: {choices}.".format(
+                    strategy=loading, choices=', '.join(FACT_LOADING_STRATEGIES))
+            )
+            self.store.logger.error(message)
+            raise ValueError(message)
+        return loading
+
+    def _load_facts(self, query, loading=None):
+        """
+        Execute a query returned by ``_query_facts`` and return ``hamster_lib.Fact`` instances.
+
+        Args:
+            query (sqlalchemy.orm.query.Query): Query to be executed.
+            loading (text_type, optional): Strategy the query was created with.
+
+        Returns:
+            list: List of ``hamster_lib.Fact`` instances in query order. Facts share
+                one instance per activity, category and tag.
+        """
+        pool = InternPool()
+        if self._get_loading_strategy(loading) == 'core':
+            return self._facts_from_rows(self._execute_core(query).fetchall(),
+                session=query.session, pool=pool)
+        return [alchemy_fact.as_hamster(pool) for alchemy_fact in query]
+
+    def _execute_core(self, query):
+        """
+        Execute the statement of a ``'core'`` query without any ORM result processing.
+
+        Returns:
+            sqlalchemy.engine.ResultProxy: The plain result rows.
+        """
+        session = query.session
+        # Unlike ``Query`` a plain ``Session.execute`` does not flush pending changes.
+        if session.autoflush:
+            session.flush()
+        return session.execute(query.statement)
+
+    def _facts_from_rows(self, rows, chunk_size=500, session=None, pool=None):
+        """
+        Build ``hamster_lib.Fact`` instances from rows selected by a ``'core'`` query.
+
+        Tags of all facts are fetched by one additional query per ``chunk_size`` facts.
+
+        Args:
+            rows (list): Result rows of a ``'core'`` query.
+            chunk_size (int): Maximum number of facts whose tags are fetched at once.
+            session (sqlalchemy.orm.session.Session, optional): Session to fetch tags
+                by. Defaults to ``store.session``.
+            pool (hamster_lib.helpers.cache.InternPool, optional): Pool providing shared
+                activity, category and tag instances. Defaults to a new pool for
+                ``rows``.
+
+        Returns:
+            list: List of ``hamster_lib.Fact`` instances in the order of ``rows``.
+        """
+        if session is None:
+            session = self.store.session
+        if pool is None:
+            pool = InternPool()
+        tags = {}
+        pks = [row[0] for row in rows]
+        facttags = objects.facttags
+        for index in range(0, len(pks), chunk_size):
+            tag_query = select(
+                [facttags.c.fact_id, objects.tags.c.id, objects.tags.c.name]
+            ).select_from(facttags.join(objects.tags)).where(
+                facttags.c.fact_id.in_(pks[index:index + chunk_size]))
+            for fact_pk, tag_pk, tag_name in session.execute(tag_query):
+                tags.setdefault(fact_pk, set()).add(pool.tag(tag_pk, tag_name))
+
+        facts = []
+        for (pk, start, end, description, activity_pk, activity_name, deleted,
+                category_pk, category_name) in rows:
+            activity = pool.activity(activity_pk, activity_name, category_pk=category_pk,
+                category_name=category_name, deleted=deleted)
+            facts.append(Fact._from_trusted(activity, start, end=end, pk=pk,
+                description=description, tags=tags.get(pk)))
+        return facts
+
+    def _filter_overlaps(self, query, start, end):
+        """
+        Limit query to facts that overlap with the timeframe in any way.
+
+        This includes facts that span the whole timeframe. Facts that merely touch
+        its boundaries are not considered overlapping.
+
+        As facts never overlap each other, the latest fact starting at or before
+        ``start`` is the earliest one that may reach into the timeframe. Looking up
+        its start first (a single index lookup) allows the database to restrict
+        the actual query to an ordered range scan on ``facts.start``.
+
+        Args:
+            query (sqlalchemy.orm.query.Query): Query to be filtered.
+            start (datetime.datetime or None): Start of the timeframe.
+            end (datetime.datetime or None): End of the timeframe.
+
+        Returns:
+            sqlalchemy.orm.query.Query: The filtered query.
+        """
+
+        # SQLAlchemy does not allow ``<=`` used with ``None`` values, so we have
+        # check for passed arguments first.
+        if start:
+            preceding_start = self.store.session.query(
+                func.max(AlchemyFact.start)).filter(AlchemyFact.start <= start).as_scalar()
+            query = query.filter(
+                AlchemyFact.start >= func.coalesce(preceding_start, start),
+                AlchemyFact.end > start,
+            )
+        if end:
+            query = query.filter(AlchemyFact.start < end)
+        return query
+
+    def overlaps(self, start, end, exclude_pk=None):
+        """
+        Check if the given timeframe is occupied by any stored fact.
+
+        Instead of loading overlapping facts this just asks the database for the
+        PK of the first one it finds. For complete timeframes a baked statement is
+        used, so the query is not rebuilt on every call.
+
+        Args:
+            start (datetime.datetime): Start of the timeframe.
+            end (datetime.datetime): End of the timeframe.
+            exclude_pk (optional): PK of a fact to be ignored. This is useful when
+                checking the new timeframe of an existing fact. Defaults to ``None``.
+
+        Returns:
+            PK of an overlapping fact or ``None`` if the timeframe is free.
+        """
+
+        self.store.logger.debug(_("Received start: '{}', end: '{}', 'exclude_pk'={}.".format(
+            start, end, exclude_pk)))
+
+        if start and end:
+            session = self.store._get_session()
+            if exclude_pk is None:
+                query = _fact_overlap(session).params(start=start, end=end)
+            else:
+                query = _fact_overlap_excluding(session).params(start=start, end=end,
+                    exclude_pk=exclude_pk)
+        else:
+            # Open timeframes are rare enough not to warrant cached statements.
+            query = self._filter_overlaps(self.store.session.query(AlchemyFact.pk),
+                start, end)
+            if exclude_pk is not None:
+                query = query.filter(AlchemyFact.pk != exclude_pk)
+        result = query.first()
+        if result:
+            result = result[0]
+        return result
+
+    def _get_all(self, start=None, end=None, search_term='', partial=False, loading=None,
+            any_tags=None, all_tags=None):
         """
         Return all facts within a given timeframe that match given search terms.
 
@@ -1095,10 +2403,83 @@ class FactManager(storage.BaseFactManager):
             search_term (text_type): Cases insensitive strings to match
                 ``Activity.name`` or ``Category.name``.
             partial (bool): If ``False`` only facts which start *and* end
-                within the timeframe will be considered.
+                within the timeframe will be considered. If ``True`` any fact
+                overlapping the timeframe will be, including those spanning it entirely.
+            loading (text_type, optional): Strategy used to load related instances.
+                See ``_query_facts`` for details.
+            any_tags (frozenset, optional): Names of tags of which facts need to carry at
+                least one.
+            all_tags (frozenset, optional): Names of tags facts need to carry all of.
 
         Returns:
-            list: List of ``hamster_lib.Facts`` instances.
+            list: List of ``hamster_lib.Facts`` instances ordered by ``(start, pk)``.
+        """
+
+        self.store.logger.debug(_(
+            "Received start: '{}', end: '{}' and search_term='{}'.".format(
+                start, end, search_term)
+        ))
+
+        with self.store._reading() as session:
+            query = self._get_all_query(start, end, search_term, partial, loading, session,
+                any_tags, all_tags)
+            self.store.logger.debug(_("Returning list of results."))
+            return self._load_facts(query, loading)
+
+    def _iter_all(self, start=None, end=None, search_term='', chunk_size=1000, loading=None):
+        """
+        Iterate over all facts within a given timeframe that match given search terms.
+
+        Facts are fetched from the database ``chunk_size`` rows at a time. As each
+        chunk only exists for as long as its facts are consumed, memory usage is
+        bound by ``chunk_size`` instead of the number of matching facts.
+
+        Args:
+            start (datetime.datetime, optional): Start of timeframe.
+            end (datetime.datetime, optional): End of timeframe.
+            search_term (text_type): Cases insensitive strings to match
+                ``Activity.name`` or ``Category.name``.
+            chunk_size (int): Number of facts fetched at once.
+            loading (text_type, optional): Strategy used to load related instances.
+                See ``_query_facts`` for details.
+
+        Yields:
+            hamster_lib.Fact: Facts matching the given criteria.
+        """
+
+        self.store.logger.debug(_(
+            "Received start: '{}', end: '{}', search_term='{}' and chunk_size={}.".format(
+                start, end, search_term, chunk_size)
+        ))
+
+        # Shared by all chunks, so memory grows with the number of distinct
+        # activities, categories and tags only.
+        pool = InternPool()
+        with self.store._reading() as session:
+            query = self._get_all_query(start, end, search_term, loading=loading,
+                session=session)
+            if self._get_loading_strategy(loading) == 'core':
+                result = self._execute_core(query)
+                rows = result.fetchmany(chunk_size)
+                while rows:
+                    for fact in self._facts_from_rows(rows, session=query.session,
+                            pool=pool):
+                        yield fact
+                    rows = result.fetchmany(chunk_size)
+            else:
+                for alchemy_fact in query.yield_per(chunk_size):
+                    yield alchemy_fact.as_hamster(pool)
+
+    def _get_all_query(self, start=None, end=None, search_term='', partial=False, loading=None,
+            session=None, any_tags=None, all_tags=None):
+        """
+        Return a query for all facts within a given timeframe that match given search terms.
+
+        See ``_get_all`` for details on the arguments. ``session`` is passed on to
+        ``_query_facts``.
+
+        Returns:
+            sqlalchemy.orm.query.Query: Query for matching ``AlchemyFact`` instances.
         """
 
         def get_complete_overlaps(query, start, end):
@@ -1112,24 +2493,6 @@ class FactManager(storage.BaseFactManager):
                 query = query.filter(AlchemyFact.end <= end)
             return query
 
-        def get_partial_overlaps(query, start, end):
-            """Return all facts where either start or end falls within the timeframe."""
-
-            # SQLAlchemy does not allow ``<=`` used with ``None`` values, so we have
-            # check for passed arguments first.
-            if start and not end:
-                query = query.filter(or_(AlchemyFact.start >= start, AlchemyFact.end >= start))
-            elif not start and end:
-                query = query.filter(or_(AlchemyFact.start <= end, AlchemyFact.end <= end))
-            elif start and end:
-                query = query.filter(or_(
-                    and_(AlchemyFact.start >= start, AlchemyFact.start <= end),
-                    and_(AlchemyFact.end >= start, AlchemyFact.end <= end),
-                ))
-            else:
-                pass
-            return query
-
         def filter_search_term(query, term):
             """
             Limit query to facts that match the search terms.
@@ -1144,23 +2507,321 @@ class FactManager(storage.BaseFactManager):
             )
             return query
 
-        self.store.logger.debug(_(
-            "Received start: '{}', end: '{}' and search_term='{}'.".format(
-                start, end, search_term)
-        ))
+        def match_fulltext(query, term):
+            """
+            Limit query to facts matching the search terms, best matches first.
 
-        # [FIXME] Figure out against what to match search_terms
-        query = self.store.session.query(AlchemyFact)
+            Terms are matched against activity name, category name, description and tag
+            names using the full text index. See ``_fulltext_query`` for the syntax.
+            """
+            fulltext_query = _fulltext_query(term)
+            if not fulltext_query:
+                return query, ()
+            fulltext = objects.facts_fts
+            matches = select([fulltext.c.rowid, fulltext.c.rank]).where(
+                literal_column(fulltext.name).op('MATCH')(fulltext_query)
+            ).alias('matches')
+            query = query.join(matches, matches.c.rowid == AlchemyFact.pk)
+            return query, (matches.c.rank,)
+
+        def filter_tags(query, names, match_all):
+            """
+            Limit query to facts carrying any or all of the named tags.
+
+            Tag names are resolved by their unique index, their facts by
+            ``ix_facttags_tag_id``.
+            """
+            facttags = objects.facttags
+            tagged = select([facttags.c.fact_id]).select_from(
+                facttags.join(objects.tags)).where(objects.tags.c.name.in_(names))
+            if match_all:
+                # The primary key of ``facttags`` rules out counting a tag twice.
+                tagged = tagged.group_by(facttags.c.fact_id).having(
+                    func.count(facttags.c.tag_id) == len(names))
+            return query.filter(AlchemyFact.pk.in_(tagged))
+
+        query = self._query_facts(loading, session)
+
+        if any_tags:
+            query = filter_tags(query, any_tags, match_all=False)
+        if all_tags:
+            query = filter_tags(query, all_tags, match_all=True)
 
         if partial:
-            query = get_partial_overlaps(query, start, end)
+            query = self._filter_overlaps(query, start, end)
         else:
             query = get_complete_overlaps(query, start, end)
 
+        ordering = ()
         if search_term:
-            query = filter_search_term(query, search_term)
+            if self.store._fulltext_search_enabled():
+                query, ordering = match_fulltext(query, search_term)
+            else:
+                query = filter_search_term(query, search_term)
+        return query.order_by(*ordering + (AlchemyFact.start, AlchemyFact.pk))
 
-        # [FIXME]
-        # Depending on scale, this could be a problem.
-        self.store.logger.debug(_("Returning list of results."))
-        return [fact.as_hamster() for fact in query.all()]
+    def _get_page(self, start=None, end=None, search_term='', after=None, limit=50,
+            descending=False, loading=None):
+        """
+        Return one page of facts within a given timeframe that match given search terms.
+
+        Instead of skipping a number of rows (which gets more expensive for each page)
+        we continue right after the last fact of the previous page. This seeks directly
+        into the ``(start, id)`` index so any page costs the same as the first one.
+
+        Args:
+            start (datetime.datetime, optional): Start of timeframe.
+            end (datetime.datetime, optional): End of timeframe.
+            search_term (text_type): Cases insensitive strings to match
+                ``Activity.name`` or ``Category.name``.
+            after (tuple, optional): ``(start, pk)`` of the last fact of the previous page.
+            limit (int): Maximum number of facts to be returned.
+            descending (bool): Page through facts from latest to earliest.
+            loading (text_type, optional): Strategy used to load related instances.
+                See ``_query_facts`` for details.
+
+        Returns:
+            list: List of ``hamster_lib.Fact`` instances ordered by ``(start, pk)``,
+                descending if requested. Unlike ``_get_all`` this holds for full text
+                searches as well.
+        """
+
+        self.store.logger.debug(_(
+            "Received start: '{}', end: '{}', search_term='{}', after={}, limit={} and"
+            " descending={}.".format(start, end, search_term, after, limit, descending)
+        ))
+
+        with self.store._reading() as session:
+            query = self._get_all_query(start, end, search_term, loading=loading, session=session)
+            # Pages continue after ``(start, pk)``, so they need to be ordered by it even
+            # for full text searches, whose results are ordered by relevance otherwise.
+            query = query.order_by(None)
+            if descending:
+                query = query.order_by(AlchemyFact.start.desc(), AlchemyFact.pk.desc())
+            else:
+                query = query.order_by(AlchemyFact.start, AlchemyFact.pk)
+
+            if after:
+                after_start, after_pk = after
+                if descending:
+                    query = query.filter(or_(AlchemyFact.start < after_start, and_(
+                        AlchemyFact.start == after_start, AlchemyFact.pk < after_pk)))
+                else:
+                    query = query.filter(or_(AlchemyFact.start > after_start, and_(
+                        AlchemyFact.start == after_start, AlchemyFact.pk > after_pk)))
+
+            return self._load_facts(query.limit(limit), loading)
+
+    def _get_totals(self, start, end, group_by):
+        """
+        Return the summed up durations of all facts within a given timeframe.
+
+        Durations and counts are aggregated by the database using ``GROUP BY``. Only
+        SQLite and PostgreSQL are supported, other dialects fall back to the generic
+        implementation.
+
+        Args:
+            start (datetime.datetime): Start of timeframe or ``None``.
+            end (datetime.datetime): End of timeframe or ``None``.
+            group_by (tuple): Validated fields to group by. See ``get_totals``.
+
+        Returns:
+            list: List of ``hamster_lib.storage.Total`` instances in no particular order.
+        """
+        with self.store._reading() as session:
+            dialect = session.get_bind().dialect.name
+            day_start = self.store.config['day_start']
+            offset = day_start.hour * 3600 + day_start.minute * 60 + day_start.second
+
+            # Rendered as literals so the very same expression may be used in ``GROUP BY``.
+            if dialect == 'sqlite':
+                seconds = func.round(
+                    (func.julianday(AlchemyFact.end) - func.julianday(AlchemyFact.start)) * 86400)
+                day = func.date(AlchemyFact.start, literal_column("'-{} seconds'".format(offset)))
+            elif dialect == 'postgresql':
+                seconds = extract('epoch', AlchemyFact.end - AlchemyFact.start)
+                day = cast(AlchemyFact.start - literal_column(
+                    "INTERVAL '{} seconds'".format(offset)), Date)
+            else:
+                return super(FactManager, self)._get_totals(start, end, group_by)
+
+            columns = []
+            groups = []
+            for field, column, pk in (
+                ('activity', AlchemyActivity.name, AlchemyActivity.pk),
+                ('category', AlchemyCategory.name, AlchemyCategory.pk),
+                ('tag', AlchemyTag.name, AlchemyTag.pk),
+                ('day', day, None),
+            ):
+                if field in group_by:
+                    columns.append(column)
+                    groups.extend([pk, column] if pk is not None else [column])
+                else:
+                    columns.append(null())
+
+            query = session.query(*columns + [func.sum(seconds),
+                func.count(AlchemyFact.pk)]).select_from(AlchemyFact)
+            if 'activity' in group_by or 'category' in group_by:
+                query = query.join(AlchemyFact.activity)
+            if 'category' in group_by:
+                query = query.outerjoin(AlchemyActivity.category)
+            if 'tag' in group_by:
+                query = query.outerjoin(AlchemyFact.tags)
+            if start:
+                query = query.filter(AlchemyFact.start >= start)
+            if end:
+                query = query.filter(AlchemyFact.end <= end)
+            if groups:
+                query = query.group_by(*groups)
+
+            totals = []
+            for activity, category, tag, day_value, duration, count in query:
+                if not count:
+                    # Aggregating an empty table without grouping still yields one row.
+                    continue
+                if isinstance(day_value, text_type):
+                    day_value = datetime.datetime.strptime(day_value, '%Y-%m-%d').date()
+                totals.append(storage.Total(activity, category, tag, day_value,
+                    datetime.timedelta(seconds=float(duration or 0)), count))
+            return totals
+
+    def _get_frame(self, start, end, search_term=''):
+        """
+        Return a ``FactFrame`` of all facts matching given criteria.
+
+        The frame is built right from the rows of a ``'core'`` query plus one query for
+        the tags of all matching facts, no ``Fact`` instances are created at all.
+
+        Args:
+            start (datetime.datetime): Start of timeframe or ``None``.
+            end (datetime.datetime): End of timeframe or ``None``.
+            search_term (text_type): See ``_get_all``.
+
+        Returns:
+            hamster_lib.frame.FactFrame: Frame of matching facts ordered by ``(start, pk)``.
+        """
+        # Imported on demand, as it loads NumPy if available.
+        from hamster_lib.frame import FactFrame
+
+        with self.store._reading() as session:
+            query = self._get_all_query(start, end, search_term, loading='core',
+                session=session)
+            # Flushes pending changes, which the plain tag query below would miss.
+            rows = self._execute_core(query)
+            facttags = objects.facttags
+            tag_query = select(
+                [facttags.c.fact_id, objects.tags.c.id, objects.tags.c.name]
+            ).select_from(facttags.join(objects.tags)).where(facttags.c.fact_id.in_(
+                self._fact_pks_query(start, end, search_term, session).statement))
+            return FactFrame.from_rows(rows, session.execute(tag_query),
+                day_start=self.store.config['day_start'])
+
+    def _fact_pks_query(self, start, end, search_term='', session=None):
+        """
+        Return a query for the PKs of all facts ``_get_all`` would return.
+
+        Args:
+            session (sqlalchemy.orm.session.Session, optional): Session the query is to
+                be run by. Defaults to ``store.session``.
+
+        Returns:
+            sqlalchemy.orm.query.Query: Unordered query selecting ``AlchemyFact.pk`` only.
+        """
+        return self._get_all_query(start, end, search_term, loading='lazy',
+            session=session).with_entities(AlchemyFact.pk).order_by(None)
+
+    def _execute_bulk(self, statement):
+        """
+        Run a bulk statement by our session and commit it (see ``store._commit``).
+
+        Pending changes are flushed beforehand, as plain statements do not autoflush.
+        Afterwards all instances of the session are expired, so they do not outlive
+        changes made behind the back of the ORM.
+
+        Returns:
+            int: Number of rows affected.
+        """
+        session = self.store.session
+        session.flush()
+        rowcount = session.execute(statement).rowcount
+        session.expire_all()
+        return rowcount
+
+    def _remove_range(self, start, end, search_term):
+        """
+        Remove all facts within a given timeframe that match given search terms.
+
+        Tag associations of matching facts and then the facts themselves are deleted
+        by one ``DELETE`` statement each, both selecting the facts by a subquery.
+        Full text search also matches tag names, so removing tag associations first
+        would change which facts match ``search_term``. In this case the facts are
+        deleted first and their orphaned tag associations afterwards. The full text
+        index is only available with SQLite, which does not enforce foreign keys.
+
+        Args:
+            start (datetime.datetime): Start of timeframe or ``None``.
+            end (datetime.datetime): End of timeframe or ``None``.
+            search_term (text_type): See ``_get_all``.
+
+        Returns:
+            int: Number of facts removed.
+        """
+        facts, facttags = objects.facts, objects.facttags
+        pks = self._fact_pks_query(start, end, search_term).statement
+        if search_term and self.store._fulltext_search_enabled():
+            count = self._execute_bulk(facts.delete().where(facts.c.id.in_(pks)))
+            self._execute_bulk(facttags.delete().where(
+                ~facttags.c.fact_id.in_(select([facts.c.id]))))
+        else:
+            self._execute_bulk(facttags.delete().where(facttags.c.fact_id.in_(pks)))
+            count = self._execute_bulk(facts.delete().where(facts.c.id.in_(pks)))
+        self.store._commit()
+        self.store.logger.debug(_("{} facts have been removed.".format(count)))
+        return count
+
+    def _reassign_activity(self, old, new, start, end):
+        """
+        Assign all facts of one activity within a given timeframe to another activity.
+
+        Facts are updated by a single ``UPDATE`` statement.
+
+        Args:
+            old (hamster_lib.Activity): Activity whose facts are to be reassigned.
+            new (hamster_lib.Activity): Activity to be assigned instead.
+            start (datetime.datetime): Start of timeframe or ``None``.
+            end (datetime.datetime): End of timeframe or ``None``.
+
+        Returns:
+            int: Number of facts reassigned.
+        """
+        facts = objects.facts
+        pks = self._fact_pks_query(start, end).filter(facts.c.activity_id == old.pk)
+        count = self._execute_bulk(facts.update().where(facts.c.id.in_(pks.statement)).values(
+            activity_id=new.pk))
+        self.store._commit()
+        self.store.logger.debug(_("{} facts have been reassigned.".format(count)))
+        return count
+
+    def _add_tag_range(self, tag, start, end):
+        """
+        Add a tag to all facts within a given timeframe.
+
+        Associations are created by a single ``INSERT ... SELECT`` statement, skipping
+        facts that already carry the tag.
+
+        Args:
+            tag (hamster_lib.Tag): Tag to be added.
+            start (datetime.datetime): Start of timeframe or ``None``.
+            end (datetime.datetime): End of timeframe or ``None``.
+
+        Returns:
+            int: Number of facts the tag was added to.
+        """
+        tag = self.store.tags.get_or_create(tag)
+        pks = self._fact_pks_query(start, end).filter(
+            ~AlchemyFact.tags.any(AlchemyTag.pk == tag.pk)).add_columns(literal(tag.pk))
+        count = self._execute_bulk(objects.facttags.insert().from_select(
+            ['fact_id', 'tag_id'], pks.statement))
+        self.store._commit()
+        self.store.logger.debug(_("{!r} has been added to {} facts.".format(tag, count)))
+        return count
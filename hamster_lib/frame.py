@@ -0,0 +1,456 @@
+# -*- encoding: utf-8 -*-
+
+# Copyright (C) 2015-2016 Eric Goller <eric.goller@ninjaduck.solutions>
+
+# This file is part of 'hamster-lib'.
+#
+# 'hamster-lib' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-lib' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-lib'.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module provides ``FactFrame``, a columnar container for analysing large amounts of facts.
+
+Instead of one ``Fact`` instance per fact, a ``FactFrame`` holds one array per field.
+Start and end are stored as seconds since the epoch. Activities, categories, tags and
+descriptions are stored as integer codes referring to lookup tables that hold each
+distinct value only once.
+
+If NumPy is installed, columns are NumPy arrays and all operations are vectorised.
+Otherwise columns are stdlib ``array.array`` instances and operations fall back to
+plain loops.
+"""
+
+from __future__ import unicode_literals
+
+import datetime
+import operator
+from array import array
+from functools import reduce
+from itertools import compress
+
+from six import text_type
+
+from .objects import Activity, Category, Tag
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+# Fields ``FactFrame.group_sum`` is able to group by.
+FRAME_GROUPS = ('activity', 'category', 'tag', 'day')
+
+# Typecodes of our columns. Python 2 ``array`` does not know about ``'q'``.
+try:
+    array(str('q'))
+except ValueError:
+    INT64 = str('l')
+else:
+    INT64 = str('q')
+INT32 = str('i')
+
+# Columns holding one value per fact, along with their typecode.
+ROW_COLUMNS = (
+    ('pks', INT64),
+    ('starts', INT64),
+    ('ends', INT64),
+    ('activity_codes', INT32),
+    ('category_codes', INT32),
+    ('description_codes', INT32),
+)
+
+
+def _seconds(value):
+    """Return seconds since ``EPOCH`` of a naive ``datetime.datetime``."""
+    delta = value - EPOCH
+    return delta.days * 86400 + delta.seconds
+
+
+def _interner(table):
+    """
+    Return a function mapping values to their index in ``table``.
+
+    Values not present yet are appended to ``table``.
+    """
+    codes = {}
+
+    def intern(value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        return code
+    return intern
+
+
+class FactFrame(object):
+    """
+    Columnar representation of a collection of facts.
+
+    Attributes:
+        pks: Fact PKs, ``-1`` for facts without one.
+        starts: Start of each fact in seconds since the epoch.
+        ends: End of each fact in seconds since the epoch.
+        activity_codes: Index of each facts activity within ``activities``.
+        category_codes: Index of each facts category within ``categories``, ``-1`` if
+            its activity has no category.
+        description_codes: Index of each facts description within ``descriptions``,
+            ``-1`` if it has none.
+        tag_offsets: The codes of the tags of fact ``i`` are
+            ``tag_codes[tag_offsets[i]:tag_offsets[i + 1]]``.
+        tag_codes: Indices within ``tags``.
+        activities (list): Distinct ``hamster_lib.Activity`` instances.
+        categories (list): Distinct ``hamster_lib.Category`` instances.
+        tags (list): Distinct ``hamster_lib.Tag`` instances.
+        descriptions (list): Distinct descriptions.
+        day_start (datetime.time): Time each workday starts at.
+
+    Note:
+        Frames are not meant to be changed once built. ``filter`` returns a new frame
+        sharing the lookup tables of the original one.
+    """
+
+    def __init__(self, day_start=None):
+        """
+        Initialize an empty frame. Use ``from_facts`` or ``from_rows`` to build one.
+
+        Args:
+            day_start (datetime.time, optional): Time each workday starts at, used to
+                bucket facts by day. Defaults to midnight.
+        """
+        self.day_start = day_start or datetime.time(0, 0, 0)
+        for name, typecode in ROW_COLUMNS:
+            setattr(self, name, array(typecode))
+        self.tag_offsets = array(INT64, [0])
+        self.tag_codes = array(INT32)
+        self.activities = []
+        self.categories = []
+        self.tags = []
+        self.descriptions = []
+
+    @classmethod
+    def from_facts(cls, facts, day_start=None):
+        """
+        Build a frame from ``hamster_lib.Fact`` instances.
+
+        Args:
+            facts (Iterable): Facts to be added, for example as returned by
+                ``FactManager.get_all`` or ``FactManager.iter_all``.
+            day_start (datetime.time, optional): See ``__init__``.
+
+        Returns:
+            FactFrame: A new frame holding all facts given, in order.
+
+        Raises:
+            ValueError: If a fact has no end.
+        """
+        frame = cls(day_start)
+        activities = _interner(frame.activities)
+        categories = _interner(frame.categories)
+        tags = _interner(frame.tags)
+        descriptions = _interner(frame.descriptions)
+        for fact in facts:
+            if fact.end is None:
+                raise ValueError(_("Ongoing facts can not be added to a frame."))
+            frame.pks.append(-1 if fact.pk is None else fact.pk)
+            frame.starts.append(_seconds(fact.start))
+            frame.ends.append(_seconds(fact.end))
+            activity = fact.activity
+            frame.activity_codes.append(activities(activity))
+            frame.category_codes.append(
+                -1 if activity.category is None else categories(activity.category))
+            frame.description_codes.append(
+                -1 if not fact.description else descriptions(fact.description))
+            frame.tag_codes.extend([tags(tag) for tag in fact.tags])
+            frame.tag_offsets.append(len(frame.tag_codes))
+        frame._freeze()
+        return frame
+
+    @classmethod
+    def from_rows(cls, rows, tag_rows=(), day_start=None):
+        """
+        Build a frame from plain database rows, without creating ``Fact`` instances.
+
+        Args:
+            rows (Iterable): ``(pk, start, end, description, activity_pk, activity_name,
+                deleted, category_pk, category_name)`` rows, as selected by the
+                ``'core'`` fact query of the sqlalchemy backend.
+            tag_rows (Iterable, optional): ``(fact_pk, tag_pk, tag_name)`` rows.
+            day_start (datetime.time, optional): See ``__init__``.
+
+        Returns:
+            FactFrame: A new frame holding all facts given, in order.
+
+        Raises:
+            ValueError: If a fact has no end.
+        """
+        frame = cls(day_start)
+        tag_codes = {}
+        fact_tags = {}
+        for fact_pk, tag_pk, tag_name in tag_rows:
+            code = tag_codes.get(tag_pk)
+            if code is None:
+                code = tag_codes[tag_pk] = len(frame.tags)
+                frame.tags.append(Tag._from_trusted(tag_name, pk=tag_pk))
+            fact_tags.setdefault(fact_pk, []).append(code)
+
+        activity_codes = {}
+        category_codes = {None: -1}
+        descriptions = _interner(frame.descriptions)
+        for (pk, start, end, description, activity_pk, activity_name, deleted,
+                category_pk, category_name) in rows:
+            if end is None:
+                raise ValueError(_("Ongoing facts can not be added to a frame."))
+            category_code = category_codes.get(category_pk)
+            if category_code is None:
+                category_code = category_codes[category_pk] = len(frame.categories)
+                frame.categories.append(Category._from_trusted(category_name, pk=category_pk))
+            activity_code = activity_codes.get(activity_pk)
+            if activity_code is None:
+                activity_code = activity_codes[activity_pk] = len(frame.activities)
+                frame.activities.append(Activity._from_trusted(activity_name, pk=activity_pk,
+                    category=frame.categories[category_code] if category_code >= 0 else None,
+                    deleted=bool(deleted)))
+            frame.pks.append(pk)
+            frame.starts.append(_seconds(start))
+            frame.ends.append(_seconds(end))
+            frame.activity_codes.append(activity_code)
+            frame.category_codes.append(category_code)
+            frame.description_codes.append(-1 if not description else descriptions(description))
+            frame.tag_codes.extend(fact_tags.get(pk, ()))
+            frame.tag_offsets.append(len(frame.tag_codes))
+        frame._freeze()
+        return frame
+
+    def _freeze(self):
+        """Turn our columns into NumPy arrays, if available."""
+        if numpy is None:
+            return
+        for name in [name for name, typecode in ROW_COLUMNS] + ['tag_offsets', 'tag_codes']:
+            column = getattr(self, name)
+            setattr(self, name, numpy.frombuffer(column, dtype=column.typecode)
+                if len(column) else numpy.zeros(0, dtype=column.typecode))
+
+    def _copy_tables(self):
+        """Return an empty frame sharing our lookup tables."""
+        frame = FactFrame(self.day_start)
+        frame.activities = self.activities
+        frame.categories = self.categories
+        frame.tags = self.tags
+        frame.descriptions = self.descriptions
+        return frame
+
+    def __len__(self):
+        return len(self.pks)
+
+    def durations(self):
+        """
+        Return the duration of each fact.
+
+        Returns:
+            Array of durations in seconds.
+        """
+        if numpy is not None:
+            return self.ends - self.starts
+        return array(INT64, [end - start for start, end in zip(self.starts, self.ends)])
+
+    def days(self):
+        """
+        Return the workday each fact started on, honouring ``day_start``.
+
+        Returns:
+            Array of days since the epoch. ``EPOCH + datetime.timedelta(days=day)``
+            gives the date.
+        """
+        offset = self.day_start.hour * 3600 + self.day_start.minute * 60 + self.day_start.second
+        if numpy is not None:
+            return (self.starts - offset) // 86400
+        return array(INT64, [(start - offset) // 86400 for start in self.starts])
+
+    def filter(self, mask=None, start=None, end=None, activity=None, category=None, tag=None):
+        """
+        Return a new frame holding only facts matching all criteria given.
+
+        Args:
+            mask (sequence, optional): One boolean per fact, ``True`` for those to keep.
+            start (datetime.datetime, optional): Keep facts starting at or after this.
+            end (datetime.datetime, optional): Keep facts ending at or before this.
+            activity (text_type, optional): Keep facts of activities of this name.
+            category (text_type, optional): Keep facts of this category.
+            tag (text_type, optional): Keep facts carrying this tag.
+
+        Returns:
+            FactFrame: A new frame with the facts matching, in order.
+        """
+        def codes(table, name):
+            return [code for code, instance in enumerate(table)
+                if instance.name == text_type(name)]
+
+        conditions = []
+        if start is not None:
+            start = _seconds(start)
+            conditions.append((self.starts, lambda value: value >= start))
+        if end is not None:
+            end = _seconds(end)
+            conditions.append((self.ends, lambda value: value <= end))
+        if activity is not None:
+            conditions.append((self.activity_codes, set(codes(self.activities, activity))))
+        if category is not None:
+            conditions.append((self.category_codes, set(codes(self.categories, category))))
+
+        if numpy is not None:
+            keep = numpy.ones(len(self), dtype=bool)
+            if mask is not None:
+                keep &= numpy.asarray(mask, dtype=bool)
+            for column, condition in conditions:
+                if isinstance(condition, set):
+                    keep &= numpy.isin(column, list(condition))
+                else:
+                    keep &= condition(column)
+            if tag is not None:
+                tagged = numpy.zeros(len(self), dtype=bool)
+                tagged[self._tag_rows()[numpy.isin(self.tag_codes, codes(self.tags, tag))]] = True
+                keep &= tagged
+        else:
+            keep = [True] * len(self) if mask is None else [bool(value) for value in mask]
+            for column, condition in conditions:
+                if isinstance(condition, set):
+                    condition = condition.__contains__
+                keep = [kept and condition(value) for kept, value in zip(keep, column)]
+            if tag is not None:
+                tag_codes = set(codes(self.tags, tag))
+                keep = [kept and any(code in tag_codes for code in self._tags_of(index))
+                    for index, kept in enumerate(keep)]
+        return self._take(keep)
+
+    def _tag_rows(self):
+        """Return the index of the fact each entry of ``tag_codes`` belongs to."""
+        return numpy.repeat(numpy.arange(len(self)), numpy.diff(self.tag_offsets))
+
+    def _tags_of(self, index):
+        """Return the tag codes of the fact at ``index``."""
+        return self.tag_codes[self.tag_offsets[index]:self.tag_offsets[index + 1]]
+
+    def _take(self, keep):
+        """Return a new frame holding the facts for which ``keep`` is ``True``."""
+        frame = self._copy_tables()
+        if numpy is not None:
+            for name, typecode in ROW_COLUMNS:
+                setattr(frame, name, getattr(self, name)[keep])
+            frame.tag_codes = self.tag_codes[keep[self._tag_rows()]]
+            frame.tag_offsets = numpy.concatenate((numpy.zeros(1, dtype=INT64),
+                numpy.cumsum(numpy.diff(self.tag_offsets)[keep]))).astype(INT64)
+            return frame
+
+        for name, typecode in ROW_COLUMNS:
+            getattr(frame, name).extend(compress(getattr(self, name), keep))
+        for index in compress(range(len(self)), keep):
+            frame.tag_codes.extend(self._tags_of(index))
+            frame.tag_offsets.append(len(frame.tag_codes))
+        return frame
+
+    def group_sum(self, by='category'):
+        """
+        Sum up the durations of facts grouped by the fields given.
+
+        Args:
+            by (text_type or tuple): One or more of ``'activity'``, ``'category'``,
+                ``'tag'`` and ``'day'``. Defaults to ``'category'``.
+
+        Returns:
+            dict: Total seconds per group. Keys are ``hamster_lib.Activity``,
+                ``hamster_lib.Category`` or ``hamster_lib.Tag`` instances and
+                ``datetime.date`` instances for days. Facts without category or tags
+                are grouped under ``None``. If ``by`` is a tuple, keys are tuples of
+                those values.
+
+        Raises:
+            ValueError: If ``by`` contains an unknown field.
+
+        Note:
+            Facts with several tags are accounted for once per tag when grouping by
+            ``'tag'``.
+        """
+        single = isinstance(by, (text_type, str))
+        fields = (by,) if single else tuple(by)
+        unknown = set(fields) - set(FRAME_GROUPS)
+        if unknown:
+            raise ValueError(_("Unable to group by: {}.".format(', '.join(sorted(unknown)))))
+
+        durations = self.durations()
+        columns = {
+            'activity': self.activity_codes,
+            'category': self.category_codes,
+            'day': self.days(),
+        }
+
+        if numpy is not None:
+            rows = numpy.arange(len(self))
+            if 'tag' in fields:
+                # One row per tag, plus one for each fact without any.
+                untagged = numpy.flatnonzero(numpy.diff(self.tag_offsets) == 0)
+                rows = numpy.concatenate((self._tag_rows(), untagged))
+                columns['tag'] = numpy.concatenate((self.tag_codes,
+                    numpy.full(len(untagged), -1, dtype=INT32)))
+                columns = dict((field, column if field == 'tag' else column[rows])
+                    for field, column in columns.items())
+                durations = durations[rows]
+            keys = [numpy.asarray(columns[field], dtype=INT64) for field in fields]
+            bounds = [(int(key.min()), int(key.max()) - int(key.min()) + 1) if len(key)
+                else (0, 1) for key in keys]
+            if reduce(operator.mul, (span for low, span in bounds), 1) < 2 ** 62:
+                # Combine all fields into a single mixed radix key, as sorting one
+                # integer column is much cheaper than sorting rows of several.
+                combined = numpy.zeros(len(rows), dtype=INT64)
+                for key, (low, span) in zip(keys, bounds):
+                    combined = combined * span + (key - low)
+                groups, inverse = numpy.unique(combined, return_inverse=True)
+                codes = []
+                for low, span in reversed(bounds):
+                    groups, remainder = numpy.divmod(groups, span)
+                    codes.insert(0, (remainder + low).tolist())
+                groups = list(zip(*codes))
+            else:
+                groups, inverse = numpy.unique(numpy.stack(keys, axis=1), axis=0,
+                    return_inverse=True)
+                groups = [tuple(group) for group in groups.tolist()]
+            sums = numpy.bincount(inverse.ravel(), weights=durations, minlength=len(groups))
+            totals = zip(groups, (int(round(value)) for value in sums.tolist()))
+        else:
+            sums = {}
+            tags = [[-1]] * len(self)
+            if 'tag' in fields:
+                tags = [self._tags_of(index) or [-1] for index in range(len(self))]
+            for index, duration in enumerate(durations):
+                for tag in tags[index]:
+                    key = tuple(tag if field == 'tag' else columns[field][index]
+                        for field in fields)
+                    sums[key] = sums.get(key, 0) + duration
+            totals = sums.items()
+
+        def decode(field, code):
+            if field == 'day':
+                return (EPOCH + datetime.timedelta(days=code)).date()
+            if code < 0:
+                return None
+            return getattr(self, {'activity': 'activities', 'category': 'categories',
+                'tag': 'tags'}[field])[code]
+
+        result = {}
+        for key, total in totals:
+            key = tuple(decode(field, code) for field, code in zip(fields, key))
+            result[key[0] if single else key] = total
+        return result
@@ -0,0 +1,234 @@
+# -*- encoding: utf-8 -*-
+
+# This file is part of 'hamster-lib'.
+#
+# 'hamster-lib' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-lib' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-lib'.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""This module provides small process-local caches used by storage backends."""
+
+from __future__ import unicode_literals
+
+import threading
+from collections import OrderedDict
+
+from hamster_lib.objects import Activity, Category, Tag, _SlottedObject
+
+
+class LRUCache(object):
+    """
+    Bounded mapping that discards the least recently used entry once full.
+
+    Besides storing values, the cache keeps track of how many lookups could be
+    answered (``hits``) and how many could not (``misses``).
+
+    Instances may be shared by multiple threads.
+
+    Args:
+        maxsize (int): Maximum number of entries. ``0`` disables caching altogether.
+    """
+
+    def __init__(self, maxsize=128):
+        maxsize = int(maxsize)
+        if maxsize < 0:
+            raise ValueError(_("Cache size needs to be zero or positive."))
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """
+        Return the value stored for ``key`` and mark it as recently used.
+
+        Args:
+            key: Key to look up.
+            default (optional): Value returned if ``key`` is not cached.
+                Defaults to ``None``.
+
+        Returns:
+            The cached value or ``default``.
+        """
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Store ``value`` for ``key``, discarding the least recently used entry if need be.
+
+        Args:
+            key: Key to store the value for.
+            value: Value to be cached.
+
+        Returns:
+            None
+        """
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Discard all entries. Hit and miss counters are kept."""
+        with self._lock:
+            self._data.clear()
+
+
+class _ReadOnly(object):
+    """
+    Mixin for the read-only variants of the instances handed out by ``InternPool``.
+
+    Only the cached tuple and hash may still be set. Copies and unpickled instances
+    are of the regular, mutable class again.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        if name not in _SlottedObject.__slots__:
+            raise AttributeError(_(
+                "{!r} is shared by several facts and can not be changed. Change a copy"
+                " instead.".format(self)))
+        super(_ReadOnly, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(_(
+            "{!r} is shared by several facts and can not be changed.".format(self)))
+
+    def __reduce_ex__(self, protocol):
+        reduced = super(_ReadOnly, self).__reduce_ex__(protocol)
+        return (_new_instance, (self._mutable_class,)) + reduced[2:]
+
+
+def _new_instance(cls):
+    """Return a new, uninitialized instance of ``cls``. Used to copy read-only instances."""
+    return cls.__new__(cls)
+
+
+class _ReadOnlyCategory(_ReadOnly, Category):
+    __slots__ = ()
+    _mutable_class = Category
+
+
+class _ReadOnlyActivity(_ReadOnly, Activity):
+    __slots__ = ()
+    _mutable_class = Activity
+
+
+class _ReadOnlyTag(_ReadOnly, Tag):
+    __slots__ = ()
+    _mutable_class = Tag
+
+
+class InternPool(object):
+    """
+    Hand out a single shared instance per PK for categories, activities and tags.
+
+    Facts loaded by one query tend to refer to the same few categories, activities
+    and tags over and over again. Building those through a pool means memory and
+    construction time depend on the number of distinct instances, not on the number
+    of facts.
+
+    As instances are shared, they are read-only. Changing one raises an
+    ``AttributeError``, copies (``copy.copy``) can be changed as usual. Pools are
+    meant to live only as long as the query whose results they build, so they never
+    hand out instances that went stale in the meantime.
+    """
+
+    def __init__(self):
+        self._categories = {}
+        self._activities = {}
+        self._tags = {}
+
+    def __len__(self):
+        return len(self._categories) + len(self._activities) + len(self._tags)
+
+    def category(self, pk, name):
+        """
+        Return the ``hamster_lib.Category`` for ``pk``, creating it if need be.
+
+        Args:
+            pk (int): PK of the category.
+            name (text_type): Name of the category. Only used if it is not pooled yet.
+
+        Returns:
+            hamster_lib.Category: The pooled, read-only instance.
+        """
+        try:
+            return self._categories[pk]
+        except KeyError:
+            result = self._categories[pk] = Category._from_trusted(name, pk=pk)
+            result.__class__ = _ReadOnlyCategory
+            return result
+
+    def activity(self, pk, name, category_pk=None, category_name=None, deleted=False):
+        """
+        Return the ``hamster_lib.Activity`` for ``pk``, creating it if need be.
+
+        Args:
+            pk (int): PK of the activity.
+            name (text_type): Name of the activity. Only used if it is not pooled yet.
+            category_pk (int, optional): PK of its category, if any.
+            category_name (text_type, optional): Name of its category, if any.
+            deleted (bool, optional): Whether the activity is flagged as deleted.
+
+        Returns:
+            hamster_lib.Activity: The pooled, read-only instance, referring to the pooled
+                category.
+        """
+        try:
+            return self._activities[pk]
+        except KeyError:
+            category = None
+            if category_pk is not None:
+                category = self.category(category_pk, category_name)
+            result = self._activities[pk] = Activity._from_trusted(name, pk=pk,
+                category=category, deleted=bool(deleted))
+            result.__class__ = _ReadOnlyActivity
+            return result
+
+    def tag(self, pk, name):
+        """
+        Return the ``hamster_lib.Tag`` for ``pk``, creating it if need be.
+
+        Args:
+            pk (int): PK of the tag.
+            name (text_type): Name of the tag. Only used if it is not pooled yet.
+
+        Returns:
+            hamster_lib.Tag: The pooled, read-only instance.
+        """
+        try:
+            return self._tags[pk]
+        except KeyError:
+            result = self._tags[pk] = Tag._from_trusted(name, pk=pk)
+            result.__class__ = _ReadOnlyTag
+            return result
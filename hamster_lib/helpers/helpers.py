@@ -59,3 +59,32 @@ def _load_tmp_fact(filepath):
                     content=fact, type=type(fact))
             ))
     return fact
+
+
+def find_duplicates(facts):
+    """
+    Separate facts from duplicates of facts that came before them.
+
+    Facts are compared by ``__eq__`` and ``__hash__``, which rely on the cached tuple
+    representation of each fact. This makes it cheap to weed out duplicates of large
+    batches of facts, for example before importing them.
+
+    Args:
+        facts (Iterable): Iterable of ``hamster_lib.Fact`` instances.
+
+    Returns:
+        tuple: ``(unique, duplicates)`` lists of facts, each in the order given.
+
+    Note:
+        As with ``__eq__`` the PK is taken into account. Facts that have not been
+        stored yet all have a PK of ``None``.
+    """
+    seen = set()
+    unique, duplicates = [], []
+    for fact in facts:
+        if fact in seen:
+            duplicates.append(fact)
+        else:
+            seen.add(fact)
+            unique.append(fact)
+    return (unique, duplicates)
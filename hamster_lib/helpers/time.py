@@ -180,6 +180,81 @@ def extract_time_info(text):
     return (result, rest.strip())
 
 
+class TimeInfoParser(object):
+    """
+    Extract time(-range) information from many strings, just like ``extract_time_info``.
+
+    Start, end and the remaining text are matched by a single precompiled pattern.
+    Converted date and time tokens are cached, so parsing large batches of raw facts
+    that share the same few dates and times only converts each of them once.
+
+    Instances are meant for one batch of strings. Caches grow with the number of
+    distinct tokens seen.
+    """
+
+    _tokens = r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}|\d{4}-\d{2}-\d{2}|\d{2}:\d{2}'
+    # Mirrors the two patterns of ``extract_time_info``, including the order in
+    # which alternatives are tried.
+    pattern = re.compile(
+        r'(?:(?P<relative>-\d+)|(?P<start>%(tokens)s)) '
+        r'(?P<rest>- (?P<end>%(tokens)s) (?P<end_rest>.+)|.+)' % {'tokens': _tokens}
+    )
+
+    def __init__(self):
+        self._dates = {}
+        self._times = {}
+
+    def _date(self, token):
+        try:
+            return self._dates[token]
+        except KeyError:
+            result = self._dates[token] = datetime.datetime.strptime(
+                token, "%Y-%m-%d").date()
+            return result
+
+    def _time(self, token):
+        try:
+            return self._times[token]
+        except KeyError:
+            result = self._times[token] = datetime.datetime.strptime(
+                token, "%H:%M").time()
+            return result
+
+    def _date_time(self, token):
+        """Return a ``(date, time)`` tuple for a datetime, date or time token."""
+        if len(token) == 16:
+            return (self._date(token[:10]), self._time(token[11:]))
+        elif len(token) == 10:
+            return (self._date(token), None)
+        return (None, self._time(token))
+
+    def extract(self, text):
+        """
+        Extract valid time(-range) information from a string.
+
+        Args:
+            text (text_type): Raw string containing encoded time(-span) information.
+
+        Returns:
+            tuple: ``(timeframe, rest)`` tuple, see ``extract_time_info`` for details.
+        """
+        match = self.pattern.match(text)
+        if not match:
+            return (TimeFrame(None, None, None, None, None), text.strip())
+
+        relative, start, rest, end = match.group('relative', 'start', 'rest', 'end')
+        if relative:
+            return (TimeFrame(None, None, None, None,
+                datetime.timedelta(minutes=abs(int(relative)))), rest.strip())
+
+        start_date, start_time = self._date_time(start)
+        end_date, end_time = None, None
+        if end:
+            end_date, end_time = self._date_time(end)
+            rest = match.group('end_rest')
+        return (TimeFrame(start_date, start_time, end_date, end_time, None), rest.strip())
+
+
 def complete_timeframe(timeframe, config, partial=False):
     """
     Apply fallback strategy to incomplete timeframes.
@@ -76,7 +76,19 @@ class HamsterControl(object):
     def update_config(self, config):
         """Use a new config dictionary and apply its settings."""
         self.config = config
+        self.store.cleanup()
         self.store = self._get_store()
+        self.categories = self.store.categories
+        self.activities = self.store.activities
+        self.facts = self.store.facts
+
+    def transaction(self):
+        """
+        Return a context manager that groups all changes made within into one transaction.
+
+        See ``hamster_lib.storage.BaseStore.transaction`` for details.
+        """
+        return self.store.transaction()
 
     def _get_store(self):
         """
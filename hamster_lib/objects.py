@@ -34,10 +34,77 @@ ActivityTuple = namedtuple('ActivityTuple', ('pk', 'name', 'category', 'deleted'
 FactTuple = namedtuple('FactTuple', ('pk', 'activity', 'start', 'end', 'description', 'tags'))
 
 
+class _SlottedObject(object):
+    """
+    Base class for our ``__slots__`` based objects.
+
+    Slots save us an instance dictionary per object, which adds up quickly when
+    handling large amounts of facts. Subclasses that do not declare ``__slots__``
+    themselves, like the mapped classes of the sqlalchemy backend, still get one.
+
+    ``as_tuple()`` (with its default ``include_pk=True``) and ``__hash__`` cache their
+    results in ``_tuple`` and ``_hash``. Property setters drop both by calling
+    ``_invalidate``. Related instances are not tracked that way, instead ``as_tuple``
+    checks whether their (cached) tuples are still the ones it was built from.
+    """
+
+    __slots__ = ('_tuple', '_hash')
+
+    # Subclasses whose attributes are not assigned through our property setters, like
+    # the instrumented ones of mapped classes, need to disable caching.
+    _cache_tuples = True
+
+    def _invalidate(self):
+        """Drop cached tuple representation and hash."""
+        self._tuple = None
+        self._hash = None
+
+    def _get_hash(self):
+        """Return the hash of our tuple representation, cached as long as it is current."""
+        if not self._cache_tuples:
+            return hash(self.as_tuple())
+        # Rebuilding the tuple drops the cached hash as well.
+        key = self.as_tuple()
+        if self._hash is None:
+            self._hash = hash(key)
+        return self._hash
+
+    def __getstate__(self):
+        """
+        Return the state to be pickled as a ``(dict, slots)`` tuple.
+
+        Without this, Python 2 refuses to pickle slotted instances with protocols
+        below 2, which are its default. The cached tuple and hash are left out.
+        """
+        slots = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if name not in _SlottedObject.__slots__ and hasattr(self, name):
+                    slots[name] = getattr(self, name)
+        return getattr(self, '__dict__', None), slots
+
+    def __setstate__(self, state):
+        """
+        Restore a pickled instance.
+
+        Besides the ``(dict, slots)`` state of slotted instances this accepts the plain
+        dictionaries of instances pickled before our objects used ``__slots__``.
+        """
+        if isinstance(state, tuple):
+            dict_state, state = state
+            if dict_state:
+                self.__dict__.update(dict_state)
+        for name, value in (state or {}).items():
+            setattr(self, name, value)
+        self._invalidate()
+
+
 @python_2_unicode_compatible
-class Category(object):
+class Category(_SlottedObject):
     """Storage agnostic class for categories."""
 
+    __slots__ = ('_pk', '_name')
+
     def __init__(self, name, pk=None):
         """
         Initialize this instance.
@@ -50,6 +117,35 @@ class Category(object):
         self.pk = pk
         self.name = name
 
+    @classmethod
+    def _from_trusted(cls, name, pk=None):
+        """
+        Create a new instance from values known to be valid, skipping any validation.
+
+        This is intended for backends rebuilding instances from stored values.
+
+        Args:
+            name (text_type): This categories name.
+            pk: The unique primary key used by the backend.
+
+        Returns:
+            Category: A new ``Category`` instance.
+        """
+        category = cls.__new__(cls)
+        category._pk = pk
+        category._name = name
+        category._invalidate()
+        return category
+
+    @property
+    def pk(self):
+        return self._pk
+
+    @pk.setter
+    def pk(self, pk):
+        self._pk = pk
+        self._invalidate()
+
     @property
     def name(self):
         return self._name
@@ -60,6 +156,7 @@ class Category(object):
             # Catching ``None`` and ``empty string``.
             raise ValueError(_("You need to specify a name."))
         self._name = text_type(name)
+        self._invalidate()
 
     def as_tuple(self, include_pk=True):
         """
@@ -72,6 +169,10 @@ class Category(object):
         Returns:
             CategoryTuple: Representing this categories values.
         """
+        if include_pk and self._cache_tuples:
+            if self._tuple is None:
+                self._tuple = CategoryTuple(pk=self.pk, name=self.name)
+            return self._tuple
         pk = self.pk
         if not include_pk:
             pk = False
@@ -110,8 +211,8 @@ class Category(object):
         return self.as_tuple() == other
 
     def __hash__(self):
-        """Naive hashing method."""
-        return hash(self.as_tuple())
+        """Hash our tuple representation, see ``_SlottedObject._get_hash``."""
+        return self._get_hash()
 
     def __str__(self):
         return text_type('{name}'.format(name=self.name))
@@ -122,9 +223,11 @@ class Category(object):
 
 
 @python_2_unicode_compatible
-class Activity(object):
+class Activity(_SlottedObject):
     """Storage agnostic class for activities."""
 
+    __slots__ = ('_pk', '_name', 'category', '_deleted')
+
     def __init__(self, name, pk=None, category=None, deleted=False):
         """
         Initialize this instance.
@@ -148,6 +251,39 @@ class Activity(object):
         self.category = category
         self.deleted = bool(deleted)
 
+    @classmethod
+    def _from_trusted(cls, name, pk=None, category=None, deleted=False):
+        """
+        Create a new instance from values known to be valid, skipping any validation.
+
+        This is intended for backends rebuilding instances from stored values.
+
+        Args:
+            name (text_type): This activities name.
+            pk: The unique primary key used by the backend.
+            category (Category): ``Category`` instance associated with this ``Activity``.
+            deleted (bool): True if this ``Activity`` has been marked as deleted.
+
+        Returns:
+            Activity: A new ``Activity`` instance.
+        """
+        activity = cls.__new__(cls)
+        activity._pk = pk
+        activity._name = name
+        activity.category = category
+        activity._deleted = deleted
+        activity._invalidate()
+        return activity
+
+    @property
+    def pk(self):
+        return self._pk
+
+    @pk.setter
+    def pk(self, pk):
+        self._pk = pk
+        self._invalidate()
+
     @property
     def name(self):
         return self._name
@@ -158,6 +294,16 @@ class Activity(object):
             # Catching ``None``
             raise ValueError(_("You need to specify a name."))
         self._name = text_type(name)
+        self._invalidate()
+
+    @property
+    def deleted(self):
+        return self._deleted
+
+    @deleted.setter
+    def deleted(self, deleted):
+        self._deleted = deleted
+        self._invalidate()
 
     @classmethod
     def create_from_composite(cls, name, category_name, deleted=False):
@@ -199,6 +345,13 @@ class Activity(object):
             category = self.category.as_tuple(include_pk=include_pk)
         else:
             category = None
+        if include_pk and self._cache_tuples:
+            result = self._tuple
+            if result is None or result.category is not category:
+                result = self._tuple = ActivityTuple(pk=pk, name=self.name, category=category,
+                    deleted=self.deleted)
+                self._hash = None
+            return result
         return ActivityTuple(pk=pk, name=self.name, category=category, deleted=self.deleted)
 
     def equal_fields(self, other):
@@ -224,8 +377,8 @@ class Activity(object):
         return self.as_tuple() == other
 
     def __hash__(self):
-        """Naive hashing method."""
-        return hash(self.as_tuple())
+        """Hash our tuple representation, see ``_SlottedObject._get_hash``."""
+        return self._get_hash()
 
     def __str__(self):
         if self.category is None:
@@ -246,9 +399,11 @@ class Activity(object):
 
 
 @python_2_unicode_compatible
-class Tag(object):
+class Tag(_SlottedObject):
     """Storage agnostic class for tags."""
 
+    __slots__ = ('_pk', '_name')
+
     def __init__(self, name, pk=None):
         """
         Initialize this instance.
@@ -261,6 +416,35 @@ class Tag(object):
         self.pk = pk
         self.name = name
 
+    @classmethod
+    def _from_trusted(cls, name, pk=None):
+        """
+        Create a new instance from values known to be valid, skipping any validation.
+
+        This is intended for backends rebuilding instances from stored values.
+
+        Args:
+            name (text_type): This tags name.
+            pk: The unique primary key used by the backend.
+
+        Returns:
+            Tag: A new ``Tag`` instance.
+        """
+        tag = cls.__new__(cls)
+        tag._pk = pk
+        tag._name = name
+        tag._invalidate()
+        return tag
+
+    @property
+    def pk(self):
+        return self._pk
+
+    @pk.setter
+    def pk(self, pk):
+        self._pk = pk
+        self._invalidate()
+
     @property
     def name(self):
         return self._name
@@ -271,6 +455,7 @@ class Tag(object):
             # Catching ``None`` and ``empty string``.
             raise ValueError(_("You need to specify a name."))
         self._name = text_type(name)
+        self._invalidate()
 
     def as_tuple(self, include_pk=True):
         """
@@ -283,6 +468,10 @@ class Tag(object):
         Returns:
             TagTuple: Representing this tags values.
         """
+        if include_pk and self._cache_tuples:
+            if self._tuple is None:
+                self._tuple = TagTuple(pk=self.pk, name=self.name)
+            return self._tuple
         pk = self.pk
         if not include_pk:
             pk = False
@@ -321,8 +510,8 @@ class Tag(object):
         return self.as_tuple() == other
 
     def __hash__(self):
-        """Naive hashing method."""
-        return hash(self.as_tuple())
+        """Hash our tuple representation, see ``_SlottedObject._get_hash``."""
+        return self._get_hash()
 
     def __str__(self):
         return text_type('{name}'.format(name=self.name))
@@ -333,13 +522,15 @@ class Tag(object):
 
 
 @python_2_unicode_compatible
-class Fact(object):
+class Fact(_SlottedObject):
     """Storage agnostic class for facts."""
     # [TODO]
     # There is some weired black magic still to be integrated from
     # ``store.db.Storage``. Among it ``__get_facts()``.
     #
 
+    __slots__ = ('_pk', 'activity', '_start', '_end', '_description', 'tags', '_tag_tuples')
+
     def __init__(self, activity, start, end=None, pk=None, description=None, tags=None):
         """
         Initiate our new instance.
@@ -369,6 +560,35 @@ class Fact(object):
         if tags:
             self.tags = set(tags)
 
+    @classmethod
+    def _from_trusted(cls, activity, start, end=None, pk=None, description=None, tags=None):
+        """
+        Create a new instance from values known to be valid, skipping any validation.
+
+        This is intended for backends rebuilding instances from stored values.
+
+        Args:
+            activity (hamster_lib.Activity): Activity associated with this fact.
+            start (datetime.datetime): Start datetime of this fact.
+            end (datetime.datetime, optional): End datetime of this fact.
+            pk (optional): Primary key used by the backend to identify this instance.
+            description (text_type, optional): Non empty description of this fact.
+            tags (set, optional): Set of ``Tag`` instances, owned by the new instance
+                from now on.
+
+        Returns:
+            Fact: A new ``Fact`` instance.
+        """
+        fact = cls.__new__(cls)
+        fact._pk = pk
+        fact.activity = activity
+        fact._start = start
+        fact._end = end
+        fact._description = description
+        fact.tags = tags if tags is not None else set()
+        fact._invalidate()
+        return fact
+
     @classmethod
     def create_from_raw_fact(cls, raw_fact, config=None):
         """
@@ -478,6 +698,82 @@ class Fact(object):
         activity = Activity(activity_name, category=category)
         return cls(activity, start, end=end, description=description)
 
+    @classmethod
+    def parse_many(cls, lines, config=None, errors='raise'):
+        """
+        Construct ``hamster_lib.Fact`` instances from many ``raw fact`` strings.
+
+        Each line is parsed exactly like ``create_from_raw_fact`` would, but time
+        information is extracted by one precompiled pattern and converted date and
+        time tokens are shared by all lines. This makes ingesting large batches, like
+        chat logs or exported files, considerably faster.
+
+        Args:
+            lines (iterable): ``raw fact`` strings. As lines are consumed one at a time,
+                file objects can be passed as well. Trailing line breaks are ignored and
+                so are blank lines.
+            config (dict, optional): Controller config provided additional settings
+                relevant for timeframe completion.
+            errors (text_type, optional): How to handle lines that can not be parsed.
+                ``'raise'`` raises a ``ValueError``, which ends iteration. ``'skip'``
+                drops the line. ``'collect'`` yields the ``ValueError`` in place of
+                the ``Fact`` and carries on. Defaults to ``'raise'``.
+
+        Yields:
+            hamster_lib.Fact: ``Fact`` objects in the order of ``lines``. With
+                ``errors='collect'``, ``ValueError`` instances for lines that could not
+                be parsed as well.
+
+        Raises:
+            ValueError: If a line can not be parsed and ``errors='raise'``. The message
+                includes its line number. Also if ``errors`` is none of the above.
+        """
+        if errors not in ('raise', 'skip', 'collect'):
+            raise ValueError(_("Unknown error handling: '{}'.".format(errors)))
+        if not config:
+            config = {'day_start': datetime.time(0, 0, 0)}
+        parser = time_helpers.TimeInfoParser()
+
+        for number, line in enumerate(lines, 1):
+            line = line.rstrip('\r\n')
+            if not line.strip():
+                continue
+            try:
+                time_info, rest = parser.extract(line)
+                start, end = time_helpers.complete_timeframe(time_info, config, partial=True)
+                activity_name, separator, back = rest.partition('@')
+                category, description = None, None
+                back = back.strip()
+                if back:
+                    category_name, separator, description = back.partition(',')
+                    category_name = category_name.strip()
+                    if separator:
+                        description = description.strip()
+                    else:
+                        description = None
+                    if category_name:
+                        category = Category(category_name)
+                fact = cls(Activity(activity_name.strip(), category=category), start,
+                    end=end, description=description)
+            except ValueError as error:
+                failure = ValueError(_("Line {number}: {error}".format(number=number,
+                    error=error)))
+                if errors == 'raise':
+                    raise failure
+                if errors == 'collect':
+                    yield failure
+                continue
+            yield fact
+
+    @property
+    def pk(self):
+        return self._pk
+
+    @pk.setter
+    def pk(self, pk):
+        self._pk = pk
+        self._invalidate()
+
     @property
     def start(self):
         return self._start
@@ -504,6 +800,7 @@ class Fact(object):
         else:
             start = None
         self._start = start
+        self._invalidate()
 
     @property
     def end(self):
@@ -531,6 +828,7 @@ class Fact(object):
         else:
             end = None
         self._end = end
+        self._invalidate()
 
     @property
     def description(self):
@@ -546,6 +844,7 @@ class Fact(object):
         else:
             description = None
         self._description = description
+        self._invalidate()
 
     @property
     def delta(self):
@@ -605,6 +904,15 @@ class Fact(object):
         """For convenience only."""
         return self.activity.category
 
+    def _tags_changed(self):
+        """Tell whether ``tags`` differ from those the cached tuple was built from."""
+        # ``tags`` may have been changed in place, so compare them one by one.
+        tag_tuples = self._tag_tuples
+        if len(self.tags) != len(tag_tuples):
+            return True
+        return any(tag.as_tuple() is not tag_tuple
+                   for tag, tag_tuple in zip(self.tags, tag_tuples))
+
     def as_tuple(self, include_pk=True):
         """
         Provide a tuple representation of this facts relevant attributes.
@@ -616,6 +924,15 @@ class Fact(object):
         Returns:
             hamster_lib.FactTuple: Representing this categories values.
         """
+        if include_pk and self._cache_tuples:
+            activity = self.activity.as_tuple()
+            result = self._tuple
+            if result is None or result.activity is not activity or self._tags_changed():
+                self._tag_tuples = tuple(tag.as_tuple() for tag in self.tags)
+                result = self._tuple = FactTuple(self.pk, activity, self.start, self.end,
+                    self.description, frozenset(self._tag_tuples))
+                self._hash = None
+            return result
         pk = self.pk
         if not include_pk:
             pk = False
@@ -647,8 +964,8 @@ class Fact(object):
         return self.as_tuple() == other
 
     def __hash__(self):
-        """Naive hashing method."""
-        return hash(self.as_tuple())
+        """Hash our tuple representation, see ``_SlottedObject._get_hash``."""
+        return self._get_hash()
 
     def __str__(self):
         result = text_type(self.activity.name)
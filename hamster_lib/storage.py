@@ -34,12 +34,56 @@ import datetime
 import logging
 import os
 import pickle
+import time
+from collections import namedtuple
 
 import hamster_lib
 from future.utils import python_2_unicode_compatible
 from hamster_lib import objects
 from hamster_lib.helpers import time as time_helpers
 from hamster_lib.helpers import helpers
+from six import text_type
+
+
+class BulkSaveResult(namedtuple('BulkSaveResult', ('saved', 'rejected', 'duration'))):
+    """
+    Summary of a ``BaseFactManager.save_many`` run.
+
+    Attributes:
+        saved (list): Primary keys of all facts that have been stored.
+        rejected (list): ``(fact, message)`` tuples for every fact that has been refused.
+        duration (float): Seconds the whole operation took.
+    """
+
+    __slots__ = ()
+
+    @property
+    def throughput(self):
+        """Return the number of stored facts per second."""
+        if not self.duration:
+            return float(len(self.saved))
+        return len(self.saved) / float(self.duration)
+
+
+class Total(namedtuple('Total', ('activity', 'category', 'tag', 'day', 'duration', 'count'))):
+    """
+    Aggregated duration of a group of facts as returned by ``BaseFactManager.get_totals``.
+
+    Attributes not part of the requested grouping are ``None``.
+
+    Attributes:
+        activity (text_type): Name of the activity.
+        category (text_type): Name of the category. ``None`` for facts without one.
+        tag (text_type): Name of the tag. ``None`` for facts without tags.
+        day (datetime.date): Workday the facts started on, respecting ``day_start``.
+        duration (datetime.timedelta): Sum of the facts durations.
+        count (int): Number of facts within this group.
+    """
+
+    __slots__ = ()
+
+
+TOTALS_GROUPS = ('activity', 'category', 'tag', 'day')
 
 
 @python_2_unicode_compatible
@@ -66,6 +110,26 @@ class BaseStore(object):
         """
         Any backend specific teardown code that needs to be executed before
         we shut down gracefully.
+
+        Stores that may be used by multiple threads release the resources held for
+        the calling thread only. Such a store stays usable afterwards.
+        """
+        raise NotImplementedError
+
+    def transaction(self):
+        """
+        Return a context manager grouping all changes made within into a single transaction.
+
+        Changes are committed once the block is left and rolled back altogether if it is
+        left by an exception. Transactions may be nested, inner ones only roll back their
+        own changes.
+
+        Example:
+            ::
+
+                with store.transaction():
+                    store.categories.save(category)
+                    store.facts.save(fact)
         """
         raise NotImplementedError
 
@@ -495,6 +559,26 @@ class BaseTagManager(BaseManager):
             tag = None
         return tag
 
+    def get_or_create_many(self, tags):
+        """
+        Return all given tags, creating those that do not exist yet.
+
+        This generic implementation calls ``get_or_create`` for each tag. Backends
+        should overload it to look up and create tags in bulk.
+
+        Args:
+            tags (iterable): ``hamster_lib.Tag`` instances or tag names.
+
+        Returns:
+            list: The retrieved or created tags in the order given, without duplicates.
+        """
+        names = []
+        for tag in tags:
+            name = tag.name if isinstance(tag, objects.Tag) else tag
+            if name not in names:
+                names.append(name)
+        return [self.get_or_create(name) for name in names]
+
     def _add(self, tag):
         """
         Add a ``Tag`` to our backend.
@@ -613,6 +697,77 @@ class BaseFactManager(BaseManager):
         """
         self.store.logger.debug(_("Fact: '{}' has been received.".format(fact)))
 
+        self._validate_min_delta(fact)
+
+        if fact.pk or fact.pk == 0:
+            result = self._update(fact)
+        elif fact.end is None:
+            result = self._start_tmp_fact(fact)
+        else:
+            result = self._add(fact)
+        return result
+
+    def save_many(self, facts, batch_size=500):
+        """
+        Save a multitude of new facts in one go.
+
+        In contrast to calling ``save`` for each fact individually, a fact that can
+        not be stored does not abort the whole operation. It is simply rejected and
+        reported back as part of the result. ``fact_min_delta`` is enforced just like
+        with ``save``.
+
+        Args:
+            facts (Iterable): Iterable of new ``hamster_lib.Fact`` instances. As we
+                consume it lazily, generators are fine.
+            batch_size (int, optional): Number of facts that are handed to the backend
+                at once. Defaults to ``500``.
+
+        Returns:
+            BulkSaveResult: PKs of stored facts, rejected facts and the time it took.
+
+        Note:
+            * Ongoing facts (without ``end``) and facts that already have a PK are
+              rejected. Use ``save`` for those.
+            * Backends are expected to store all accepted facts within a single
+              transaction.
+        """
+        self.store.logger.debug(_("Received facts to be saved in batches of {}.".format(
+            batch_size)))
+
+        started = time.time()
+        rejected = []
+
+        def validate(facts):
+            """Yield all facts passing generic validation, collect the others."""
+            for fact in facts:
+                if not isinstance(fact, objects.Fact):
+                    rejected.append((fact, _("You need to pass a hamster fact.")))
+                elif fact.pk or fact.pk == 0:
+                    rejected.append((fact, _("Fact already has a PK. Use ``save`` instead.")))
+                elif fact.end is None:
+                    rejected.append((fact, _("Ongoing facts can not be saved in bulk.")))
+                else:
+                    try:
+                        self._validate_min_delta(fact)
+                    except ValueError as error:
+                        rejected.append((fact, text_type(error)))
+                    else:
+                        yield fact
+
+        saved, backend_rejected = self._add_many(validate(facts), batch_size)
+        rejected.extend(backend_rejected)
+        result = BulkSaveResult(saved, rejected, time.time() - started)
+        self.store.logger.debug(_("Saved {saved} facts, rejected {rejected}.".format(
+            saved=len(result.saved), rejected=len(result.rejected))))
+        return result
+
+    def _validate_min_delta(self, fact):
+        """
+        Make sure the passed fact is not shorter than ``fact_min_delta``.
+
+        Raises:
+            ValueError: If ``fact.delta`` is smaller than ``self.store.config['fact_min_delta']``.
+        """
         fact_min_delta = datetime.timedelta(seconds=int(self.store.config['fact_min_delta']))
         if fact.delta and (fact.delta < fact_min_delta):
             message = _(
@@ -622,13 +777,29 @@ class BaseFactManager(BaseManager):
             self.store.logger.error(message)
             raise ValueError(message)
 
-        if fact.pk or fact.pk == 0:
-            result = self._update(fact)
-        elif fact.end is None:
-            result = self._start_tmp_fact(fact)
-        else:
-            result = self._add(fact)
-        return result
+    def _add_many(self, facts, batch_size):
+        """
+        Add multiple new ``Facts`` to the backend.
+
+        This generic implementation just calls ``_add`` for each fact. Backends
+        should overload it in order to store all facts within one transaction.
+
+        Args:
+            facts (Iterable): New ``hamster_lib.Fact`` instances that passed
+                generic validation already.
+            batch_size (int): Number of facts to be written at once.
+
+        Returns:
+            tuple: ``(saved, rejected)`` tuple. ``saved`` is a list of PKs of all
+                stored facts, ``rejected`` a list of ``(fact, message)`` tuples.
+        """
+        saved, rejected = [], []
+        for fact in facts:
+            try:
+                saved.append(self._add(fact).pk)
+            except ValueError as error:
+                rejected.append((fact, text_type(error)))
+        return (saved, rejected)
 
     def _add(self, fact):
         """
@@ -694,7 +865,29 @@ class BaseFactManager(BaseManager):
         """
         raise NotImplementedError
 
-    def get_all(self, start=None, end=None, filter_term=''):
+    def overlaps(self, start, end, exclude_pk=None):
+        """
+        Check if the given timeframe is occupied by any stored fact.
+
+        This generic implementation inspects the result of ``_get_all``. Backends
+        should overload it with a query that does not need to load any facts.
+
+        Args:
+            start (datetime.datetime): Start of the timeframe.
+            end (datetime.datetime): End of the timeframe.
+            exclude_pk (optional): PK of a fact to be ignored. This is useful when
+                checking the new timeframe of an existing fact. Defaults to ``None``.
+
+        Returns:
+            PK of an overlapping fact or ``None`` if the timeframe is free.
+        """
+        for fact in self._get_all(start, end, partial=True):
+            if fact.pk != exclude_pk:
+                return fact.pk
+        return None
+
+    def get_all(self, start=None, end=None, filter_term='', tags=None, any_tags=None,
+            all_tags=None, loading=None):
         """
         Return all facts within a given timeframe (beginning of start_date
         end of end_date) that match given search terms.
@@ -712,6 +905,18 @@ class BaseFactManager(BaseManager):
                 Defaults to ``None``.
             filter_term (str, optional): Only consider ``Facts`` with this string as part of their
                 associated ``Activity.name``
+            tags (iterable, optional): Only consider ``Facts`` carrying all of these tags.
+                Tags may be given as ``Tag`` instances or by name, a single tag may be
+                passed as is. Combined with ``all_tags`` if both are given.
+                Defaults to ``None``.
+            any_tags (iterable, optional): Only consider ``Facts`` carrying at least one of
+                these tags. See ``tags``. Defaults to ``None``.
+            all_tags (iterable, optional): Only consider ``Facts`` carrying every one of
+                these tags. See ``tags``. Defaults to ``None``.
+            loading (text_type, optional): Strategy the backend uses to load facts for
+                this query, if it supports several. The sqlalchemy backend accepts
+                ``'eager'``, ``'lazy'`` and ``'core'``. Defaults to ``None`` which uses
+                the backends default.
 
         Returns:
             list: List of ``Facts`` matching given specifications.
@@ -732,6 +937,268 @@ class BaseFactManager(BaseManager):
                 start=start, end=end, filter=filter_term)
         ))
 
+        start, end = self._normalize_timeframe(start, end)
+        all_tags = (self._normalize_tags(tags) or frozenset()) | (
+            self._normalize_tags(all_tags) or frozenset())
+        return self._get_all(start, end, filter_term, any_tags=self._normalize_tags(any_tags),
+            all_tags=all_tags or None, loading=loading)
+
+    def iter_all(self, start=None, end=None, filter_term='', chunk_size=1000, loading=None):
+        """
+        Iterate over all facts within a given timeframe that match given search terms.
+
+        This behaves just like ``get_all`` but instead of building a list of all matching
+        facts, they are retrieved from the backend in chunks. This makes it suitable
+        for processing large timeframes (like exports) in constant memory.
+
+        Args:
+            start (datetime.datetime, optional): See ``get_all``.
+            end (datetime.datetime, optional): See ``get_all``.
+            filter_term (str, optional): See ``get_all``.
+            chunk_size (int, optional): Number of facts the backend retrieves at once.
+                Defaults to ``1000``.
+            loading (text_type, optional): See ``get_all``.
+
+        Returns:
+            iterator: Iterator over ``Facts`` matching given specifications.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+            ValueError: If ``end`` is before ``start``.
+        """
+        self.store.logger.debug(_(
+            "Start: '{start}', end: {end} with filter: {filter} has been received.".format(
+                start=start, end=end, filter=filter_term)
+        ))
+
+        start, end = self._normalize_timeframe(start, end)
+        return self._iter_all(start, end, filter_term, chunk_size, loading=loading)
+
+    def get_page(self, start=None, end=None, filter_term='', after=None, limit=50,
+            descending=False, loading=None):
+        """
+        Return one page of facts within a given timeframe that match given search terms.
+
+        Facts are ordered by ``(start, pk)``. To retrieve the following page, pass
+        ``(fact.start, fact.pk)`` of the last fact of the current page as ``after``.
+
+        Args:
+            start (datetime.datetime, optional): See ``get_all``.
+            end (datetime.datetime, optional): See ``get_all``.
+            filter_term (str, optional): See ``get_all``.
+            after (tuple, optional): ``(start, pk)`` tuple of the last fact of the
+                previous page. Defaults to ``None`` which returns the first page.
+            limit (int, optional): Maximum number of facts per page. Defaults to ``50``.
+            descending (bool, optional): If ``True`` page from the latest fact to the
+                earliest one. Defaults to ``False``.
+            loading (text_type, optional): See ``get_all``.
+
+        Returns:
+            list: List of up to ``limit`` ``Facts``. An empty list indicates there are
+                no more pages.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+            ValueError: If ``end`` is before ``start``.
+            ValueError: If ``limit`` is not a positive number.
+        """
+        self.store.logger.debug(_(
+            "Start: '{start}', end: {end} with filter: {filter}, after: {after} and limit:"
+            " {limit} has been received.".format(
+                start=start, end=end, filter=filter_term, after=after, limit=limit)
+        ))
+
+        if limit < 1:
+            message = _("The page limit needs to be a positive number.")
+            self.store.logger.debug(message)
+            raise ValueError(message)
+
+        start, end = self._normalize_timeframe(start, end)
+        return self._get_page(start, end, filter_term, after, limit, descending,
+            loading=loading)
+
+    def get_totals(self, start=None, end=None, group_by=('category', 'activity')):
+        """
+        Return the summed up durations of all facts within a given timeframe.
+
+        Args:
+            start (datetime.datetime, optional): See ``get_all``.
+            end (datetime.datetime, optional): See ``get_all``.
+            group_by (tuple, optional): Any combination of ``'activity'``, ``'category'``,
+                ``'tag'`` and ``'day'``. Defaults to ``('category', 'activity')``. An empty
+                tuple returns a single grand total.
+
+        Returns:
+            list: List of ``Total`` instances, ordered by the fields given as ``group_by``.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+            ValueError: If ``end`` is before ``start``.
+            ValueError: If ``group_by`` contains an unknown field.
+
+        Note:
+            * As activity names are only unique per category, grouping by ``'activity'``
+              implies grouping by ``'category'``.
+            * Facts with several tags are accounted for once per tag when grouping by
+              ``'tag'``.
+            * Facts are attributed to the workday they started on.
+        """
+        self.store.logger.debug(_(
+            "Start: '{start}', end: {end} and group_by: {group_by} has been received.".format(
+                start=start, end=end, group_by=group_by)
+        ))
+
+        unknown = set(group_by) - set(TOTALS_GROUPS)
+        if unknown:
+            message = _("Unable to group totals by: {}.".format(', '.join(sorted(unknown))))
+            self.store.logger.error(message)
+            raise ValueError(message)
+
+        group_by = tuple(group_by)
+        if 'activity' in group_by and 'category' not in group_by:
+            group_by += ('category',)
+
+        start, end = self._normalize_timeframe(start, end)
+
+        def sort_key(total):
+            return tuple((getattr(total, field) is None, getattr(total, field) or '')
+                for field in group_by)
+
+        return sorted(self._get_totals(start, end, group_by), key=sort_key)
+
+    def get_frame(self, start=None, end=None, filter_term=''):
+        """
+        Return all facts within a given timeframe that match given search terms as frame.
+
+        A ``hamster_lib.frame.FactFrame`` holds facts in columns instead of one
+        ``Fact`` instance each, which makes analysing large amounts of facts much
+        faster and cheaper on memory.
+
+        Args:
+            start (datetime.datetime, optional): See ``get_all``.
+            end (datetime.datetime, optional): See ``get_all``.
+            filter_term (str, optional): See ``get_all``.
+
+        Returns:
+            hamster_lib.frame.FactFrame: Frame of ``Facts`` matching given specifications,
+                bucketing days by ``config['day_start']``.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+            ValueError: If ``end`` is before ``start``.
+        """
+        self.store.logger.debug(_(
+            "Start: '{start}', end: {end} with filter: {filter} has been received.".format(
+                start=start, end=end, filter=filter_term)
+        ))
+
+        start, end = self._normalize_timeframe(start, end)
+        return self._get_frame(start, end, filter_term)
+
+    def remove_range(self, start, end, filter_term=''):
+        """
+        Remove all facts within a given timeframe that match given search terms.
+
+        Args:
+            start (datetime.datetime): See ``get_all``.
+            end (datetime.datetime): See ``get_all``.
+            filter_term (str, optional): See ``get_all``.
+
+        Returns:
+            int: Number of facts removed.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+            ValueError: If ``end`` is before ``start``.
+        """
+        self.store.logger.debug(_(
+            "Start: '{start}', end: {end} with filter: {filter} has been received.".format(
+                start=start, end=end, filter=filter_term)
+        ))
+
+        start, end = self._normalize_timeframe(start, end)
+        return self._remove_range(start, end, filter_term)
+
+    def reassign_activity(self, old, new, start=None, end=None):
+        """
+        Assign all facts of one activity within a given timeframe to another activity.
+
+        Args:
+            old (hamster_lib.Activity): Activity whose facts are to be reassigned.
+            new (hamster_lib.Activity): Activity to be assigned instead.
+            start (datetime.datetime, optional): See ``get_all``.
+            end (datetime.datetime, optional): See ``get_all``.
+
+        Returns:
+            int: Number of facts reassigned.
+
+        Raises:
+            ValueError: If either activity does not have a PK.
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+            ValueError: If ``end`` is before ``start``.
+        """
+        self.store.logger.debug(_(
+            "Old: {old!r}, new: {new!r}, start: '{start}' and end: {end} have been"
+            " received.".format(old=old, new=new, start=start, end=end)
+        ))
+
+        for activity in (old, new):
+            if not activity.pk:
+                message = _("{!r} does not seem to have a PK.".format(activity))
+                self.store.logger.error(message)
+                raise ValueError(message)
+
+        start, end = self._normalize_timeframe(start, end)
+        return self._reassign_activity(old, new, start, end)
+
+    def add_tag_range(self, tag, start, end):
+        """
+        Add a tag to all facts within a given timeframe.
+
+        The tag is created if it does not exist yet. Facts already carrying it are left
+        alone.
+
+        Args:
+            tag (hamster_lib.Tag or text_type): Tag to be added, as instance or by name.
+            start (datetime.datetime): See ``get_all``.
+            end (datetime.datetime): See ``get_all``.
+
+        Returns:
+            int: Number of facts the tag was added to.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+            ValueError: If ``end`` is before ``start``.
+        """
+        self.store.logger.debug(_(
+            "Tag: {tag!r}, start: '{start}' and end: {end} have been received.".format(
+                tag=tag, start=start, end=end)
+        ))
+
+        if not isinstance(tag, objects.Tag):
+            tag = objects.Tag(tag)
+        start, end = self._normalize_timeframe(start, end)
+        return self._add_tag_range(tag, start, end)
+
+    def _normalize_timeframe(self, start, end):
+        """
+        Turn ``start`` and ``end`` as passed to ``get_all`` into ``datetime.datetime`` instances.
+
+        Returns:
+            tuple: Normalized ``(start, end)`` tuple.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+            ValueError: If ``end`` is before ``start``.
+        """
         if start is not None:
             if isinstance(start, datetime.datetime):
                 # isinstance(datetime.datetime, datetime.date) returns True,
@@ -770,9 +1237,24 @@ class BaseFactManager(BaseManager):
             self.store.logger.debug(message)
             raise ValueError(message)
 
-        return self._get_all(start, end, filter_term)
+        return (start, end)
 
-    def _get_all(self, start=None, end=None, search_terms='', partial=False):
+    def _normalize_tags(self, tags):
+        """
+        Turn tags as passed to ``get_all`` into a set of tag names.
+
+        Returns:
+            frozenset: Names of the given tags or ``None`` if no tags were given.
+        """
+        if not tags:
+            return None
+        if isinstance(tags, (text_type, str, objects.Tag)):
+            tags = (tags,)
+        return frozenset(text_type(tag.name if isinstance(tag, objects.Tag) else tag)
+            for tag in tags)
+
+    def _get_all(self, start=None, end=None, search_terms='', partial=False, any_tags=None,
+            all_tags=None, loading=None):
         """
         Return a list of ``Facts`` matching given criteria.
 
@@ -784,7 +1266,13 @@ class BaseFactManager(BaseManager):
             search_term (text_type): Cases insensitive strings to match
                 ``Activity.name`` or ``Category.name``.
             partial (bool): If ``False`` only facts which start *and* end
-                within the timeframe will be considered.
+                within the timeframe will be considered. If ``True`` any fact
+                overlapping the timeframe will be, including those spanning it entirely.
+            any_tags (frozenset, optional): Names of tags of which facts need to carry at
+                least one.
+            all_tags (frozenset, optional): Names of tags facts need to carry all of.
+            loading (text_type, optional): Backend specific strategy used to load facts.
+                Backends offering just one may ignore it.
 
         Returns:
             list: List of ``Facts`` matching given specifications.
@@ -795,6 +1283,184 @@ class BaseFactManager(BaseManager):
         """
         raise NotImplementedError
 
+    def _iter_all(self, start=None, end=None, search_term='', chunk_size=1000, loading=None):
+        """
+        Return an iterator over ``Facts`` matching given criteria.
+
+        This generic implementation just iterates over the result of ``_get_all``.
+        Backends should overload it in order to fetch facts in chunks of ``chunk_size``.
+
+        Args:
+            start_date (datetime.datetime, optional): Consider only Facts starting at or after
+                this datetime. Defaults to ``None``.
+            end_date (datetime.datetime): Consider only Facts ending before or at
+                this datetime. Defaults to ``None``.
+            search_term (text_type): Cases insensitive strings to match
+                ``Activity.name`` or ``Category.name``.
+            chunk_size (int): Number of facts to be retrieved at once.
+            loading (text_type, optional): See ``_get_all``.
+
+        Returns:
+            iterator: Iterator over ``Facts`` matching given specifications.
+        """
+        return iter(self._get_all(start, end, search_term, loading=loading))
+
+    def _get_page(self, start=None, end=None, search_term='', after=None, limit=50,
+            descending=False, loading=None):
+        """
+        Return one page of ``Facts`` matching given criteria.
+
+        This generic implementation sorts and slices the result of ``_get_all``.
+        Backends should overload it with a query that only retrieves the page requested.
+
+        Args:
+            start_date (datetime.datetime, optional): Consider only Facts starting at or after
+                this datetime. Defaults to ``None``.
+            end_date (datetime.datetime): Consider only Facts ending before or at
+                this datetime. Defaults to ``None``.
+            search_term (text_type): Cases insensitive strings to match
+                ``Activity.name`` or ``Category.name``.
+            after (tuple): ``(start, pk)`` of the last fact of the previous page.
+            limit (int): Maximum number of facts to be returned.
+            descending (bool): Page from latest to earliest fact.
+            loading (text_type, optional): See ``_get_all``.
+
+        Returns:
+            list: List of ``Facts`` ordered by ``(start, pk)``.
+        """
+        facts = sorted(self._get_all(start, end, search_term, loading=loading),
+            key=lambda fact: (fact.start, fact.pk), reverse=descending)
+        if after:
+            if descending:
+                facts = [fact for fact in facts if (fact.start, fact.pk) < tuple(after)]
+            else:
+                facts = [fact for fact in facts if (fact.start, fact.pk) > tuple(after)]
+        return facts[:limit]
+
+    def _get_totals(self, start, end, group_by):
+        """
+        Return the summed up durations of all facts within a given timeframe.
+
+        This generic implementation aggregates the result of ``_get_all``. Backends should
+        overload it to do the work within their storage.
+
+        Args:
+            start (datetime.datetime): Start of timeframe or ``None``.
+            end (datetime.datetime): End of timeframe or ``None``.
+            group_by (tuple): Validated fields to group by. See ``get_totals``.
+
+        Returns:
+            list: List of ``Total`` instances in no particular order.
+        """
+        day_start = self.store.config['day_start']
+        totals = {}
+        for fact in self._get_all(start, end):
+            values = {
+                'activity': fact.activity.name,
+                'category': fact.category.name if fact.category else None,
+                'day': (fact.start - datetime.timedelta(hours=day_start.hour,
+                    minutes=day_start.minute, seconds=day_start.second)).date(),
+            }
+            tags = [tag.name for tag in fact.tags] or [None]
+            if 'tag' not in group_by:
+                tags = [None]
+            for tag in tags:
+                values['tag'] = tag
+                key = tuple(values[field] if field in group_by else None
+                    for field in TOTALS_GROUPS)
+                duration, count = totals.get(key, (datetime.timedelta(), 0))
+                totals[key] = (duration + fact.delta, count + 1)
+        return [Total(*(key + value)) for key, value in totals.items()]
+
+    def _get_frame(self, start, end, search_term=''):
+        """
+        Return a ``FactFrame`` of all facts matching given criteria.
+
+        This generic implementation builds the frame from the facts of ``_iter_all``.
+        Backends should overload it to build the frame without creating ``Fact``
+        instances in the first place.
+
+        Args:
+            start (datetime.datetime): Start of timeframe or ``None``.
+            end (datetime.datetime): End of timeframe or ``None``.
+            search_term (text_type): See ``_get_all``.
+
+        Returns:
+            hamster_lib.frame.FactFrame: Frame of matching facts ordered by ``(start, pk)``.
+        """
+        # Imported on demand, as it loads NumPy if available.
+        from hamster_lib.frame import FactFrame
+
+        return FactFrame.from_facts(self._iter_all(start, end, search_term),
+            day_start=self.store.config['day_start'])
+
+    def _remove_range(self, start, end, search_term):
+        """
+        Remove all facts within a given timeframe that match given search terms.
+
+        This generic implementation removes each fact returned by ``_get_all``. Backends
+        should overload it to do the work within their storage.
+
+        Args:
+            start (datetime.datetime): Start of timeframe or ``None``.
+            end (datetime.datetime): End of timeframe or ``None``.
+            search_term (text_type): See ``_get_all``.
+
+        Returns:
+            int: Number of facts removed.
+        """
+        facts = self._get_all(start, end, search_term)
+        for fact in facts:
+            self.remove(fact)
+        return len(facts)
+
+    def _reassign_activity(self, old, new, start, end):
+        """
+        Assign all facts of one activity within a given timeframe to another activity.
+
+        This generic implementation updates each matching fact returned by ``_get_all``.
+        Backends should overload it to do the work within their storage.
+
+        Args:
+            old (hamster_lib.Activity): Activity whose facts are to be reassigned.
+            new (hamster_lib.Activity): Activity to be assigned instead.
+            start (datetime.datetime): Start of timeframe or ``None``.
+            end (datetime.datetime): End of timeframe or ``None``.
+
+        Returns:
+            int: Number of facts reassigned.
+        """
+        count = 0
+        for fact in self._get_all(start, end):
+            if fact.activity.pk == old.pk:
+                fact.activity = new
+                self._update(fact)
+                count += 1
+        return count
+
+    def _add_tag_range(self, tag, start, end):
+        """
+        Add a tag to all facts within a given timeframe.
+
+        This generic implementation updates each fact returned by ``_get_all`` lacking
+        the tag. Backends should overload it to do the work within their storage.
+
+        Args:
+            tag (hamster_lib.Tag): Tag to be added.
+            start (datetime.datetime): Start of timeframe or ``None``.
+            end (datetime.datetime): End of timeframe or ``None``.
+
+        Returns:
+            int: Number of facts the tag was added to.
+        """
+        count = 0
+        for fact in self._get_all(start, end):
+            if tag.name not in [each.name for each in fact.tags]:
+                fact.tags.add(tag)
+                self._update(fact)
+                count += 1
+        return count
+
     def get_today(self):
         """
         Return all facts for today, while respecting ``day_start``.
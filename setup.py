@@ -18,7 +18,7 @@ with open('HISTORY.rst') as history_file:
 requirements = [
     'appdirs',
     'future',
-    'sqlalchemy',
+    'sqlalchemy >= 1.2, < 2.0',
     'icalendar',
     'six',
     'configparser >= 3.5.0b2',
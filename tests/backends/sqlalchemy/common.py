@@ -7,6 +7,37 @@ This way it can be referencecd by fixtures and factories.
 [Details](http://factoryboy.readthedocs.org/en/latest/orms.html#sqlalchemy)
 """
 
-from sqlalchemy import orm
+from contextlib import contextmanager
+
+from sqlalchemy import event, orm
 
 Session = orm.scoped_session(orm.sessionmaker())
+
+
+@contextmanager
+def assert_query_count(engine, expected):
+    """
+    Make sure exactly ``expected`` SQL statements are issued within this context.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Engine whose statements are to be counted.
+        expected (int): Number of statements we expect.
+
+    Yields:
+        list: Statements recorded so far.
+
+    Raises:
+        AssertionError: If the number of statements differs, listing all of them.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert len(statements) == expected, '{} statements issued instead of {}:\n{}'.format(
+        len(statements), expected, '\n\n'.join(statements))
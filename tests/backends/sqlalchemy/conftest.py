@@ -10,7 +10,7 @@ import os
 import fauxfactory
 import pytest
 from hamster_lib import Activity, Category, Fact, Tag
-from hamster_lib.backends.sqlalchemy import objects
+from hamster_lib.backends.sqlalchemy import objects, storage
 from hamster_lib.backends.sqlalchemy.storage import SQLAlchemyStore
 from pytest_factoryboy import register
 from sqlalchemy import create_engine
@@ -53,6 +53,14 @@ def alchemy_runner(request):
     request.addfinalizer(fin)
 
 
+@pytest.fixture
+def assert_query_count(alchemy_runner):
+    """Provide a context manager asserting the number of statements issued by our test-session."""
+    def assert_count(expected):
+        return common.assert_query_count(common.Session.get_bind(), expected)
+    return assert_count
+
+
 @pytest.fixture(params=[
     fauxfactory.gen_utf8(),
     fauxfactory.gen_alphanumeric(),
@@ -79,6 +87,19 @@ def alchemy_config(request, base_config):
     return config
 
 
+@pytest.fixture
+def alchemy_file_config(request, alchemy_config, tmpdir):
+    """
+    Provide a config for a sqlite database within our tmp-dir.
+
+    Engines shared by stores created during the test are disposed afterwards.
+    """
+    config = alchemy_config.copy()
+    config['db_path'] = os.path.join(tmpdir.strpath, 'hamster.sqlite')
+    request.addfinalizer(storage.dispose_engines)
+    return config
+
+
 @pytest.fixture(params=(
     # sqlite
     {'db_engine': 'sqlite',
@@ -167,6 +188,13 @@ def alchemy_store(request, alchemy_runner, alchemy_config):
     return SQLAlchemyStore(alchemy_config, common.Session)
 
 
+@pytest.fixture
+def alchemy_fulltext_store(request, alchemy_runner, alchemy_config):
+    """Provide a SQLAlchemyStore that uses our test-session and a full text index."""
+    alchemy_config['fulltext_search'] = True
+    return SQLAlchemyStore(alchemy_config, common.Session)
+
+
 # We are sometimes tempted not using hamster-lib.objects at all. but as our tests
 # expect them as input we need them!
 
@@ -0,0 +1,91 @@
+# -*- encoding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import datetime
+import os.path
+import threading
+
+import pytest
+from hamster_lib import Activity, Fact
+
+aio = pytest.importorskip('hamster_lib.aio')
+
+
+@pytest.yield_fixture
+def loop():
+    """Provide a new event loop."""
+    import asyncio
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.yield_fixture(params=(False, True))
+def async_controller(request, base_config, tmpdir, loop):
+    """Provide an ``AsyncHamsterControl`` using an in memory as well as a file database."""
+    config = dict(base_config)
+    if request.param:
+        config['db_path'] = os.path.join(tmpdir.strpath, 'hamster.sqlite')
+    controller = aio.AsyncHamsterControl(config, loop=loop)
+    yield controller
+    controller.close()
+
+
+class TestAsyncHamsterControl(object):
+    def test_save_and_get(self, async_controller, loop, fact):
+        """Make sure calls return awaitables for the results of the blocking methods."""
+        result = loop.run_until_complete(async_controller.facts.save(fact))
+        assert result.pk is not None
+        assert loop.run_until_complete(async_controller.facts.get(result.pk)) == result
+        assert loop.run_until_complete(async_controller.facts.get_all()) == [result]
+
+    def test_get_all_sees_latest_write(self, async_controller, loop, fact):
+        """Make sure reads reflect writes that finished before."""
+        assert loop.run_until_complete(async_controller.facts.get_all()) == []
+        fact = loop.run_until_complete(async_controller.facts.save(fact))
+        loop.run_until_complete(async_controller.facts.remove(fact))
+        assert loop.run_until_complete(async_controller.facts.get_all()) == []
+
+    def test_exception(self, async_controller, loop):
+        """Make sure exceptions are raised when awaiting the result."""
+        with pytest.raises(KeyError):
+            loop.run_until_complete(async_controller.categories.get(1))
+
+    def test_unknown_method(self, async_controller):
+        """Make sure only the listed methods are available."""
+        with pytest.raises(AttributeError):
+            async_controller.facts.iter_all
+
+    def test_writes_are_serialized(self, async_controller, loop):
+        """Make sure concurrent writes of overlapping facts never both succeed."""
+        import asyncio
+        start = datetime.datetime(2016, 1, 1, 10)
+        facts = [Fact(Activity('foo'), start, start + datetime.timedelta(hours=1))
+            for i in range(5)]
+        results = loop.run_until_complete(asyncio.gather(
+            *[async_controller.facts.save(fact) for fact in facts], return_exceptions=True))
+        assert len([result for result in results if isinstance(result, Fact)]) == 1
+        assert len(loop.run_until_complete(async_controller.facts.get_all())) == 1
+
+    def test_reads_are_concurrent(self, base_config, tmpdir, loop, mocker):
+        """Make sure reads run in parallel on file databases."""
+        config = dict(base_config, db_path=os.path.join(tmpdir.strpath, 'hamster.sqlite'))
+        controller = aio.AsyncHamsterControl(config, max_readers=2, loop=loop)
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_all(*args, **kwargs):
+            barrier.wait()
+            return []
+        mocker.patch('hamster_lib.backends.sqlalchemy.storage.FactManager.get_all',
+            side_effect=get_all)
+        import asyncio
+        try:
+            assert loop.run_until_complete(asyncio.gather(
+                controller.facts.get_all(), controller.facts.get_all())) == [[], []]
+        finally:
+            controller.close()
+
+    def test_invalid_max_readers(self, base_config):
+        with pytest.raises(ValueError):
+            aio.AsyncHamsterControl(base_config, max_readers=-1)
@@ -0,0 +1,159 @@
+# -*- encoding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import datetime
+
+import pytest
+from hamster_lib import Activity, Category, Fact, Tag, frame
+from hamster_lib.frame import FactFrame
+
+
+@pytest.fixture(params=('numpy', 'array'))
+def columns(request, monkeypatch):
+    """Run tests with NumPy columns, if available, and stdlib arrays."""
+    if request.param == 'array':
+        monkeypatch.setattr(frame, 'numpy', None)
+    elif frame.numpy is None:
+        pytest.skip("NumPy is not installed.")
+    return request.param
+
+
+@pytest.fixture
+def frame_facts():
+    """
+    Provide facts of two categories with and without tags.
+
+    Facts start at 04:00 and 12:00 of two consecutive days.
+    """
+    work = Activity('coding', pk=1, category=Category('work', pk=1))
+    leisure = Activity('reading', pk=2, category=None)
+    foo, bar = Tag('foo', pk=1), Tag('bar', pk=2)
+    start = datetime.datetime(2016, 3, 1, 4)
+
+    def fact(pk, offset, minutes, activity, tags=()):
+        fact_start = start + datetime.timedelta(hours=offset)
+        return Fact(activity, fact_start, fact_start + datetime.timedelta(minutes=minutes),
+            pk=pk, description='fact {}'.format(pk), tags=tags)
+
+    return [
+        fact(1, 0, 30, work, (foo,)),
+        fact(2, 8, 60, work, (foo, bar)),
+        fact(3, 24, 90, leisure),
+        fact(4, 32, 120, work, (bar,)),
+    ]
+
+
+@pytest.fixture
+def fact_frame(columns, frame_facts):
+    """Provide a frame of ``frame_facts`` with workdays starting at 05:30."""
+    return FactFrame.from_facts(frame_facts, day_start=datetime.time(5, 30))
+
+
+class TestFactFrame(object):
+    def test_from_facts(self, fact_frame, frame_facts):
+        """Make sure facts are turned into columns and lookup tables."""
+        assert len(fact_frame) == 4
+        assert list(fact_frame.pks) == [1, 2, 3, 4]
+        assert list(fact_frame.activity_codes) == [0, 0, 1, 0]
+        assert list(fact_frame.category_codes) == [0, 0, -1, 0]
+        assert fact_frame.activities == [frame_facts[0].activity, frame_facts[2].activity]
+        assert fact_frame.categories == [frame_facts[0].category]
+        assert fact_frame.descriptions == ['fact 1', 'fact 2', 'fact 3', 'fact 4']
+        assert list(fact_frame.tag_offsets) == [0, 1, 3, 3, 4]
+        assert [set(fact_frame.tags[code] for code in fact_frame._tags_of(index))
+            for index in range(4)] == [fact.tags for fact in frame_facts]
+
+    def test_from_facts_ongoing(self, columns, frame_facts):
+        """Make sure facts without end are refused."""
+        frame_facts[0].end = None
+        with pytest.raises(ValueError):
+            FactFrame.from_facts(frame_facts)
+
+    def test_from_rows(self, fact_frame, frame_facts):
+        """Make sure frames built from rows equal those built from facts."""
+        rows = [(fact.pk, fact.start, fact.end, fact.description, fact.activity.pk,
+            fact.activity.name, fact.activity.deleted,
+            fact.category.pk if fact.category else None,
+            fact.category.name if fact.category else None) for fact in frame_facts]
+        tag_rows = [(fact.pk, tag.pk, tag.name) for fact in frame_facts for tag in fact.tags]
+        result = FactFrame.from_rows(rows, tag_rows, day_start=datetime.time(5, 30))
+        assert list(result.starts) == list(fact_frame.starts)
+        assert result.activities == fact_frame.activities
+        for by in ('activity', 'category', 'tag', 'day'):
+            assert result.group_sum(by) == fact_frame.group_sum(by)
+
+    def test_empty_description(self, frame_facts):
+        """Make sure empty descriptions count as none, whether from facts or rows."""
+        fact = frame_facts[0]
+        trusted = Fact._from_trusted(fact.activity, fact.start, fact.end, pk=fact.pk,
+            description='')
+        row = (fact.pk, fact.start, fact.end, '', fact.activity.pk, fact.activity.name,
+            fact.activity.deleted, fact.category.pk if fact.category else None,
+            fact.category.name if fact.category else None)
+        for result in (FactFrame.from_facts([trusted]), FactFrame.from_rows([row], [])):
+            assert list(result.description_codes) == [-1]
+            assert result.descriptions == []
+
+    def test_empty(self, columns):
+        """Make sure empty frames can be handled."""
+        empty = FactFrame.from_facts([])
+        assert len(empty) == 0
+        assert empty.group_sum(('day', 'tag')) == {}
+
+    def test_durations(self, fact_frame):
+        """Make sure durations are returned in seconds."""
+        assert list(fact_frame.durations()) == [1800, 3600, 5400, 7200]
+
+    def test_days(self, fact_frame):
+        """Make sure facts starting before ``day_start`` count towards the previous day."""
+        epoch = datetime.date(1970, 1, 1)
+        assert [epoch + datetime.timedelta(days=int(day)) for day in fact_frame.days()] == [
+            datetime.date(2016, 2, 29), datetime.date(2016, 3, 1),
+            datetime.date(2016, 3, 1), datetime.date(2016, 3, 2)]
+
+    @pytest.mark.parametrize(('criteria', 'expectation'), (
+        ({'start': datetime.datetime(2016, 3, 1, 12)}, [2, 3, 4]),
+        ({'end': datetime.datetime(2016, 3, 2, 12)}, [1, 2, 3]),
+        ({'category': 'work'}, [1, 2, 4]),
+        ({'activity': 'reading'}, [3]),
+        ({'tag': 'bar'}, [2, 4]),
+        ({'tag': 'foo', 'mask': [False, True, True, True]}, [2]),
+        ({'category': 'nonexisting'}, []),
+    ))
+    def test_filter(self, fact_frame, criteria, expectation):
+        """Make sure only facts matching all criteria are kept."""
+        result = fact_frame.filter(**criteria)
+        assert list(result.pks) == expectation
+        assert result.activities is fact_frame.activities
+
+    def test_filter_tags(self, fact_frame, frame_facts):
+        """Make sure the tags of the facts kept are carried over."""
+        result = fact_frame.filter(mask=[False, True, False, True])
+        assert list(result.tag_offsets) == [0, 2, 3]
+        assert [set(result.tags[code] for code in result._tags_of(index))
+            for index in range(2)] == [frame_facts[1].tags, frame_facts[3].tags]
+
+    def test_group_sum_category(self, fact_frame, frame_facts):
+        """Make sure facts without category are summed up under ``None``."""
+        assert fact_frame.group_sum('category') == {frame_facts[0].category: 12600, None: 5400}
+
+    def test_group_sum_tag(self, fact_frame, frame_facts):
+        """Make sure facts are accounted for once per tag."""
+        foo, bar = sorted(frame_facts[1].tags, key=lambda tag: tag.pk)
+        assert fact_frame.group_sum('tag') == {foo: 5400, bar: 10800, None: 5400}
+
+    def test_group_sum_multiple(self, fact_frame, frame_facts):
+        """Make sure grouping by several fields returns tuples as keys."""
+        work = frame_facts[0].activity
+        assert fact_frame.group_sum(('day', 'activity')) == {
+            (datetime.date(2016, 2, 29), work): 1800,
+            (datetime.date(2016, 3, 1), work): 3600,
+            (datetime.date(2016, 3, 1), frame_facts[2].activity): 5400,
+            (datetime.date(2016, 3, 2), work): 7200,
+        }
+
+    def test_group_sum_invalid(self, fact_frame):
+        """Make sure unknown fields are refused."""
+        with pytest.raises(ValueError):
+            fact_frame.group_sum(('day', 'foobar'))
@@ -31,6 +31,19 @@ class TestController:
         assert controller.config == {}
         assert controller._get_store.called
 
+    def test_update_config_convenience_attributes(self, controller, mocker):
+        """Make sure the convenience attributes refer to the new store."""
+        controller._get_store = mocker.MagicMock()
+        controller.update_config({})
+        assert controller.categories is controller._get_store.return_value.categories
+        assert controller.activities is controller._get_store.return_value.activities
+        assert controller.facts is controller._get_store.return_value.facts
+
+    def test_transaction(self, controller, mocker):
+        """Make sure the stores transaction is used."""
+        controller.store.transaction = mocker.MagicMock()
+        assert controller.transaction() is controller.store.transaction.return_value
+
     def test_get_logger(self, controller):
         """Make sure we recieve a logger that maches our expectations."""
         logger = controller._get_logger()
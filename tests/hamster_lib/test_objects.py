@@ -4,6 +4,8 @@ from __future__ import unicode_literals
 
 import copy
 import datetime
+import io
+import pickle
 from builtins import str as text
 
 import faker as faker_
@@ -26,6 +28,12 @@ class TestCategory(object):
         with pytest.raises(ValueError):
             Category(name_string_invalid_parametrized)
 
+    def test_from_trusted(self, category):
+        """Make sure the trusted constructor builds an equal instance."""
+        result = Category._from_trusted(category.name, pk=category.pk)
+        assert result == category
+        assert not hasattr(result, '__dict__')
+
     def test_as_tuple_include_pk(self, category):
         """Make sure categories tuple representation works as intended and pk is included."""
         assert category.as_tuple() == (category.pk, category.name)
@@ -68,6 +76,16 @@ class TestCategory(object):
         """Test that ``__hash__`` returns the hash expected."""
         assert hash(category) == hash(category.as_tuple())
 
+    def test_as_tuple_cached(self, category):
+        """Make sure the tuple representation is cached until a field changes."""
+        result = category.as_tuple()
+        assert category.as_tuple() is result
+        category.name += 'foobar'
+        assert category.as_tuple() == (category.pk, category.name)
+        category.pk = 1
+        assert category.as_tuple().pk == 1
+        assert hash(category) == hash(category.as_tuple())
+
     def test_hash_different_between_instances(self, category_factory):
         """
         Test that different instances have different hashes.
@@ -112,6 +130,13 @@ class TestActivity(object):
         with pytest.raises(ValueError):
             Activity(name_string_invalid_parametrized)
 
+    def test_from_trusted(self, activity):
+        """Make sure the trusted constructor builds an equal instance."""
+        result = Activity._from_trusted(activity.name, pk=activity.pk,
+            category=activity.category, deleted=activity.deleted)
+        assert result == activity
+        assert not hasattr(result, '__dict__')
+
     def test_create_from_composite(self, activity):
         result = Activity.create_from_composite(activity.name, activity.category.name)
         assert result.name == activity.name
@@ -161,6 +186,22 @@ class TestActivity(object):
         """Test that ``__hash__`` returns the hash expected."""
         assert hash(activity) == hash(activity.as_tuple())
 
+    def test_as_tuple_cached(self, activity):
+        """Make sure the tuple representation is cached until a field changes."""
+        result = activity.as_tuple()
+        assert activity.as_tuple() is result
+        activity.deleted = True
+        assert activity.as_tuple().deleted is True
+
+    def test_as_tuple_category_changed(self, activity):
+        """Make sure changes to the related category are picked up."""
+        old_hash = hash(activity)
+        activity.category.name += 'foobar'
+        assert activity.as_tuple().category.name == activity.category.name
+        assert hash(activity) != old_hash
+        activity.category = None
+        assert activity.as_tuple().category is None
+
     def test_hash_different_between_instances(self, activity_factory):
         """
         Test that different instances have different hashes.
@@ -207,6 +248,12 @@ class TestTag(object):
         with pytest.raises(ValueError):
             Tag(name_string_invalid_parametrized)
 
+    def test_from_trusted(self, tag):
+        """Make sure the trusted constructor builds an equal instance."""
+        result = Tag._from_trusted(tag.name, pk=tag.pk)
+        assert result == tag
+        assert not hasattr(result, '__dict__')
+
     def test_as_tuple_include_pk(self, tag):
         """Make sure tags tuple representation works as intended and pk is included."""
         assert tag.as_tuple() == (tag.pk, tag.name)
@@ -285,6 +332,31 @@ class TestFact(object):
         assert fact.end == start_end_datetimes[1]
         assert fact.tags == tag_list_valid_parametrized
 
+    def test_from_trusted(self, fact):
+        """Make sure the trusted constructor builds an equal instance."""
+        result = Fact._from_trusted(fact.activity, fact.start, end=fact.end, pk=fact.pk,
+            description=fact.description, tags=set(fact.tags))
+        assert result == fact
+        assert not hasattr(result, '__dict__')
+
+    def test_from_trusted_without_tags(self, fact):
+        """Make sure each trusted instance gets its own set of tags."""
+        result = Fact._from_trusted(fact.activity, fact.start)
+        assert result.tags == set()
+        assert result.tags is not Fact._from_trusted(fact.activity, fact.start).tags
+
+    @pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+    def test_pickle(self, fact, protocol):
+        """Make sure facts survive pickling with any protocol."""
+        assert pickle.loads(pickle.dumps(fact, protocol)) == fact
+
+    def test_setstate_legacy(self, fact):
+        """Make sure the state of facts pickled before using ``__slots__`` is restored."""
+        result = Fact.__new__(Fact)
+        result.__setstate__({'pk': fact.pk, 'activity': fact.activity, '_start': fact.start,
+            '_end': fact.end, '_description': fact.description, 'tags': fact.tags})
+        assert result == fact
+
     def test_create_from_raw_fact_valid(self, raw_fact_parametrized):
         """Make sure the constructed ``Fact``s anatomy reflects our expectations."""
         raw_fact, expectation = raw_fact_parametrized
@@ -317,6 +389,57 @@ class TestFact(object):
         fact = Fact.create_from_raw_fact(raw_fact)
         assert fact.start == expectations['start']
 
+    def test_parse_many_valid(self, raw_fact_parametrized):
+        """Make sure lines are parsed just like ``create_from_raw_fact`` does."""
+        raw_fact, expectation = raw_fact_parametrized
+        result = list(Fact.parse_many([raw_fact]))
+        assert result == [Fact.create_from_raw_fact(raw_fact)]
+
+    def test_parse_many_file(self):
+        """Make sure lines are read from file objects, skipping blank ones."""
+        lines = io.StringIO('2015-10-01 12:00 foo@bar, baz\n\n  \r\n12:00 - 14:14 foo\n')
+        result = list(Fact.parse_many(lines, {'day_start': datetime.time(5, 30)}))
+        assert [(fact.start, fact.activity.name, fact.description) for fact in result] == [
+            (datetime.datetime(2015, 10, 1, 12), 'foo', 'baz'),
+            (datetime.datetime.combine(datetime.date.today(), datetime.time(12)), 'foo', None),
+        ]
+
+    def test_parse_many_lazy(self):
+        """Make sure lines are only consumed as facts are requested."""
+        lines = iter(['foo', '12:00 - 11:00 bar'])
+        result = Fact.parse_many(lines)
+        assert next(result).activity.name == 'foo'
+        assert next(lines) == '12:00 - 11:00 bar'
+
+    def test_parse_many_invalid(self):
+        """Make sure errors name the line that could not be parsed."""
+        with pytest.raises(ValueError) as excinfo:
+            list(Fact.parse_many(['foo', '', '2015-13-01 bar']))
+        assert 'Line 3' in text(excinfo.value)
+
+    def test_parse_many_skip(self):
+        """Make sure lines that can not be parsed are dropped on request."""
+        result = list(Fact.parse_many(['foo', '2015-13-01 bar', 'baz'], errors='skip'))
+        assert [fact.activity.name for fact in result] == ['foo', 'baz']
+
+    def test_parse_many_collect(self):
+        """Make sure errors are yielded in place of facts on request."""
+        first, error, last = Fact.parse_many(['foo', '2015-13-01 bar', 'baz'],
+            errors='collect')
+        assert (first.activity.name, last.activity.name) == ('foo', 'baz')
+        assert isinstance(error, ValueError)
+        assert 'Line 2' in text(error)
+
+    def test_parse_many_unknown_errors(self):
+        """Make sure unknown error handling is refused."""
+        with pytest.raises(ValueError):
+            list(Fact.parse_many(['foo'], errors='ignore'))
+
+    @freeze_time('2015-05-02 18:07')
+    def test_parse_many_with_delta(self):
+        result = list(Fact.parse_many(['-7 foo@bar, palimpalum']))
+        assert result[0].start == datetime.datetime(2015, 5, 2, 18, 0, 0)
+
     @pytest.mark.parametrize('start', [None, faker.date_time()])
     def test_start_valid(self, fact, start):
         """Make sure that valid arguments get stored by the setter."""
@@ -424,6 +547,29 @@ class TestFact(object):
         """Test that ``__hash__`` returns the hash expected."""
         assert hash(fact) == hash(fact.as_tuple())
 
+    def test_as_tuple_cached(self, fact):
+        """Make sure the tuple representation is cached until a field changes."""
+        result = fact.as_tuple()
+        assert fact.as_tuple() is result
+        fact.description = 'foobar'
+        assert fact.as_tuple().description == 'foobar'
+        fact.end = None
+        assert fact.as_tuple().end is None
+        assert hash(fact) == hash(fact.as_tuple())
+
+    def test_as_tuple_related_changed(self, fact, tag_factory):
+        """Make sure changes to related instances and in place changes of tags are picked up."""
+        fact.as_tuple()
+        fact.activity.name += 'foobar'
+        assert fact.as_tuple().activity.name == fact.activity.name
+        new_tag = tag_factory()
+        fact.tags.add(new_tag)
+        assert new_tag.as_tuple() in fact.as_tuple().tags
+        new_tag.name += 'foobar'
+        assert new_tag.as_tuple() in fact.as_tuple().tags
+        fact.tags.clear()
+        assert fact.as_tuple().tags == frozenset()
+
     def test_hash_different_between_instances(self, fact_factory):
         """
         Test that different instances have different hashes.
@@ -7,7 +7,7 @@ import pickle
 
 import pytest
 from freezegun import freeze_time
-from hamster_lib import Fact
+from hamster_lib import Fact, Tag, storage
 
 
 class TestBaseStore():
@@ -15,6 +15,10 @@ class TestBaseStore():
         with pytest.raises(NotImplementedError):
             basestore.cleanup()
 
+    def test_transaction(self, basestore):
+        with pytest.raises(NotImplementedError):
+            basestore.transaction()
+
 
 class TestCategoryManager():
     def test_add(self, basestore, category):
@@ -210,6 +214,13 @@ class TestTagManager():
         assert basestore.tags.get_by_name.called
         assert basestore.tags._add.called
 
+    def test_get_or_create_many(self, basestore, mocker):
+        """Make sure each distinct tag is looked up once, in the order given."""
+        basestore.tags.get_or_create = mocker.MagicMock(side_effect=lambda name: Tag(name))
+        result = basestore.tags.get_or_create_many([Tag('foo'), 'bar', 'foo'])
+        assert [tag.name for tag in result] == ['foo', 'bar']
+        assert basestore.tags.get_or_create.call_count == 2
+
     def test_get_all(self, basestore):
         with pytest.raises(NotImplementedError):
             basestore.tags.get_all()
@@ -232,6 +243,37 @@ class TestFactManager:
         with pytest.raises(ValueError):
             basestore.facts.save(fact)
 
+    def test_save_many(self, basestore, fact_factory, mocker):
+        """Make sure valid facts are passed on to ``_add_many`` and reported back."""
+        facts = [fact_factory() for i in range(3)]
+        basestore.facts._add_many = mocker.MagicMock(side_effect=lambda facts, batch_size: (
+            [i for i, fact in enumerate(facts)], []))
+        result = basestore.facts.save_many(facts)
+        assert result.saved == [0, 1, 2]
+        assert result.rejected == []
+        assert result.throughput >= 0
+
+    def test_save_many_rejects_invalid_facts(self, basestore, fact_factory, mocker):
+        """Make sure facts failing validation are rejected without aborting the others."""
+        to_brief, ongoing, with_pk, valid = [fact_factory() for i in range(4)]
+        to_brief.end = to_brief.start + datetime.timedelta(
+            seconds=(basestore.config['fact_min_delta'] - 1))
+        ongoing.end = None
+        with_pk.pk = 1
+        basestore.facts._add_many = mocker.MagicMock(side_effect=lambda facts, batch_size: (
+            [fact.description for fact in facts], []))
+        result = basestore.facts.save_many([to_brief, ongoing, with_pk, valid])
+        assert result.saved == [valid.description]
+        assert [fact for fact, message in result.rejected] == [to_brief, ongoing, with_pk]
+
+    def test_add_many_falls_back_to_add(self, basestore, fact_factory, mocker):
+        """Make sure the generic implementation calls ``_add`` and collects its errors."""
+        facts = [fact_factory() for i in range(2)]
+        basestore.facts._add = mocker.MagicMock(side_effect=[facts[0], ValueError('foo')])
+        saved, rejected = basestore.facts._add_many(facts, 10)
+        assert saved == [facts[0].pk]
+        assert rejected == [(facts[1], 'foo')]
+
     def test_add(self, basestore, fact):
         with pytest.raises(NotImplementedError):
             basestore.facts._add(fact)
@@ -283,6 +325,34 @@ class TestFactManager:
         assert basestore.facts._get_all.call_args[0] == (expectation['start'], expectation['end'],
             filter_term)
 
+    @pytest.mark.parametrize(('tags', 'expectation'), (
+        (None, None),
+        ([], None),
+        ('foo', frozenset(['foo'])),
+        (Tag('foo'), frozenset(['foo'])),
+        ([Tag('foo'), 'bar'], frozenset(['foo', 'bar'])),
+    ))
+    def test_get_all_tags(self, basestore, mocker, tags, expectation):
+        """Make sure tag filters are passed on as sets of names."""
+        basestore.facts._get_all = mocker.MagicMock()
+        basestore.facts.get_all(tags=tags, any_tags=tags, all_tags=tags)
+        assert basestore.facts._get_all.call_args[1] == {'any_tags': expectation,
+            'all_tags': expectation, 'loading': None}
+
+    def test_get_all_tags_combined(self, basestore, mocker):
+        """Make sure ``tags`` are required along with ``all_tags``."""
+        basestore.facts._get_all = mocker.MagicMock()
+        basestore.facts.get_all(tags='foo', all_tags=[Tag('bar')])
+        assert basestore.facts._get_all.call_args[1]['all_tags'] == frozenset(['foo', 'bar'])
+
+    @pytest.mark.parametrize('method', ('get_all', 'iter_all', 'get_page'))
+    def test_loading(self, basestore, mocker, method):
+        """Make sure the loading strategy is passed on to the backend."""
+        backend_method = mocker.MagicMock()
+        setattr(basestore.facts, '_{}'.format(method), backend_method)
+        getattr(basestore.facts, method)(loading='core')
+        assert backend_method.call_args[1]['loading'] == 'core'
+
     @pytest.mark.parametrize(('start', 'end'), [
         (datetime.date(2015, 4, 5), datetime.date(2012, 3, 4)),
         (datetime.datetime(2015, 4, 5, 18, 0, 0), datetime.datetime(2012, 3, 4, 19, 0, 0)),
@@ -301,6 +371,167 @@ class TestFactManager:
         with pytest.raises(TypeError):
             basestore.facts.get_all(start, end)
 
+    @freeze_time('2015-04-01 18:00')
+    def test_iter_all(self, basestore, mocker):
+        """Make sure timeframe normalization matches ``get_all``."""
+        basestore.facts._iter_all = mocker.MagicMock()
+        basestore.facts.iter_all(datetime.date(2014, 4, 1), datetime.time(13, 40, 25), 'foo',
+            chunk_size=10)
+        assert basestore.facts._iter_all.call_args[0] == (
+            datetime.datetime(2014, 4, 1, 5, 30, 0), datetime.datetime(2015, 4, 1, 13, 40, 25),
+            'foo', 10)
+
+    def test_iter_all_end_before_start(self, basestore):
+        """Make sure invalid timeframes are reported right away."""
+        with pytest.raises(ValueError):
+            basestore.facts.iter_all(datetime.date(2015, 4, 5), datetime.date(2012, 3, 4))
+
+    def test__iter_all(self, basestore, fact, mocker):
+        """Make sure the generic implementation iterates over ``_get_all``."""
+        basestore.facts._get_all = mocker.MagicMock(return_value=[fact])
+        assert list(basestore.facts._iter_all()) == [fact]
+
+    @freeze_time('2015-04-01 18:00')
+    def test_get_page(self, basestore, mocker):
+        """Make sure timeframe normalization matches ``get_all``."""
+        basestore.facts._get_page = mocker.MagicMock()
+        basestore.facts.get_page(datetime.date(2014, 4, 1), datetime.time(13, 40, 25), 'foo',
+            after=(datetime.datetime(2014, 5, 1), 3), limit=10, descending=True)
+        assert basestore.facts._get_page.call_args[0] == (
+            datetime.datetime(2014, 4, 1, 5, 30, 0), datetime.datetime(2015, 4, 1, 13, 40, 25),
+            'foo', (datetime.datetime(2014, 5, 1), 3), 10, True)
+
+    @pytest.mark.parametrize('limit', (0, -1))
+    def test_get_page_invalid_limit(self, basestore, limit):
+        """Make sure a non positive page size raises an error."""
+        with pytest.raises(ValueError):
+            basestore.facts.get_page(limit=limit)
+
+    @pytest.mark.parametrize('descending', (False, True))
+    def test__get_page(self, basestore, fact_factory, mocker, descending):
+        """Make sure the generic implementation pages through ``_get_all`` in order."""
+        start = datetime.datetime(2015, 4, 1, 10)
+        facts = [fact_factory(pk=pk, start=start, end=start + datetime.timedelta(hours=1))
+            for pk in range(5)]
+        basestore.facts._get_all = mocker.MagicMock(return_value=list(reversed(facts)))
+        if descending:
+            facts.reverse()
+        first = basestore.facts._get_page(limit=2, descending=descending)
+        after = (first[-1].start, first[-1].pk)
+        second = basestore.facts._get_page(after=after, limit=2, descending=descending)
+        assert first == facts[:2]
+        assert second == facts[2:4]
+
+    @freeze_time('2015-04-01 18:00')
+    def test_get_totals(self, basestore, mocker):
+        """Make sure timeframe is normalized and grouping by activity implies category."""
+        basestore.facts._get_totals = mocker.MagicMock(return_value=[])
+        basestore.facts.get_totals(datetime.date(2014, 4, 1), datetime.time(13, 40, 25),
+            group_by=('activity', 'day'))
+        assert basestore.facts._get_totals.call_args[0] == (
+            datetime.datetime(2014, 4, 1, 5, 30, 0), datetime.datetime(2015, 4, 1, 13, 40, 25),
+            ('activity', 'day', 'category'))
+
+    def test_get_totals_invalid_group(self, basestore):
+        """Make sure unknown fields to group by raise an error."""
+        with pytest.raises(ValueError):
+            basestore.facts.get_totals(group_by=('category', 'foo'))
+
+    def test_get_totals_ordered(self, basestore, mocker):
+        """Make sure totals are ordered by the grouped fields with ``None`` last."""
+        totals = [storage.Total(None, name, None, None, datetime.timedelta(), 1)
+            for name in (None, 'b', 'a')]
+        basestore.facts._get_totals = mocker.MagicMock(return_value=totals)
+        result = basestore.facts.get_totals(group_by=('category',))
+        assert [total.category for total in result] == ['a', 'b', None]
+
+    @freeze_time('2015-04-01 18:00')
+    def test_get_frame(self, basestore, mocker):
+        """Make sure the timeframe is normalized."""
+        basestore.facts._get_frame = mocker.MagicMock(return_value=None)
+        basestore.facts.get_frame(datetime.date(2014, 4, 1), datetime.time(13, 40, 25), 'foo')
+        assert basestore.facts._get_frame.call_args[0] == (
+            datetime.datetime(2014, 4, 1, 5, 30, 0), datetime.datetime(2015, 4, 1, 13, 40, 25),
+            'foo')
+
+    def test_get_frame_generic(self, basestore, fact, mocker):
+        """Make sure the generic implementation builds the frame from ``_iter_all``."""
+        basestore.facts._iter_all = mocker.MagicMock(return_value=iter([fact]))
+        result = basestore.facts._get_frame(None, None)
+        assert len(result) == 1
+        assert result.activities == [fact.activity]
+        assert result.day_start == basestore.config['day_start']
+
+    @freeze_time('2015-04-01 18:00')
+    def test_remove_range(self, basestore, mocker):
+        """Make sure the timeframe is normalized."""
+        basestore.facts._remove_range = mocker.MagicMock(return_value=0)
+        basestore.facts.remove_range(datetime.date(2014, 4, 1), datetime.time(13, 40, 25), 'foo')
+        assert basestore.facts._remove_range.call_args[0] == (
+            datetime.datetime(2014, 4, 1, 5, 30, 0), datetime.datetime(2015, 4, 1, 13, 40, 25),
+            'foo')
+
+    def test__remove_range(self, basestore, fact_factory, mocker):
+        """Make sure the generic implementation removes each fact of ``_get_all``."""
+        facts = [fact_factory(), fact_factory()]
+        basestore.facts._get_all = mocker.MagicMock(return_value=facts)
+        basestore.facts.remove = mocker.MagicMock()
+        assert basestore.facts._remove_range(None, None, '') == 2
+        assert basestore.facts.remove.call_count == 2
+
+    def test_reassign_activity_without_pk(self, basestore, activity_factory):
+        """Make sure activities need to be persistent."""
+        with pytest.raises(ValueError):
+            basestore.facts.reassign_activity(activity_factory(pk=1), activity_factory(pk=None))
+
+    def test__reassign_activity(self, basestore, fact_factory, activity_factory, mocker):
+        """Make sure the generic implementation updates facts of the old activity only."""
+        old, new = activity_factory(pk=1), activity_factory(pk=2)
+        facts = [fact_factory(activity=old), fact_factory(activity=new)]
+        basestore.facts._get_all = mocker.MagicMock(return_value=facts)
+        basestore.facts._update = mocker.MagicMock()
+        assert basestore.facts._reassign_activity(old, new, None, None) == 1
+        assert facts[0].activity == new
+
+    def test_add_tag_range(self, basestore, mocker):
+        """Make sure tags may be passed by name."""
+        basestore.facts._add_tag_range = mocker.MagicMock(return_value=0)
+        basestore.facts.add_tag_range('foo', None, None)
+        assert basestore.facts._add_tag_range.call_args[0] == (Tag('foo'), None, None)
+
+    def test__add_tag_range(self, basestore, fact_factory, tag_factory, mocker):
+        """Make sure the generic implementation skips facts already carrying the tag."""
+        tag = tag_factory(name='foo')
+        facts = [fact_factory(), fact_factory()]
+        facts[0].tags = set([tag])
+        basestore.facts._get_all = mocker.MagicMock(return_value=facts)
+        basestore.facts._update = mocker.MagicMock()
+        assert basestore.facts._add_tag_range(tag, None, None) == 1
+        assert tag in facts[1].tags
+
+    def test__get_totals(self, basestore, fact_factory, tag_factory, mocker):
+        """Make sure the generic implementation sums up ``_get_all`` per group."""
+        tags = [tag_factory(name=name) for name in ('a', 'b')]
+        start = datetime.datetime(2015, 4, 2, 4)
+        facts = [
+            fact_factory(start=start, end=start + datetime.timedelta(hours=1)),
+            fact_factory(start=start + datetime.timedelta(hours=2),
+                end=start + datetime.timedelta(hours=4)),
+        ]
+        facts[0].tags, facts[1].tags = tags, tags[:1]
+        basestore.facts._get_all = mocker.MagicMock(return_value=facts)
+        result = basestore.facts._get_totals(None, None, ('tag', 'day'))
+        assert sorted(result) == [
+            storage.Total(None, None, 'a', datetime.date(2015, 4, 1),
+                datetime.timedelta(hours=1), 1),
+            storage.Total(None, None, 'a', datetime.date(2015, 4, 2),
+                datetime.timedelta(hours=2), 1),
+            storage.Total(None, None, 'b', datetime.date(2015, 4, 1),
+                datetime.timedelta(hours=1), 1),
+        ]
+        result = basestore.facts._get_totals(None, None, ())
+        assert result == [storage.Total(None, None, None, None, datetime.timedelta(hours=3), 2)]
+
     @freeze_time('2015-10-03 14:45')
     def test_get_today(self, basestore, mocker):
         """Make sure that method uses apropiate timeframe. E. g. it respects ``day_start``."""
@@ -310,6 +541,20 @@ class TestFactManager:
         assert basestore.facts.get_all.call_args[0] == (datetime.datetime(2015, 10, 3, 5, 30, 0),
             datetime.datetime(2015, 10, 4, 5, 29, 59))
 
+    def test_overlaps(self, basestore, fact_factory, mocker):
+        """Make sure the generic implementation returns the first non excluded PK."""
+        facts = [fact_factory() for i in range(2)]
+        facts[0].pk, facts[1].pk = 1, 2
+        basestore.facts._get_all = mocker.MagicMock(return_value=facts)
+        assert basestore.facts.overlaps(facts[0].start, facts[0].end) == 1
+        assert basestore.facts.overlaps(facts[0].start, facts[0].end, exclude_pk=1) == 2
+        assert basestore.facts._get_all.call_args[1] == {'partial': True}
+
+    def test_overlaps_free(self, basestore, fact, mocker):
+        """Make sure ``None`` is returned if no fact occupies the timeframe."""
+        basestore.facts._get_all = mocker.MagicMock(return_value=[])
+        assert basestore.facts.overlaps(fact.start, fact.end) is None
+
     def test__get_all(self, basestore):
         with pytest.raises(NotImplementedError):
             basestore.facts._get_all()
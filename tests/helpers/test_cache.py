@@ -0,0 +1,153 @@
+# -*- encoding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import copy
+import pickle
+import threading
+
+import pytest
+from hamster_lib import Activity, Category, Tag
+from hamster_lib.helpers.cache import InternPool, LRUCache
+
+
+class TestLRUCache(object):
+    def test_get_hit_and_miss(self):
+        """Make sure lookups are counted as hits and misses."""
+        cache = LRUCache(2)
+        cache.set('foo', 1)
+        assert cache.get('foo') == 1
+        assert cache.get('bar') is None
+        assert cache.get('bar', 2) == 2
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_least_recently_used_discarded(self):
+        """Make sure the entry used longest ago is dropped once the cache is full."""
+        cache = LRUCache(2)
+        cache.set('foo', 1)
+        cache.set('bar', 2)
+        cache.get('foo')
+        cache.set('baz', 3)
+        assert len(cache) == 2
+        assert 'bar' not in cache
+        assert 'foo' in cache
+
+    def test_set_existing(self):
+        """Make sure overwriting a key does not grow the cache."""
+        cache = LRUCache(2)
+        cache.set('foo', 1)
+        cache.set('foo', 2)
+        assert len(cache) == 1
+        assert cache.get('foo') == 2
+
+    def test_disabled(self):
+        """Make sure a size of ``0`` stores nothing."""
+        cache = LRUCache(0)
+        cache.set('foo', 1)
+        assert cache.get('foo') is None
+
+    def test_invalid_size(self):
+        """Make sure negative sizes are refused."""
+        with pytest.raises(ValueError):
+            LRUCache(-1)
+
+    def test_clear(self):
+        """Make sure entries are discarded but counters are kept."""
+        cache = LRUCache(2)
+        cache.set('foo', 1)
+        cache.get('foo')
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.hits == 1
+
+    def test_threads(self):
+        """Make sure concurrent access keeps size and counters consistent."""
+        cache = LRUCache(10)
+
+        def access(offset):
+            for i in range(1000):
+                cache.set(offset + i % 20, i)
+                cache.get(offset + i % 20)
+
+        threads = [threading.Thread(target=access, args=(i * 100,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(cache) == 10
+        assert cache.hits + cache.misses == 4000
+
+
+class TestInternPool(object):
+    def test_category(self):
+        """Make sure one instance is returned per PK."""
+        pool = InternPool()
+        category = pool.category(1, 'foo')
+        assert (category.pk, category.name) == (1, 'foo')
+        assert pool.category(1, 'foo') is category
+        assert pool.category(2, 'foo') is not category
+
+    def test_activity(self):
+        """Make sure activities refer to pooled categories."""
+        pool = InternPool()
+        activity = pool.activity(1, 'foo', category_pk=1, category_name='bar', deleted=0)
+        assert activity.category is pool.category(1, 'bar')
+        assert activity.deleted is False
+        assert pool.activity(1, 'foo', category_pk=1, category_name='bar') is activity
+        assert len(pool) == 2
+
+    def test_activity_without_category(self):
+        """Make sure activities without category do not pool one."""
+        pool = InternPool()
+        assert pool.activity(1, 'foo').category is None
+        assert len(pool) == 1
+
+    def test_tag(self):
+        """Make sure one instance is returned per PK."""
+        pool = InternPool()
+        tag = pool.tag(1, 'foo')
+        assert (tag.pk, tag.name) == (1, 'foo')
+        assert pool.tag(1, 'foo') is tag
+        assert pool.tag(1, 'foo') is not pool.category(1, 'foo')
+
+    @pytest.mark.parametrize(('attribute', 'value'), (
+        ('name', 'baz'),
+        ('pk', 2),
+        ('category', None),
+        ('deleted', True),
+    ))
+    def test_read_only(self, attribute, value):
+        """Make sure pooled instances can not be changed."""
+        pool = InternPool()
+        activity = pool.activity(1, 'foo', category_pk=1, category_name='bar')
+        with pytest.raises(AttributeError):
+            setattr(activity, attribute, value)
+        with pytest.raises(AttributeError):
+            activity.category.name = value
+        with pytest.raises(AttributeError):
+            pool.tag(1, 'foo').name = 'baz'
+        assert activity.as_tuple() == (1, 'foo', (1, 'bar'), False)
+
+    def test_read_only_hashable(self):
+        """Make sure pooled instances still cache their tuple and hash."""
+        pool = InternPool()
+        tag = pool.tag(1, 'foo')
+        assert hash(tag) == hash(Tag('foo', pk=1))
+        assert tag.as_tuple() is tag.as_tuple()
+
+    @pytest.mark.parametrize('duplicate', (
+        copy.copy,
+        copy.deepcopy,
+        lambda instance: pickle.loads(pickle.dumps(instance, 0)),
+        lambda instance: pickle.loads(pickle.dumps(instance, pickle.HIGHEST_PROTOCOL)),
+    ))
+    def test_read_only_copy(self, duplicate):
+        """Make sure copies of pooled instances can be changed."""
+        pool = InternPool()
+        for instance, cls in ((pool.category(1, 'foo'), Category),
+                (pool.activity(1, 'foo'), Activity), (pool.tag(1, 'foo'), Tag)):
+            result = duplicate(instance)
+            assert type(result) is cls
+            assert result == instance
+            result.name = 'bar'
+            assert instance.name == 'foo'
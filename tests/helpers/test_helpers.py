@@ -2,6 +2,7 @@
 
 from __future__ import absolute_import, unicode_literals
 
+import copy
 import pickle
 
 import pytest
@@ -25,3 +26,13 @@ class TestLoadTmpFact(object):
         """Make sure that we return the stored 'ongoing fact' as expected."""
         result = helpers._load_tmp_fact(base_config['tmpfile_path'])
         assert result == tmp_fact
+
+
+class TestFindDuplicates(object):
+    def test_find_duplicates(self, fact_factory):
+        """Make sure only facts equal to a previous one are considered duplicates."""
+        first, second = fact_factory(), fact_factory()
+        duplicate = copy.deepcopy(first)
+        unique, duplicates = helpers.find_duplicates([first, second, duplicate, first])
+        assert unique == [first, second]
+        assert duplicates == [duplicate, first]
@@ -65,9 +65,19 @@ class TestParseTimeRange(object):
         ('2014-01-05-2014-04-01 foobar',
          (TimeFrame(None, None, None, None, None), '2014-01-05-2014-04-01 foobar')),
     ])
-    def test_various_time_infos(self, time_info, expectation):
-        """Make sure that our parser works according to our expectations."""
-        assert time_helpers.extract_time_info(time_info) == expectation
+    @pytest.mark.parametrize('extract', (time_helpers.extract_time_info,
+        time_helpers.TimeInfoParser().extract))
+    def test_various_time_infos(self, time_info, expectation, extract):
+        """Make sure that our parsers work according to our expectations."""
+        assert extract(time_info) == expectation
+
+    def test_parser_caches_tokens(self):
+        """Make sure repeated date and time tokens are only converted once."""
+        parser = time_helpers.TimeInfoParser()
+        first, rest = parser.extract('2014-01-05 18:15 - 18:30 foo')
+        second, rest = parser.extract('2014-01-05 18:30 bar')
+        assert second.start_date is first.start_date
+        assert second.start_time is first.end_time
 
 
 class TestCompleteTimeFrame(object):